@@ -11,6 +11,7 @@ import logging
 from pathlib import Path
 import sys
 import os
+import hashlib
 import yaml
 
 # 로깅 설정
@@ -22,6 +23,19 @@ current_dir = Path(__file__).parent
 sys.path.append(str(current_dir))
 
 from naver_land_service import NaverLandService
+from complex_model import ComplexModel, UnitType
+from response_cache import get_response_cache
+from metrics import get_metrics
+from prefetch import start_cache_warmer
+from config_loader import load_config
+
+# 대시보드 메모 설정 (config/crawler.yaml 의 dashboard)
+DASHBOARD_CONFIG = (load_config('crawler') or {}).get('dashboard', {}) or {}
+MAX_DEBUG_LOGS = 200
+
+
+class ComplexDataUnavailable(Exception):
+    """단지 데이터를 캐시에서도, API 에서도 가져오지 못함 (실패는 메모하지 않도록 예외로 알림)"""
 
 def load_yaml_config(file_name: str) -> Optional[Dict]:
     """YAML 설정 파일을 로드합니다."""
@@ -41,6 +55,70 @@ def load_yaml_config(file_name: str) -> Optional[Dict]:
         logger.error(f"설정 파일 로드 중 오류 발생: {str(e)}")
         return None
 
+@st.cache_resource
+def load_configs() -> Dict:
+    """설정 파일을 프로세스당 한 번만 읽습니다."""
+    return {
+        'headers': load_yaml_config('headers.yaml') or {},
+        'cookies': load_yaml_config('cookies.yaml') or {},
+        'apartments': load_yaml_config('apartments.yaml') or {},
+        'variables': load_yaml_config('variables.yaml') or {}
+    }
+
+@st.cache_resource
+def get_service() -> NaverLandService:
+    """모든 세션이 공유하는 NaverLandService (fetch_complex 는 인스턴스 상태를 바꾸지 않음)"""
+    configs = load_configs()
+    return NaverLandService(
+        headers=configs['headers'],
+        cookies=configs['cookies'].get('cookies', {}),
+        variables=configs['variables'].get('extractors', {})
+    )
+
+@st.cache_data(ttl=DASHBOARD_CONFIG.get('data_ttl', 300), max_entries=DASHBOARD_CONFIG.get('max_entries', 256),
+               show_spinner=False)
+def load_complex_data(complex_id: str) -> ComplexModel:
+    """
+    단지별 파싱 결과(ComplexModel)를 TTL 동안 메모합니다.
+    예열된 응답 캐시를 먼저 읽고, 아직 예열 전이면 한 번만 직접 조회합니다 (결과는 응답 캐시에 저장됨).
+    원본 응답은 dashboard.keep_raw 가 true 일 때만 보관합니다.
+    """
+    service = get_service()
+    keep_raw = DASHBOARD_CONFIG.get('keep_raw', False)
+    data = service.fetch_complex(complex_id, cache_only=True, keep_raw=keep_raw)
+    if data is None:
+        logger.debug(f"캐시에 없어 API 로 조회: {complex_id}")
+        data = service.fetch_complex(complex_id, keep_raw=keep_raw)
+    if data is None:
+        raise ComplexDataUnavailable(complex_id)
+    return data
+
+@st.cache_data(ttl=DASHBOARD_CONFIG.get('data_ttl', 300), max_entries=DASHBOARD_CONFIG.get('max_entries', 256),
+               show_spinner=False)
+def load_comparison(complex_ids: Tuple[str, ...]) -> Tuple[pd.DataFrame, List[str], str]:
+    """
+    선택한 단지들을 동시에 가져와 비교 DataFrame 으로 만듭니다.
+    Returns:
+        (비교 DataFrame, 가져오지 못한 단지번호, 데이터 버전)
+    """
+    complexes = get_service().fetch_many(complex_ids, keep_raw=False,
+                                         max_workers=DASHBOARD_CONFIG.get('max_workers', 8))
+    failed = [complex_id for complex_id, data in complexes.items() if data is None]
+    version = hashlib.sha1("".join(
+        data.version for data in complexes.values() if data is not None
+    ).encode('utf-8')).hexdigest()[:16]
+    return NaverLandService.build_comparison_frame(complexes), failed, version
+
+@st.cache_resource(max_entries=DASHBOARD_CONFIG.get('max_entries', 256))
+def get_maintenance_figure(complex_id: str, version: str, _unit_types: Tuple[UnitType, ...]):
+    """단지·데이터 버전별 관리비 그래프 (같은 버전이면 표와 그래프를 다시 만들지 않음)"""
+    return NaverLandService.build_maintenance_figure(NaverLandService.build_maintenance_frame(_unit_types))
+
+@st.cache_resource(max_entries=DASHBOARD_CONFIG.get('max_entries', 256))
+def get_comparison_figure(complex_ids: Tuple[str, ...], version: str, _frame: pd.DataFrame):
+    """선택 단지·데이터 버전별 비교 그래프"""
+    return NaverLandService.build_comparison_figure(_frame)
+
 def main():
     st.set_page_config(page_title="부동산 데이터 분석", page_icon="🏢", layout="wide")
     
@@ -50,24 +128,18 @@ def main():
     
     def add_log(message: str):
         st.session_state.debug_logs.append(message)
+        # 재실행마다 쌓이는 로그는 최근 것만 남긴다
+        del st.session_state.debug_logs[:-MAX_DEBUG_LOGS]
         logger.debug(message)
 
-    # 설정 로드
-    add_log("설정 파일 로드 시작")
-    
-    headers = load_yaml_config('headers.yaml') or {}
-    cookies = load_yaml_config('cookies.yaml') or {}
-    apartments = load_yaml_config('apartments.yaml') or {}
-    variables = load_yaml_config('variables.yaml') or {}
-    
-    configs = {
-        'headers': headers,
-        'cookies': cookies,
-        'apartments': apartments,
-        'variables': variables
-    }
-    
-    add_log(f"로드된 설정: {list(configs.keys())}")
+    # 설정 로드 (프로세스당 한 번)
+    configs = load_configs()
+    headers = configs['headers']
+    cookies = configs['cookies']
+    apartments = configs['apartments']
+
+    # apartments.yaml 의 단지를 백그라운드에서 응답 캐시에 예열 (프로세스당 한 번만 시작)
+    warmer = start_cache_warmer(headers=headers, cookies=cookies.get('cookies', {}))
 
     # UI 구성
     st.title("부동산 데이터 분석 대시보드")
@@ -84,12 +156,51 @@ def main():
         if st.checkbox("설정 파일 내용 보기"):
             st.json(configs)
 
+        cache = get_response_cache()
+        if cache is not None:
+            st.subheader("응답 캐시")
+            st.json(cache.stats())
+
+        if warmer is not None:
+            st.subheader("캐시 예열")
+            st.json(warmer.status())
+
+        st.subheader("API 호출 지표")
+        st.json(get_metrics().snapshot())
+
     # 사이드바 설정
     st.sidebar.title("검색 설정")
     
-    # 아파트 선택 드롭다운
+    # 보기 모드와 아파트 선택
     apartment_list = apartments.get('apartment_list', {})
     if apartment_list:
+        mode = st.sidebar.radio("보기 모드", options=["단지 상세", "단지 비교"], horizontal=True)
+        
+        if mode == "단지 비교":
+            selected_apts = st.sidebar.multiselect(
+                "비교할 아파트",
+                options=list(apartment_list.keys()),
+                default=list(apartment_list.keys())[:2]
+            )
+            complex_ids = tuple(str(apartment_list[apt]) for apt in selected_apts)
+            add_log(f"비교 단지: {list(complex_ids)}")
+            
+            if complex_ids:
+                try:
+                    frame, failed, version = load_comparison(complex_ids)
+                    figure = get_comparison_figure(complex_ids, version, frame) if not frame.empty else None
+                    
+                    with tab1:
+                        get_service().display_comparison(frame, figure, failed)
+                        
+                except Exception as e:
+                    error_msg = f"처리 중 오류 발생: {str(e)}"
+                    add_log(error_msg)
+                    st.error(error_msg)
+            else:
+                st.sidebar.info("비교할 아파트를 선택하세요.")
+            return
+        
         selected_apt = st.sidebar.selectbox(
             "아파트 선택",
             options=list(apartment_list.keys()),
@@ -101,22 +212,15 @@ def main():
             add_log(f"선택된 아파트: {selected_apt} (ID: {complex_id})")
             
             try:
-                # NaverLandService 초기화
-                service = NaverLandService(
-                    headers=headers,
-                    cookies=cookies.get('cookies', {}),
-                    variables=variables.get('variables', {})
-                )
-                
-                # 데이터 가져오기
-                data = service._fetch_data(complex_id)
+                data = load_complex_data(complex_id)
+                figure = get_maintenance_figure(complex_id, data.version, data.unit_types)
                 
-                if data:
-                    with tab1:
-                        service.display_complex_info()
-                else:
-                    st.error("데이터를 가져오지 못했습니다.")
+                with tab1:
+                    get_service().display_complex_info(data, figure)
                     
+            except ComplexDataUnavailable:
+                add_log(f"데이터 없음: {complex_id}")
+                st.error("데이터를 가져오지 못했습니다.")
             except Exception as e:
                 error_msg = f"처리 중 오류 발생: {str(e)}"
                 add_log(error_msg)
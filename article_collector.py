@@ -0,0 +1,97 @@
+"""단지 매물(articles/complex/{id}) 수집 모듈
+
+거래 유형(매매 A1, 전세 B1, 월세 B2)별로 isMoreData 가 false 가 될 때까지 페이지를 넘기며
+매물을 하나씩 yield 합니다. 저장소에는 batch_size 단위로 바로 기록하므로,
+수십만 건을 수집해도 메모리에는 한 묶음만 올라갑니다.
+"""
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# 거래 유형 코드
+TRADE_TYPES = ("A1", "B1", "B2")  # 매매, 전세, 월세
+
+Fetch = Callable[[str, Dict, str], Dict]
+
+
+def article_params(apt_code: str, trade_type: str, page: int) -> Dict:
+    """articles/complex 목록 조회 파라미터 (config/sample/sell.yaml 기준)"""
+    return {
+        "realEstateType": "APT:ABYG:JGC:PRE",
+        "tradeType": trade_type,
+        "tag": "::::::::",
+        "rentPriceMin": "0",
+        "rentPriceMax": "900000000",
+        "priceMin": "0",
+        "priceMax": "900000000",
+        "areaMin": "0",
+        "areaMax": "900000000",
+        "showArticle": "false",
+        "sameAddressGroup": "true",
+        "priceType": "RETAIL",
+        "directions": "",
+        "page": str(page),
+        "complexNo": apt_code,
+        "buildingNos": "",
+        "areaNos": "",
+        "type": "list",
+        "order": "rank",
+    }
+
+
+def iter_article_pages(fetch: Fetch, apt_code: str, trade_type: str,
+                       max_pages: Optional[int] = None) -> Iterator[List[Dict]]:
+    """
+    한 단지·거래 유형의 매물 목록을 페이지 단위로 yield 합니다.
+    Args:
+        fetch: (엔드포인트, 파라미터, 단지번호) → JSON 응답
+        max_pages: 최대 페이지 수 (None 이면 isMoreData 가 false 가 될 때까지)
+    """
+    page = 1
+    while max_pages is None or page <= max_pages:
+        data = fetch(f"articles/complex/{apt_code}", article_params(apt_code, trade_type, page), apt_code) or {}
+        articles = data.get("articleList") or []
+        if articles:
+            yield articles
+        if not articles or not data.get("isMoreData"):
+            return
+        page += 1
+
+
+def iter_articles(fetch: Fetch, apt_code: str, trade_types: Iterable[str] = TRADE_TYPES,
+                  max_pages: Optional[int] = None) -> Iterator[Dict]:
+    """한 단지의 매물을 거래 유형별로 하나씩 yield 합니다 (같은 매물번호는 한 번만)."""
+    seen = set()
+    for trade_type in trade_types:
+        for articles in iter_article_pages(fetch, apt_code, trade_type, max_pages):
+            for article in articles:
+                article_no = article.get("articleNo")
+                if article_no in seen:
+                    continue
+                seen.add(article_no)
+                yield article
+
+
+def stream_articles(fetch: Fetch, apt_codes: Iterable[str], sink, trade_types: Iterable[str] = TRADE_TYPES,
+                    batch_size: int = 500, max_pages: Optional[int] = None) -> Tuple[int, int]:
+    """
+    여러 단지의 매물을 받아 오는 대로 sink.add_articles(apt_code, batch) 로 기록합니다.
+    Args:
+        apt_codes: 단지번호 (제너레이터도 가능)
+        sink: add_articles(apt_code, articles) 를 제공하는 저장소 (예: Warehouse)
+    Returns:
+        (단지 수, 매물 수)
+    """
+    trade_types = tuple(trade_types)
+    complexes = total = 0
+    for apt_code in apt_codes:
+        batch: List[Dict] = []
+        for article in iter_articles(fetch, apt_code, trade_types, max_pages):
+            batch.append(article)
+            if len(batch) >= batch_size:
+                sink.add_articles(apt_code, batch)
+                total += len(batch)
+                batch = []
+        if batch:
+            sink.add_articles(apt_code, batch)
+            total += len(batch)
+        complexes += 1
+    return complexes, total
@@ -0,0 +1,218 @@
+"""NaverLandCrawler 비동기 수집 엔진
+
+블로킹 `_make_request` 호출을 스레드 풀에서 실행하고, 전역/엔드포인트 계열별
+세마포어로 동시 요청 수를 제한합니다. 지역 트리 탐색과 단지/학교/가격 조회가
+서로 겹쳐서 진행되므로 전체 수집 시간은 왕복 지연이 아니라 설정한 동시성에 의해 결정됩니다.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+from tqdm import tqdm
+
+from config_loader import load_config
+from crawl_checkpoint import COMPLEX, DONE, FAILED, REGION, UNCHANGED, CrawlCheckpoint
+from crawl_snapshot import SnapshotStore
+from endpoints import endpoint_family
+from region_tree import ROOT_REGION_CODE, RegionNode
+
+
+class AsyncCrawlEngine:
+    def __init__(self, crawler, max_concurrency: Optional[int] = None,
+                 endpoint_limits: Optional[Dict[str, int]] = None,
+                 checkpoint: Optional[CrawlCheckpoint] = None,
+                 snapshots: Optional[SnapshotStore] = None):
+        """
+        Args:
+            crawler: 요청/추출/저장을 담당하는 NaverLandCrawler 인스턴스
+            max_concurrency: 전체 동시 요청 수 (기본값: config/crawler.yaml)
+            endpoint_limits: 엔드포인트 계열별 동시 요청 수 (regions, complex_list, complexes, schools, prices)
+            checkpoint: 완료한 지역/단지를 기록하고 건너뛸 체크포인트 저널
+            snapshots: 증분 수집용 변경 신호 스냅샷 (주어지면 신호가 바뀐 단지만 다시 수집)
+        """
+        config = (load_config('crawler') or {}).get('concurrency', {})
+        self.crawler = crawler
+        self.max_concurrency = max_concurrency or config.get('max_concurrency', 16)
+        self.endpoint_limits = {**config.get('endpoint_limits', {}), **(endpoint_limits or {})}
+        self.checkpoint = checkpoint
+        self.snapshots = snapshots
+        # 증분 모드에서는 변경 신호를 비교할 목록/상세와 다시 받는 학교/가격 모두 캐시를 건너뛴다
+        self.refresh = snapshots is not None
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._global_limit: Optional[asyncio.Semaphore] = None
+        self._family_limits: Dict[str, asyncio.Semaphore] = {}
+        self._progress: Optional[tqdm] = None
+
+    def _family_limit(self, family: str) -> asyncio.Semaphore:
+        """계열별 세마포어 (설정이 없으면 전역 제한만 적용)"""
+        if family not in self._family_limits:
+            limit = self.endpoint_limits.get(family) or self.max_concurrency
+            self._family_limits[family] = asyncio.Semaphore(limit)
+        return self._family_limits[family]
+
+    async def run(self, family: str, func, *args):
+        """
+        동시성 제한 하에서 블로킹 함수를 스레드 풀에서 실행합니다.
+        계열 세마포어를 먼저 얻어야 전역 슬롯을 잡으므로, 포화된 계열(시세표 등) 뒤에 줄 선 작업이
+        전역 슬롯을 붙잡고 다른 계열(상세, 학교)을 굶기지 않습니다.
+        """
+        async with self._family_limit(family), self._global_limit:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, partial(func, *args))
+
+    async def fetch(self, endpoint: str, params: Optional[Dict] = None, apt_code: Optional[str] = None,
+                    refresh: bool = False) -> Dict:
+        """동시성 제한 하에서 crawler._make_request 를 실행합니다."""
+        return await self.run(endpoint_family(endpoint), self.crawler._make_request, endpoint, params, apt_code, refresh)
+
+    async def region_children(self, parent_code: str) -> List[RegionNode]:
+        """하위 지역 노드 (지역 트리에 없을 때만 regions/list 호출)"""
+        return await self.run("regions", self.crawler.region_tree.children, parent_code)
+
+    async def apt_entries(self, dong_code: str) -> Optional[List[Dict]]:
+        """동의 단지 목록 항목 (complexNo, complexName, dealCount 등). 목록 요청이 실패하면 None"""
+        data = await self.fetch(f"regions/complexes?cortarNo={dong_code}&realEstateType=APT&order=",
+                                refresh=self.refresh)
+        if not data or "complexList" not in data:
+            return None
+        return [apt for apt in data["complexList"] or [] if "complexNo" in apt]
+
+    async def process_apt(self, apt_code: str,
+                          list_entry: Optional[Dict] = None) -> Tuple[str, str, Optional[pd.DataFrame]]:
+        """
+        단지 상세/학교/평형별 시세표를 동시에 조회해 (결과, 단지명, DataFrame) 을 반환합니다.
+        결과는 DONE, UNCHANGED(증분 모드에서 상세 변경 신호가 같아 학교/가격 조회 생략), FAILED(빈 응답 등) 중 하나이고
+        DataFrame 은 DONE 일 때만 주어집니다.
+        """
+        # 상세는 crawler.detail_memo 를 거쳐 같은 단지를 여러 번 요청하지 않는다
+        detail = self.run("complexes", self.crawler.get_apt_info, apt_code, self.refresh)
+        schools = partial(self.fetch, f"complexes/{apt_code}/schools", apt_code=apt_code, refresh=self.refresh)
+
+        async def prices(apt_info: Dict) -> Dict[str, Dict]:
+            # 모든 평형의 시세표를 동시에 조회해 pyeongNo 로 묶는다
+            area_nos = self.crawler._pyeong_numbers(apt_info)
+            tables = await asyncio.gather(*(
+                self.run("prices", self.crawler.get_price_info, apt_code, area_no, self.refresh) for area_no in area_nos
+            ))
+            return dict(zip(area_nos, tables))
+
+        async def detail_and_prices() -> Tuple[Dict, Dict[str, Dict]]:
+            apt_info = await detail
+            return apt_info, (await prices(apt_info) if apt_info else {})
+
+        if self.snapshots is None:
+            # 시세표는 상세의 평형 목록이 필요하므로 상세 → 시세 순서로 받고, 학교는 그와 동시에 받는다
+            (apt_info, price_infos), school_info = await asyncio.gather(detail_and_prices(), schools())
+            apt_name = self.crawler._safe_get(apt_info, ["complexDetail", "complexName"], "Unknown")
+            if not apt_info:
+                print(f"Warning: No detail received for apt {apt_code}")
+                return FAILED, apt_name, None
+        else:
+            apt_info = await detail
+            apt_name = self.crawler._safe_get(apt_info, ["complexDetail", "complexName"], "Unknown")
+            if not apt_info:
+                print(f"Warning: No detail received for apt {apt_code}")
+                return FAILED, apt_name, None
+            if not self.snapshots.detail_changed(apt_code, apt_info):
+                self.snapshots.update(apt_code, list_entry, apt_info)
+                return UNCHANGED, apt_name, None
+            school_info, price_infos = await asyncio.gather(schools(), prices(apt_info))
+
+        # DataFrame 생성과 창고 적재(SQLite)는 이벤트 루프를 막지 않도록 스레드 풀에서 실행한다
+        loop = asyncio.get_running_loop()
+        outcome, df = await loop.run_in_executor(
+            self._executor, partial(self.crawler._finish_apt, apt_code, apt_info, school_info, price_infos,
+                                    self.snapshots, list_entry)
+        )
+        return outcome, apt_name, df
+
+    def _is_done(self, kind: str, code: str) -> bool:
+        return self.checkpoint is not None and self.checkpoint.is_done(kind, code)
+
+    def _mark_done(self, kind: str, code: str) -> None:
+        if self.checkpoint is not None:
+            self.checkpoint.mark_done(kind, code)
+
+    async def _crawl_apt(self, apt: Dict, name_parts: List[str]) -> bool:
+        """단지 하나를 수집·저장하고 성공 여부를 반환합니다 (성공하거나 변경이 없을 때만 체크포인트에 기록)."""
+        apt_code = apt["complexNo"]
+        if self._is_done(COMPLEX, apt_code) or (
+                self.snapshots is not None and not self.snapshots.list_changed(apt_code, apt)):
+            self._progress.update(1)
+            return True
+        try:
+            outcome, apt_name, df = await self.process_apt(apt_code, apt)
+            if outcome == FAILED:
+                return False
+            if outcome == DONE:
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(
+                    self._executor, self.crawler._save_apt_frame, df, name_parts + [apt_name]
+                )
+            self._mark_done(COMPLEX, apt_code)
+            return True
+        except Exception as e:
+            print(f"Warning: Error processing apartment {apt_code}: {str(e)}")
+            return False
+        finally:
+            self._progress.update(1)
+
+    async def _crawl_dong(self, dong_code: str, name_parts: List[str]) -> bool:
+        apts = await self.apt_entries(dong_code)
+        if apts is None:
+            return False
+        self._progress.total += len(apts)
+        self._progress.refresh()
+        results = await asyncio.gather(*(self._crawl_apt(apt, name_parts) for apt in apts))
+        return all(results)
+
+    async def _crawl_region(self, code: str, name_parts: List[str], depth: int) -> bool:
+        """
+        depth 단계 아래의 동까지 내려가며 하위 지역을 동시에 탐색합니다.
+        하위 작업이 모두 성공한 지역만 체크포인트에 완료로 기록합니다.
+        """
+        if self._is_done(REGION, code):
+            return True
+        try:
+            if depth == 0:
+                completed = await self._crawl_dong(code, name_parts)
+            else:
+                children = await self.region_children(code)
+                if not self.crawler.region_tree.is_expanded(code):
+                    # regions/list 요청이 실패한 지역은 하위 지역을 모르므로 완료로 기록하지 않는다
+                    return False
+                results = await asyncio.gather(*(
+                    self._crawl_region(child.code, name_parts + [child.name], depth - 1)
+                    for child in children
+                ))
+                completed = all(results)
+            if completed:
+                self._mark_done(REGION, code)
+            return completed
+        except Exception as e:
+            print(f"Warning: Error processing region {code}: {str(e)}")
+            return False
+
+    async def crawl(self, root_code: str, name_parts: List[str], depth: int) -> None:
+        """root_code 부터 depth 단계 아래의 동까지 수집합니다."""
+        self._global_limit = asyncio.Semaphore(self.max_concurrency)
+        self._family_limits = {}
+        self._progress = tqdm(total=0, desc="아파트")
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+                self._executor = executor
+                await self._crawl_region(root_code, name_parts, depth)
+        finally:
+            self._progress.close()
+            self._executor = None
+
+    async def collect_all(self) -> None:
+        """전국 시/도 → 군/구 → 동 → 단지 수집"""
+        await self.crawl(ROOT_REGION_CODE, [], depth=3)
+
+    async def collect_region(self, region_code: str, region_name: str) -> None:
+        """군/구 단위 수집 (동 → 단지)"""
+        await self.crawl(region_code, [region_name], depth=1)
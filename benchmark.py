@@ -0,0 +1,336 @@
+"""수집·추출·대시보드 성능 측정 모듈
+
+녹화해 둔 fixture(mock_server)만으로 다음을 측정하고, 결과를 JSONL 파일에 쌓아 버전 간에 비교합니다.
+  - 수집: 재생 서버를 상대로 collect_region_data(_async) 를 돌려 초당 단지 수와 최대 메모리(MB)
+  - 추출: 녹화된 단지 상세 응답 하나당 디코딩·_parse_complex_info·ComplexModel·_build_apt_frame 시간(µs)과 디코딩 최대 메모리(KB)
+  - 대시보드: 평형이 많은 단지의 display_complex_info 렌더링 시간(ms)
+
+수집 측정은 임시 작업 디렉터리에서 응답 캐시 없이, 벤치마크용 속도 제한으로 실행하므로
+실제 캐시·수집 결과·지역 트리 파일에는 영향을 주지 않습니다.
+
+사용법: python benchmark.py [라벨]
+"""
+import copy
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+
+import pandas as pd
+
+from complex_model import ComplexModel
+from config_loader import load_config
+import http_client
+from mock_server import FixtureStore, MockApiServer, fixtures_path
+from naver_land_service import NaverLandService
+from rate_limiter import RateLimiter, override_rate_limiter
+from response_cache import override_response_cache
+
+PACKAGE_DIR = Path(__file__).parent
+
+# 값이 클수록 좋은 지표 (나머지는 작을수록 좋음)
+HIGHER_IS_BETTER = ("complexes_per_sec",)
+
+
+def _benchmark_config() -> Dict:
+    return (load_config('crawler') or {}).get('benchmark', {}) or {}
+
+
+def open_fixture_store(config: Optional[Dict] = None) -> FixtureStore:
+    """benchmark.fixtures_path (비우면 mock.fixtures_path) 의 fixture 저장소"""
+    config = config if config is not None else _benchmark_config()
+    if config.get('fixtures_path'):
+        return FixtureStore(str(fixtures_path(config)))
+    return FixtureStore(str(fixtures_path((load_config('crawler') or {}).get('mock', {}) or {})))
+
+
+@contextmanager
+def _isolated_run(rate: float) -> Iterator[Path]:
+    """임시 작업 디렉터리 + 응답 캐시 없음 + 벤치마크용 속도 제한"""
+    previous_dir = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="naver-bench-") as work_dir:
+        os.chdir(work_dir)
+        try:
+            with override_response_cache(None), override_rate_limiter(RateLimiter(rate=rate, burst=max(int(rate), 1))):
+                yield Path(work_dir)
+        finally:
+            os.chdir(previous_dir)
+
+
+def _per_call_us(func: Callable, items: List, repeat: int) -> Optional[float]:
+    """items 각각에 func 를 적용하는 데 걸린 시간의 최솟값(repeat 회 중)을 항목당 µs 로 반환합니다."""
+    if not items:
+        return None
+    best = float("inf")
+    for _ in range(max(repeat, 1)):
+        started = time.perf_counter()
+        for item in items:
+            func(item)
+        best = min(best, time.perf_counter() - started)
+    return round(best / len(items) * 1e6, 2)
+
+
+def _peak_kb(func: Callable, items: List) -> Optional[float]:
+    """items 각각에 func 를 적용할 때 호출 하나가 잡는 최대 메모리(KB, 결과 객체 포함)의 최댓값"""
+    if not items:
+        return None
+    peak = 0
+    tracemalloc.start()
+    try:
+        for item in items:
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            func(item)
+            peak = max(peak, tracemalloc.get_traced_memory()[1] - baseline)
+    finally:
+        tracemalloc.stop()
+    return round(peak / 1024, 1)
+
+
+def bench_crawl(store: FixtureStore, region_code: str, mode: str = "sync", rate: float = 1000,
+                measure_memory: bool = True, **server_options) -> Dict[str, float]:
+    """
+    재생 서버를 상대로 한 지역을 수집합니다.
+    Args:
+        mode: "sync"(collect_region_data) 또는 "async"(collect_region_data_async)
+        rate: 벤치마크 중 초당 요청 수 제한
+        measure_memory: True 면 tracemalloc 으로 한 번 더 수집해 최대 메모리를 잰다 (처리량 측정과 분리)
+        server_options: MockApiServer 옵션 (latency, error_rate 등)
+    """
+    from test_refactor import NaverLandCrawler
+
+    def run_once() -> Dict:
+        server = MockApiServer(store, port=0, **server_options).start()
+        try:
+            with NaverLandCrawler(auth_token="benchmark", storage_format="csv") as crawler:
+                crawler.base_url = server.base_url
+                started = time.perf_counter()
+                if mode == "async":
+                    crawler.collect_region_data_async(region_code)
+                else:
+                    crawler.collect_region_data(region_code)
+                return {"elapsed": time.perf_counter() - started, "stats": server.stats()}
+        finally:
+            server.stop()
+
+    with _isolated_run(rate):
+        result = run_once()
+    complexes = result["stats"]["served"].get("complexes", 0)
+    metrics = {
+        f"crawl_{mode}_complexes": complexes,
+        f"crawl_{mode}_seconds": round(result["elapsed"], 3),
+        f"crawl_{mode}_complexes_per_sec": round(complexes / result["elapsed"], 2) if result["elapsed"] else 0.0,
+        f"crawl_{mode}_requests": result["stats"]["requests"],
+    }
+
+    if measure_memory:
+        with _isolated_run(rate):
+            tracemalloc.start()
+            try:
+                run_once()
+                metrics[f"crawl_{mode}_peak_mb"] = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 2)
+            finally:
+                tracemalloc.stop()
+    return metrics
+
+
+def _complex_payloads(store: FixtureStore, limit: Optional[int]) -> List[bytes]:
+    """녹화된 complexes/{id} 응답 중 단지 상세(complexDetail)가 있는 본문"""
+    bodies = []
+    for body in store.bodies("complexes", limit):
+        try:
+            data = http_client.decode_json(body)
+        except ValueError:
+            continue
+        if isinstance(data, dict) and "complexDetail" in data:
+            bodies.append(body)
+    return bodies
+
+
+def bench_extract(store: FixtureStore, limit: Optional[int] = 500, repeat: int = 5) -> Dict[str, float]:
+    """녹화된 단지 상세 응답 하나당 디코딩·파싱·모델 생성·수집 행 생성 시간(µs)"""
+    from test_refactor import NaverLandCrawler
+
+    bodies = _complex_payloads(store, limit)
+    if not bodies:
+        print("[WARN] 녹화된 단지 상세(complexes) 응답이 없어 추출 측정을 건너뜁니다.")
+        return {}
+    payloads = [http_client.decode_json(body) for body in bodies]
+    service = NaverLandService({}, {}, {})
+    parsed = [service._parse_complex_info(data) for data in payloads]
+
+    with _isolated_run(rate=1000), NaverLandCrawler(auth_token="benchmark", storage_format="csv") as crawler:
+        def build_frame(data: Dict):
+            # 시세표는 빈 값으로 넘겨 추출 비용만 잰다
+            return crawler._build_apt_frame(data, {}, str(data["complexDetail"].get("complexNo", "")), price_infos={})
+
+        return {
+            "extract_responses": len(payloads),
+            "extract_decode_us": _per_call_us(http_client.decode_json, bodies, repeat),
+            "extract_decode_peak_kb": _peak_kb(http_client.decode_json, bodies),
+            "extract_parse_complex_info_us": _per_call_us(service._parse_complex_info, payloads, repeat),
+            "extract_complex_model_us": _per_call_us(
+                lambda item: ComplexModel("", item["complex_info"], item["unit_types"]), parsed, repeat),
+            "extract_build_apt_frame_us": _per_call_us(build_frame, payloads, repeat),
+        }
+
+
+def _dashboard_payload(store: FixtureStore, pyeong_count: int) -> Optional[Dict]:
+    """평형이 가장 많은 녹화 단지를 pyeong_count 개 평형으로 늘린 파싱 결과"""
+    service = NaverLandService({}, {}, {})
+    candidates = [service._parse_complex_info(http_client.decode_json(body))
+                  for body in _complex_payloads(store, None)]
+    candidates = [item for item in candidates if item["unit_types"]]
+    if not candidates:
+        return None
+    parsed = max(candidates, key=lambda item: len(item["unit_types"]))
+    templates = parsed["unit_types"]
+    unit_types = []
+    for i in range(pyeong_count):
+        unit = copy.deepcopy(templates[i % len(templates)])
+        unit["size"]["supply_area"] = str(60 + i)
+        unit_types.append(unit)
+    return {"complex_info": parsed["complex_info"], "unit_types": unit_types}
+
+
+_DASHBOARD_SCRIPT = """
+import json, sys
+sys.path.insert(0, {package_dir!r})
+from complex_model import ComplexModel
+from naver_land_service import NaverLandService
+with open({payload_path!r}, encoding="utf-8") as f:
+    payload = json.load(f)
+NaverLandService({{}}, {{}}, {{}}).display_complex_info(
+    ComplexModel("benchmark", payload["complex_info"], payload["unit_types"]))
+"""
+
+
+def bench_dashboard(store: FixtureStore, pyeong_count: int = 40, repeat: int = 5) -> Dict[str, float]:
+    """평형이 많은 단지의 대시보드 렌더링 시간 (Streamlit AppTest, 그래프 메모 없이)"""
+    try:
+        from streamlit.testing.v1 import AppTest
+    except ImportError:
+        print("[WARN] streamlit.testing 을 불러올 수 없어 대시보드 측정을 건너뜁니다.")
+        return {}
+
+    payload = _dashboard_payload(store, pyeong_count)
+    if payload is None:
+        print("[WARN] 녹화된 평형 정보가 없어 대시보드 측정을 건너뜁니다.")
+        return {}
+
+    with tempfile.TemporaryDirectory(prefix="naver-bench-") as work_dir:
+        payload_path = str(Path(work_dir) / "payload.json")
+        with open(payload_path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False)
+        script = _DASHBOARD_SCRIPT.format(package_dir=str(PACKAGE_DIR), payload_path=payload_path)
+
+        timings = []
+        for _ in range(max(repeat, 1)):
+            app = AppTest.from_string(script, default_timeout=60)
+            started = time.perf_counter()
+            app.run()
+            timings.append(time.perf_counter() - started)
+            if app.exception:
+                print(f"[ERROR] 대시보드 렌더링 실패: {app.exception[0].message}")
+                return {}
+    return {
+        "dashboard_pyeong": pyeong_count,
+        "dashboard_render_ms": round(statistics.median(timings) * 1000, 1),
+    }
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PACKAGE_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _results_path(config: Dict) -> Path:
+    path = Path(config.get('results_path', 'data/benchmarks.jsonl'))
+    return path if path.is_absolute() else PACKAGE_DIR / path
+
+
+def load_results(path: Optional[str] = None) -> List[Dict]:
+    """저장된 벤치마크 결과 (오래된 것부터)"""
+    results_path = Path(path) if path else _results_path(_benchmark_config())
+    if not results_path.exists():
+        return []
+    with open(results_path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def compare_results(previous: Dict, current: Dict) -> pd.DataFrame:
+    """두 결과의 지표별 변화 (개선 여부는 지표 방향을 반영)"""
+    rows = []
+    for name in sorted(set(previous["metrics"]) | set(current["metrics"])):
+        before, after = previous["metrics"].get(name), current["metrics"].get(name)
+        change = None
+        if isinstance(before, (int, float)) and isinstance(after, (int, float)) and before:
+            change = round((after - before) / before * 100, 1)
+        better = None
+        if change is not None and change != 0:
+            better = (change > 0) == name.endswith(HIGHER_IS_BETTER)
+        rows.append({"지표": name, "이전": before, "현재": after, "변화율(%)": change, "개선": better})
+    return pd.DataFrame(rows, columns=["지표", "이전", "현재", "변화율(%)", "개선"])
+
+
+def run_benchmarks(label: Optional[str] = None, save: bool = True) -> Dict:
+    """
+    config/crawler.yaml 의 benchmark 설정으로 전체 측정을 실행하고 결과를 저장합니다.
+    Returns:
+        {"label", "git_rev", "created_at", "python", "json_backend", "metrics"}
+    """
+    config = _benchmark_config()
+    store = open_fixture_store(config)
+    print(f"fixture: {store.path} {store.stats()}")
+    repeat = config.get('repeat', 5)
+    server_options = {
+        "latency": config.get('latency', 0.0),
+        "error_rate": config.get('error_rate', 0.0),
+        "seed": config.get('seed', 0),
+    }
+
+    metrics: Dict[str, float] = {}
+    region_code = config.get('region_code')
+    if region_code:
+        for mode in config.get('modes', ['sync', 'async']):
+            metrics.update(bench_crawl(store, str(region_code), mode, rate=config.get('rate', 1000),
+                                       measure_memory=config.get('measure_memory', True), **server_options))
+    else:
+        print("[WARN] benchmark.region_code 가 없어 수집 측정을 건너뜁니다.")
+    metrics.update(bench_extract(store, config.get('extract_limit', 500), repeat))
+    metrics.update(bench_dashboard(store, config.get('dashboard_pyeong', 40), repeat))
+
+    result = {
+        "label": label or "",
+        "git_rev": _git_revision(),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "json_backend": http_client.JSON_BACKEND,
+        "metrics": metrics,
+    }
+    if save:
+        results_path = _results_path(config)
+        results_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(results_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(result, ensure_ascii=False) + "\n")
+    return result
+
+
+if __name__ == "__main__":
+    history = load_results()
+    current = run_benchmarks(sys.argv[1] if len(sys.argv) > 1 else None)
+    print(pd.Series(current["metrics"]).to_string())
+    if history:
+        print(f"\n이전 결과({history[-1]['git_rev']} {history[-1]['label']})와 비교:")
+        print(compare_results(history[-1], current).to_string(index=False))
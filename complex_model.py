@@ -0,0 +1,133 @@
+"""단지·평형·관리비 내역의 간결한 타입 모델
+
+_parse_complex_info 가 만드는 중첩 dict(숫자도 문자열)를 __slots__ 객체로 바꿉니다.
+숫자 필드는 한 번만 변환하고, 관리비 내역은 array 두 개(연월, 금액)로 보관하며,
+원본 응답(raw)은 필요할 때만 남깁니다. 대시보드 한 프로세스에 수천 개 단지를 메모해 둘 수 있습니다.
+"""
+import hashlib
+import json
+import sys
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+def _to_int(value) -> Optional[int]:
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_float(value) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_str(value) -> str:
+    # '정보없음', '84' 처럼 단지마다 반복되는 문자열은 하나의 객체를 공유한다
+    return sys.intern(str(value)) if value is not None else ""
+
+
+def payload_version(raw_response: Dict) -> str:
+    """원본 응답의 해시 (그래프 등 파생 데이터 메모의 키)"""
+    raw = json.dumps(raw_response, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:16]
+
+
+class MaintenanceSeries:
+    """월별 관리비 내역 (연월 YYYYMM, 금액)"""
+    __slots__ = ("months", "costs")
+
+    def __init__(self, months: Iterable[int] = (), costs: Iterable[int] = ()):
+        self.months = array("i", months)
+        self.costs = array("q", costs)
+
+    @classmethod
+    def from_list(cls, cost_list: List[Dict]) -> "MaintenanceSeries":
+        """maintenanceCostList 항목 중 연월과 금액이 모두 숫자인 것만 보관합니다."""
+        series = cls()
+        for cost in cost_list or []:
+            month = _to_int(cost.get('basisYearMonth'))
+            total = _to_int(cost.get('totalPrice'))
+            if month is not None and total is not None:
+                series.months.append(month)
+                series.costs.append(total)
+        return series
+
+    def __len__(self) -> int:
+        return len(self.months)
+
+
+class UnitType:
+    """평형 하나 (면적·구조·관리비·호가)"""
+    __slots__ = ("supply_area", "exclusive_area", "exclusive_rate", "rooms", "bathrooms", "structure",
+                 "fee_average", "fee_summer", "fee_winter",
+                 "price_sales", "price_lease", "price_rent",
+                 "sales_count", "lease_count", "rent_count", "maintenance")
+
+    def __init__(self, unit: Dict):
+        """
+        Args:
+            unit: unit_type 추출 규칙의 결과 (config/variables.yaml)
+        """
+        size, layout = unit.get('size', {}), unit.get('layout', {})
+        fee, price = unit.get('maintenance_fee', {}), unit.get('price', {})
+        self.supply_area = _to_float(size.get('supply_area'))
+        self.exclusive_area = _to_float(size.get('exclusive_area'))
+        self.exclusive_rate = _to_float(size.get('exclusive_rate'))
+        self.rooms = _to_int(layout.get('rooms'))
+        self.bathrooms = _to_int(layout.get('bathrooms'))
+        self.structure = _to_str(layout.get('structure'))
+        self.fee_average = _to_int(fee.get('average'))
+        self.fee_summer = _to_int(fee.get('summer'))
+        self.fee_winter = _to_int(fee.get('winter'))
+        self.price_sales = _to_str(price.get('sales'))
+        self.price_lease = _to_str(price.get('lease'))
+        self.price_rent = _to_str(price.get('rent'))
+        self.sales_count = _to_int(price.get('sales_count'))
+        self.lease_count = _to_int(price.get('lease_count'))
+        self.rent_count = _to_int(price.get('rent_count'))
+        self.maintenance = MaintenanceSeries.from_list(unit.get('maintenance_cost_list'))
+
+    @property
+    def label(self) -> str:
+        """표시용 평형 이름 (예: '84㎡')"""
+        if self.supply_area is None:
+            return "?㎡"
+        return f"{self.supply_area:g}㎡"
+
+
+class ComplexModel:
+    """단지 요약과 평형 목록"""
+    __slots__ = ("complex_id", "name", "road_address", "jibun_address", "total_units", "total_buildings",
+                 "sales_count", "lease_count", "rent_count", "unit_types", "version", "raw")
+
+    def __init__(self, complex_id: str, complex_info: Dict, unit_types: List[Dict],
+                 raw: Optional[Dict] = None, keep_raw: bool = True):
+        """
+        Args:
+            complex_info: complex_summary 추출 규칙의 결과
+            unit_types: unit_type 추출 규칙의 결과 목록
+            raw: 원본 응답 (version 계산에 쓰고, keep_raw 가 False 면 보관하지 않음)
+        """
+        address, stats = complex_info.get('address', {}), complex_info.get('stats', {})
+        articles = complex_info.get('current_articles', {})
+        self.complex_id = str(complex_id)
+        self.name = _to_str(complex_info.get('name'))
+        self.road_address = _to_str(address.get('road'))
+        self.jibun_address = _to_str(address.get('jibun'))
+        self.total_units = _to_int(stats.get('total_units'))
+        self.total_buildings = _to_int(stats.get('total_buildings'))
+        self.sales_count = _to_int(articles.get('sales')) or 0
+        self.lease_count = _to_int(articles.get('lease')) or 0
+        self.rent_count = _to_int(articles.get('rent')) or 0
+        self.unit_types: Tuple[UnitType, ...] = tuple(UnitType(unit) for unit in unit_types)
+        self.version = payload_version(raw) if raw is not None else None
+        self.raw = raw if keep_raw else None
+
+    def drop_raw(self) -> "ComplexModel":
+        """원본 응답을 버려 메모리를 줄입니다."""
+        self.raw = None
+        return self
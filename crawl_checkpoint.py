@@ -0,0 +1,72 @@
+"""수집 체크포인트 저널 모듈
+
+완료한 지역(시/도, 군/구, 동)과 단지를 JSONL 파일에 한 줄씩 추가 기록합니다.
+수집이 중간에 중단되어도 resume 모드로 다시 시작하면 기록된 작업을 건너뜁니다.
+"""
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Set
+
+REGION = "region"
+COMPLEX = "complex"
+
+# 단지 하나의 수집 결과. DONE/UNCHANGED 만 체크포인트에 완료로 기록하고, FAILED 는 재개 시 다시 수집한다
+DONE = "done"            # 수집·저장 성공
+UNCHANGED = "unchanged"  # 증분 모드에서 변경 신호가 같아 건너뜀
+FAILED = "failed"        # 요청 실패(빈 응답) 또는 추출/저장 오류
+
+
+class CrawlCheckpoint:
+    def __init__(self, path: str, resume: bool = True):
+        """
+        Args:
+            path: 저널 파일 경로
+            resume: True 면 기존 저널을 이어서 사용하고, False 면 새로 시작
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._done: Dict[str, Set[str]] = {REGION: set(), COMPLEX: set()}
+        self._lock = threading.Lock()
+
+        if resume and self.path.exists():
+            self._load()
+        self._file = open(self.path, "a" if resume else "w", encoding="utf-8")
+
+    def _load(self) -> None:
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # 중단 시점에 잘린 마지막 줄은 무시
+                    continue
+                self._done.setdefault(entry["kind"], set()).add(entry["code"])
+
+    def is_done(self, kind: str, code: str) -> bool:
+        return str(code) in self._done.get(kind, ())
+
+    def mark_done(self, kind: str, code: str) -> None:
+        """작업 완료를 저널에 기록합니다 (즉시 flush)."""
+        code = str(code)
+        with self._lock:
+            if code in self._done.setdefault(kind, set()):
+                return
+            self._done[kind].add(code)
+            self._file.write(json.dumps({"kind": kind, "code": code, "ts": time.time()}) + "\n")
+            self._file.flush()
+
+    def summary(self) -> Dict[str, int]:
+        return {kind: len(codes) for kind, codes in self._done.items()}
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    def __enter__(self) -> "CrawlCheckpoint":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
@@ -0,0 +1,96 @@
+"""단지 변경 신호 스냅샷 모듈
+
+단지 목록(regions/complexes)과 단지 상세(complexes/{id}) 응답에서 싸게 얻을 수 있는
+매물 수(dealCount/leaseCount/rentCount 등)를 단지별로 저장해 두고, 다음 수집 때 비교해
+바뀐 단지만 학교/가격 정보를 다시 가져오도록 합니다.
+"""
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+# 단지 목록 응답의 변경 신호
+LIST_SIGNAL_KEYS = ("dealCount", "leaseCount", "rentCount", "shortTermRentCount")
+# 단지 상세 응답(complexDetail)의 변경 신호
+DETAIL_SIGNAL_KEYS = ("dealCount", "leaseCount", "rentCount", "shortTermLeaseCount", "totalHouseholdCount")
+# 평형별 매물 통계(articleStatistics)의 변경 신호
+PYEONG_SIGNAL_KEYS = ("dealCount", "leaseCount", "rentCount", "dealPriceString", "leasePriceString", "rentPriceString")
+
+
+def list_signals(list_entry: Dict) -> Dict:
+    """단지 목록 항목에서 변경 신호를 추출합니다."""
+    return {key: list_entry.get(key) for key in LIST_SIGNAL_KEYS}
+
+
+def detail_signals(apt_info: Dict) -> Dict:
+    """단지 상세 응답에서 단지/평형별 변경 신호를 추출합니다."""
+    detail = apt_info.get("complexDetail", {}) or {}
+    signals = {key: detail.get(key) for key in DETAIL_SIGNAL_KEYS}
+    for pyeong in apt_info.get("complexPyeongDetailList", []) or []:
+        stats = pyeong.get("articleStatistics", {}) or {}
+        pyeong_no = pyeong.get("pyeongNo")
+        for key in PYEONG_SIGNAL_KEYS:
+            signals[f"{pyeong_no}.{key}"] = stats.get(key)
+    return signals
+
+
+class SnapshotStore:
+    def __init__(self, path: str, autosave_every: int = 100):
+        """
+        Args:
+            path: 스냅샷 JSON 파일 경로
+            autosave_every: 이 횟수만큼 갱신될 때마다 파일에 저장
+        """
+        self.path = Path(path)
+        self.autosave_every = autosave_every
+        self._lock = threading.Lock()
+        self._dirty = 0
+        self._snapshots: Dict[str, Dict] = {}
+        if self.path.exists():
+            with open(self.path, "r", encoding="utf-8") as f:
+                self._snapshots = json.load(f)
+        self.stats = {"unchanged_list": 0, "unchanged_detail": 0, "changed": 0}
+
+    def list_changed(self, apt_code: str, list_entry: Optional[Dict]) -> bool:
+        """단지 목록 신호가 저장된 스냅샷과 다른지 확인합니다 (처음 보는 단지는 변경으로 간주)."""
+        snapshot = self._snapshots.get(str(apt_code))
+        if snapshot is None or list_entry is None:
+            return True
+        if snapshot.get("list") != list_signals(list_entry):
+            return True
+        with self._lock:
+            self.stats["unchanged_list"] += 1
+        return False
+
+    def detail_changed(self, apt_code: str, apt_info: Dict) -> bool:
+        """단지 상세 신호가 저장된 스냅샷과 다른지 확인합니다."""
+        snapshot = self._snapshots.get(str(apt_code))
+        changed = snapshot is None or snapshot.get("detail") != detail_signals(apt_info)
+        with self._lock:
+            self.stats["changed" if changed else "unchanged_detail"] += 1
+        return changed
+
+    def update(self, apt_code: str, list_entry: Optional[Dict], apt_info: Dict) -> None:
+        """단지의 최신 신호를 기록합니다."""
+        snapshot = {
+            "list": list_signals(list_entry) if list_entry is not None else None,
+            "detail": detail_signals(apt_info),
+            "updated": time.time(),
+        }
+        with self._lock:
+            self._snapshots[str(apt_code)] = snapshot
+            self._dirty += 1
+            should_save = self._dirty >= self.autosave_every
+        if should_save:
+            self.save()
+
+    def save(self) -> None:
+        """스냅샷을 임시 파일에 쓴 뒤 교체합니다."""
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._snapshots, f, ensure_ascii=False)
+            tmp_path.replace(self.path)
+            self._dirty = 0
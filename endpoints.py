@@ -0,0 +1,42 @@
+"""네이버 부동산 API 엔드포인트 분류 모듈"""
+from urllib.parse import urlsplit
+
+from config_loader import load_config
+
+BASE_URL = "https://new.land.naver.com/api"
+
+# 동시성 제한, 캐시 TTL 등에서 공통으로 사용하는 엔드포인트 계열
+ENDPOINT_FAMILIES = ("regions", "complex_list", "complexes", "schools", "prices", "articles")
+
+
+def endpoint_family(endpoint: str) -> str:
+    """엔드포인트(상대 경로 또는 전체 URL)가 속한 계열을 반환합니다."""
+    path = urlsplit(endpoint).path
+    if "/api/" in path:
+        path = path.split("/api/", 1)[1]
+    path = path.strip("/")
+
+    if path.startswith("regions/complexes"):
+        return "complex_list"
+    if path.startswith("regions"):
+        return "regions"
+    if path.startswith("articles"):
+        return "articles"
+    if path.startswith("complexes"):
+        if path.endswith("/schools"):
+            return "schools"
+        if path.endswith("/prices"):
+            return "prices"
+        return "complexes"
+    return "other"
+
+
+def api_base_url() -> str:
+    """config/crawler.yaml 의 api.base_url (재생 서버로 돌릴 때 바꿈, 기본값: 실제 API)"""
+    config = (load_config('crawler') or {}).get('api', {}) or {}
+    return str(config.get('base_url') or BASE_URL).rstrip("/")
+
+
+def complex_url(complex_id: str) -> str:
+    """단지 상세(complexes/{id}) URL (대시보드와 예열이 같은 캐시 키를 쓰도록 공유)"""
+    return f"{api_base_url()}/complexes/{complex_id}"
@@ -0,0 +1,136 @@
+"""선언형 필드 추출 모듈
+
+config/variables.yaml 의 extractors 섹션을 한 번만 컴파일해 필드마다 미리 분해한 접근 경로를 만들고,
+응답 dict 에 그대로 적용합니다. 필드를 추가하거나 경로를 바꿀 때는 코드 대신 설정만 수정하면 됩니다.
+
+필드 정의 형식:
+    출력키: complexDetail.complexName          # 점으로 구분한 경로 (숫자는 리스트 인덱스)
+    출력키: {path: dealCount, default: 0}      # 값이 없을 때의 기본값 지정
+    출력키: {paths: [address, detailAddress], join: " "}   # 여러 값을 이어 붙임 (빈 값 제외)
+출력키에 점이 있으면(예: address.road) 중첩 dict 로 만듭니다.
+"""
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from config_loader import load_config
+
+Path = Tuple[Union[str, int], ...]
+
+_MISSING = object()
+
+
+def parse_path(path: Union[str, List, None]) -> Path:
+    """'a.b.0.c' 또는 ['a', 'b', 0, 'c'] 를 접근 키 튜플로 변환합니다."""
+    if path is None or path == "":
+        return ()
+    if isinstance(path, (list, tuple)):
+        return tuple(path)
+    return tuple(int(key) if key.isdigit() else key for key in str(path).split("."))
+
+
+def _compile_getter(keys: Path, default: Any) -> Callable[[Any], Any]:
+    """접근 키 튜플로 값을 꺼내는 함수를 만듭니다 (중간에 값이 없으면 default)."""
+    if not keys:
+        return lambda data: default if data is None else data
+    if len(keys) == 1:
+        key = keys[0]
+
+        def get_one(data):
+            try:
+                return data[key]
+            except (KeyError, TypeError, IndexError):
+                return default
+        return get_one
+
+    def get_nested(data):
+        try:
+            for key in keys:
+                data = data[key]
+        except (KeyError, TypeError, IndexError):
+            return default
+        return data
+    return get_nested
+
+
+def _compile_field(spec: Any, default: Any) -> Callable[[Any], Any]:
+    if isinstance(spec, dict) and "paths" in spec:
+        separator = spec.get("join", " ")
+        getters = [_compile_getter(parse_path(path), None) for path in spec["paths"]]
+        field_default = spec.get("default", default)
+
+        def get_joined(data):
+            values = [str(value) for value in (get(data) for get in getters) if value not in (None, "")]
+            return separator.join(values) if values else field_default
+        return get_joined
+    if isinstance(spec, dict):
+        field_default = spec.get("default", default)
+        if isinstance(field_default, (list, dict)):
+            # 가변 기본값은 결과끼리 공유되지 않도록 매번 새로 만든다
+            get = _compile_getter(parse_path(spec.get("path")), _MISSING)
+            empty = type(field_default)
+
+            def get_or_copy(data):
+                value = get(data)
+                return empty(field_default) if value is _MISSING else value
+            return get_or_copy
+        return _compile_getter(parse_path(spec.get("path")), field_default)
+    return _compile_getter(parse_path(spec), default)
+
+
+class FieldExtractor:
+    def __init__(self, fields: Dict[str, Any], root: Optional[Union[str, List]] = None, default: Any = None):
+        """
+        Args:
+            fields: 출력키 → 필드 정의
+            root: 응답에서 필드 경로의 기준이 되는 위치 (예: complexDetail)
+            default: 값이 없을 때의 기본값 (필드별 default 가 우선)
+        """
+        self.columns = list(fields)
+        self._root = _compile_getter(parse_path(root), _MISSING)
+        self._flat: List[Tuple[str, Callable]] = []
+        self._nested: List[Tuple[Tuple[str, ...], str, Callable]] = []
+        for name, spec in fields.items():
+            getter = _compile_field(spec, default)
+            if "." in name:
+                *parents, leaf = name.split(".")
+                self._nested.append((tuple(parents), leaf, getter))
+            else:
+                self._flat.append((name, getter))
+
+    def _apply(self, data: Any) -> Dict:
+        result = {name: get(data) for name, get in self._flat}
+        for parents, leaf, get in self._nested:
+            target = result
+            for key in parents:
+                target = target.setdefault(key, {})
+            target[leaf] = get(data)
+        return result
+
+    def extract(self, response: Any) -> Dict:
+        """root 위치의 객체 하나에서 필드를 추출합니다."""
+        data = self._root(response)
+        return self._apply(None if data is _MISSING else data)
+
+    def extract_each(self, response: Any) -> List[Dict]:
+        """root 위치의 리스트 항목마다 필드를 추출합니다."""
+        items = self._root(response)
+        if items is _MISSING or not isinstance(items, list):
+            return []
+        return [self._apply(item) for item in items]
+
+
+_extractors: Dict[str, FieldExtractor] = {}
+
+
+def compile_extractors(config: Dict) -> Dict[str, FieldExtractor]:
+    """extractors 설정 전체를 컴파일합니다."""
+    return {
+        name: FieldExtractor(spec.get("fields", {}), root=spec.get("root"), default=spec.get("default"))
+        for name, spec in (config or {}).items()
+    }
+
+
+def get_extractor(name: str) -> FieldExtractor:
+    """config/variables.yaml 의 extractors.<name> 을 반환합니다 (처음 호출 시 한 번만 컴파일)."""
+    if not _extractors:
+        _extractors.update(compile_extractors((load_config('variables') or {}).get('extractors', {})))
+    return _extractors[name]
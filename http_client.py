@@ -0,0 +1,159 @@
+"""HTTP 세션 풀 모듈
+
+new.land.naver.com 호출은 모두 이 모듈의 get()/get_json() 을 거칩니다. 작업 스레드마다 keep-alive 와
+gzip 압축 전송을 쓰는 requests.Session 을 하나씩 재사용하므로, TCP/TLS 연결 비용을
+요청마다가 아니라 스레드마다 한 번만 지불합니다. 요청은 공유 RateLimiter 로 속도가 제한되고,
+get_json() 은 응답 디스크 캐시(response_cache)를 먼저 확인합니다.
+mock.record 가 켜져 있으면 정상 응답을 재생 서버(mock_server)용 fixture 로도 저장합니다.
+실제로 보낸 요청과 캐시 적중은 모두 엔드포인트 계열별 지표(metrics)로 집계되고,
+tracing 이 켜져 있으면 network/cache/decode 단계 시간도 측정됩니다.
+응답은 response.text 를 거치지 않고 bytes 에서 바로 디코딩하며, orjson 이 설치돼 있으면 orjson 을 씁니다.
+"""
+import codecs
+import json
+import threading
+import time
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import orjson
+except ImportError:  # orjson 이 없으면 표준 json 으로 디코딩
+    orjson = None
+
+from config_loader import load_config
+from metrics import get_metrics
+from mock_server import get_recorder
+from rate_limiter import get_rate_limiter
+from response_cache import get_response_cache
+from tracing import span
+
+DEFAULT_HEADERS = {
+    "Accept-Encoding": "gzip, deflate",
+    "Connection": "keep-alive",
+}
+
+
+class ApiResponseError(requests.exceptions.HTTPError):
+    """상태 코드가 200 이 아니거나 본문이 비어 있는 응답"""
+
+
+_local = threading.local()
+_config = None
+_config_lock = threading.Lock()
+
+
+def _http_config() -> dict:
+    """config/crawler.yaml 의 http 설정 (pool_size, timeout)"""
+    global _config
+    with _config_lock:
+        if _config is None:
+            _config = (load_config('crawler') or {}).get('http', {})
+        return _config
+
+
+def _build_session(pool_size: int) -> requests.Session:
+    session = requests.Session()
+    # 재시도는 호출자(_make_request 등)와 RateLimiter 가 담당하므로 어댑터 재시도는 끈다
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update(DEFAULT_HEADERS)
+    return session
+
+
+def get_session() -> requests.Session:
+    """현재 스레드의 풀링된 세션을 반환합니다 (없으면 생성)."""
+    session = getattr(_local, "session", None)
+    if session is None:
+        session = _build_session(int(_http_config().get('pool_size', 16)))
+        _local.session = session
+    return session
+
+
+def close_session() -> None:
+    """현재 스레드의 세션과 연결을 닫습니다."""
+    session = getattr(_local, "session", None)
+    if session is not None:
+        session.close()
+        _local.session = None
+
+
+def get(url: str, timeout: Optional[float] = None, **kwargs) -> requests.Response:
+    """속도 제한을 거쳐 풀링된 세션으로 GET 요청을 보냅니다 (kwargs 는 requests 와 동일)."""
+    limiter = get_rate_limiter()
+    metrics = get_metrics()
+    waited = limiter.acquire()
+    started = time.perf_counter()
+    try:
+        with span("network"):
+            response = get_session().get(url, timeout=timeout or _http_config().get('timeout', 10), **kwargs)
+    except requests.exceptions.RequestException:
+        limiter.record(None)
+        metrics.observe_request(url, None, time.perf_counter() - started, waited=waited)
+        raise
+    metrics.observe_request(url, response.status_code, time.perf_counter() - started,
+                            len(response.content), waited)
+    limiter.record_response(response)
+    recorder = get_recorder()
+    if recorder is not None and response.status_code == 200 and response.content:
+        recorder.record(url, kwargs.get("params"), response.content)
+    return response
+
+
+JSON_BACKEND = "orjson" if orjson is not None else "json"
+
+
+def decode_json(content: bytes) -> Dict:
+    """
+    UTF-8(BOM 포함 가능) JSON 본문을 bytes 에서 바로 디코딩합니다.
+    본문 전체를 str 로 한 번 더 복사하지 않도록, orjson 에는 BOM 만 잘라 낸 memoryview 를 넘깁니다.
+    orjson 이 거부하는 본문(NaN, 64비트를 넘는 정수 등)은 표준 json 으로 다시 디코딩합니다.
+    """
+    with span("decode"):
+        if orjson is not None:
+            body = memoryview(content)[len(codecs.BOM_UTF8):] if content.startswith(codecs.BOM_UTF8) else content
+            try:
+                return orjson.loads(body)
+            except orjson.JSONDecodeError:
+                pass
+        # 표준 json 은 bytes 를 받으면 BOM 을 포함한 인코딩을 스스로 판별한다
+        return json.loads(content)
+
+
+def get_cached_json(url: str, params: Optional[Dict] = None) -> Optional[Dict]:
+    """요청 없이 캐시된 응답만 디코딩해 반환합니다 (캐시가 없거나 만료됐으면 None)."""
+    cache = get_response_cache()
+    if cache is None:
+        return None
+    body = cache.get(url, params)
+    return decode_json(body) if body is not None else None
+
+
+def get_json(url: str, params: Optional[Dict] = None, use_cache: bool = True,
+             refresh: bool = False, **kwargs) -> Dict:
+    """
+    캐시를 먼저 확인하고, 없으면 요청해 JSON 으로 디코딩합니다.
+    정상 응답(200, 본문 있음)만 캐시에 저장하며, 그 외에는 ApiResponseError 를 발생시킵니다.
+    refresh=True 면 캐시를 읽지 않고 새로 받아 캐시를 갱신합니다.
+    """
+    cache = get_response_cache() if use_cache else None
+    if cache is not None and not refresh:
+        with span("cache"):
+            body = cache.get(url, params)
+        if body is not None:
+            get_metrics().inc_cache_hit(url)
+            return decode_json(body)
+
+    response = get(url, params=params, **kwargs)
+    if response.status_code != 200:
+        raise ApiResponseError(f"HTTP {response.status_code}", response=response)
+    if not response.content:
+        raise ApiResponseError("Empty response received", response=response)
+
+    data = decode_json(response.content)
+    if cache is not None:
+        cache.set(url, params, response.content)
+    return data
@@ -0,0 +1,243 @@
+"""API 호출 지표 모듈
+
+http_client 를 거치는 모든 호출을 엔드포인트 계열(regions, complex_list, complexes, schools, prices, articles)별로
+요청 수(상태 코드별), 응답 바이트, 지연 시간 히스토그램, 속도 제한 대기 시간, 캐시 적중, 재시도 수로 집계합니다.
+Prometheus 텍스트 형식으로 파일(node_exporter textfile collector 용)에 쓰거나 HTTP(/metrics)로 내보냅니다.
+"""
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config_loader import load_config
+from endpoints import endpoint_family
+
+DEFAULT_BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PREFIX = "naver_api"
+
+
+class Histogram:
+    """누적 버킷 히스토그램 (Prometheus histogram 과 같은 의미)"""
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Iterable[float]):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)  # 마지막 칸은 +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """(le, 누적 개수) 목록"""
+        total, result = 0, []
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            result.append(("+Inf" if bound == float("inf") else f"{bound:g}", total))
+        return result
+
+
+def _labels(**labels) -> str:
+    parts = [f'{name}="{str(value)}"' for name, value in labels.items()]
+    return "{" + ",".join(parts) + "}"
+
+
+class MetricsRegistry:
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        """
+        Args:
+            buckets: 지연 시간 히스토그램 경계(초)
+        """
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._requests: Dict[Tuple[str, str], int] = {}   # (계열, 상태) → 수
+        self._bytes: Dict[str, int] = {}
+        self._latency: Dict[str, Histogram] = {}
+        self._wait: Dict[str, float] = {}
+        self._cache_hits: Dict[str, int] = {}
+        self._retries: Dict[Tuple[str, str], int] = {}    # (계열, 사유) → 수
+        self.started_at = time.time()
+
+    def observe_request(self, url: str, status: Optional[int], seconds: float,
+                        size: int = 0, waited: float = 0.0) -> None:
+        """
+        실제로 보낸 요청 하나를 기록합니다.
+        Args:
+            status: HTTP 상태 코드 (연결 오류·타임아웃이면 None)
+            seconds: 요청 시작부터 응답 본문 수신까지 걸린 시간
+            size: 응답 본문 바이트
+            waited: 속도 제한으로 기다린 시간
+        """
+        family = endpoint_family(url)
+        key = (family, str(status) if status is not None else "error")
+        with self._lock:
+            self._requests[key] = self._requests.get(key, 0) + 1
+            self._bytes[family] = self._bytes.get(family, 0) + size
+            self._wait[family] = self._wait.get(family, 0.0) + waited
+            histogram = self._latency.get(family)
+            if histogram is None:
+                histogram = self._latency[family] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    def inc_cache_hit(self, url: str) -> None:
+        family = endpoint_family(url)
+        with self._lock:
+            self._cache_hits[family] = self._cache_hits.get(family, 0) + 1
+
+    def inc_retry(self, url: str, reason: str) -> None:
+        """
+        재시도 하나를 기록합니다.
+        Args:
+            reason: 재시도 사유 (상태 코드 문자열, "empty", "connection" 등)
+        """
+        key = (endpoint_family(url), reason)
+        with self._lock:
+            self._retries[key] = self._retries.get(key, 0) + 1
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """계열별 요약 (요청 수, 오류 수, 평균 지연, 바이트, 대기 시간, 캐시 적중, 재시도)"""
+        with self._lock:
+            summary: Dict[str, Dict] = {}
+            for (family, status), count in self._requests.items():
+                entry = summary.setdefault(family, {"requests": 0, "errors": 0})
+                entry["requests"] += count
+                if status == "error" or not status.startswith("2"):
+                    entry["errors"] += count
+            for family, histogram in self._latency.items():
+                entry = summary.setdefault(family, {"requests": 0, "errors": 0})
+                entry["avg_latency"] = round(histogram.sum / histogram.count, 4) if histogram.count else 0.0
+                entry["bytes"] = self._bytes.get(family, 0)
+                entry["wait_seconds"] = round(self._wait.get(family, 0.0), 3)
+            for family, count in self._cache_hits.items():
+                summary.setdefault(family, {"requests": 0, "errors": 0})["cache_hits"] = count
+            for (family, _), count in self._retries.items():
+                entry = summary.setdefault(family, {"requests": 0, "errors": 0})
+                entry["retries"] = entry.get("retries", 0) + count
+            return summary
+
+    def render(self) -> str:
+        """Prometheus 텍스트 형식"""
+        lines: List[str] = []
+        with self._lock:
+            lines += [f"# HELP {PREFIX}_requests_total API requests sent, by endpoint family and status code.",
+                      f"# TYPE {PREFIX}_requests_total counter"]
+            for (family, status), count in sorted(self._requests.items()):
+                lines.append(f"{PREFIX}_requests_total{_labels(family=family, status=status)} {count}")
+
+            lines += [f"# HELP {PREFIX}_request_duration_seconds API request latency.",
+                      f"# TYPE {PREFIX}_request_duration_seconds histogram"]
+            for family, histogram in sorted(self._latency.items()):
+                for le, count in histogram.cumulative():
+                    lines.append(f"{PREFIX}_request_duration_seconds_bucket{_labels(family=family, le=le)} {count}")
+                lines.append(f"{PREFIX}_request_duration_seconds_sum{_labels(family=family)} {histogram.sum:.6f}")
+                lines.append(f"{PREFIX}_request_duration_seconds_count{_labels(family=family)} {histogram.count}")
+
+            lines += [f"# HELP {PREFIX}_response_bytes_total Response body bytes received.",
+                      f"# TYPE {PREFIX}_response_bytes_total counter"]
+            for family, size in sorted(self._bytes.items()):
+                lines.append(f"{PREFIX}_response_bytes_total{_labels(family=family)} {size}")
+
+            lines += [f"# HELP {PREFIX}_rate_limit_wait_seconds_total Time spent waiting for the shared rate limiter.",
+                      f"# TYPE {PREFIX}_rate_limit_wait_seconds_total counter"]
+            for family, waited in sorted(self._wait.items()):
+                lines.append(f"{PREFIX}_rate_limit_wait_seconds_total{_labels(family=family)} {waited:.6f}")
+
+            lines += [f"# HELP {PREFIX}_cache_hits_total Responses served from the response cache.",
+                      f"# TYPE {PREFIX}_cache_hits_total counter"]
+            for family, count in sorted(self._cache_hits.items()):
+                lines.append(f"{PREFIX}_cache_hits_total{_labels(family=family)} {count}")
+
+            lines += [f"# HELP {PREFIX}_retries_total Request retries, by reason.",
+                      f"# TYPE {PREFIX}_retries_total counter"]
+            for (family, reason), count in sorted(self._retries.items()):
+                lines.append(f"{PREFIX}_retries_total{_labels(family=family, reason=reason)} {count}")
+
+            lines += [f"# HELP {PREFIX}_metrics_start_time_seconds When these counters started.",
+                      f"# TYPE {PREFIX}_metrics_start_time_seconds gauge",
+                      f"{PREFIX}_metrics_start_time_seconds {self.started_at:.3f}"]
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: str) -> None:
+        """textfile collector 가 반쯤 쓴 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체합니다."""
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = target.with_suffix(target.suffix + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.render())
+        tmp_path.replace(target)
+
+    def serve(self, port: int, host: str = "0.0.0.0") -> ThreadingHTTPServer:
+        """백그라운드 스레드에서 /metrics HTTP 엔드포인트를 엽니다."""
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+                body = registry.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+        return server
+
+
+_shared_metrics: Optional[MetricsRegistry] = None
+_shared_config: Dict = {}
+_shared_lock = threading.Lock()
+
+
+def get_metrics() -> MetricsRegistry:
+    """
+    config/crawler.yaml 의 metrics 설정으로 만든 공유 MetricsRegistry.
+    metrics.port 가 있으면 처음 호출할 때 /metrics HTTP 엔드포인트도 엽니다.
+    """
+    global _shared_metrics, _shared_config
+    with _shared_lock:
+        if _shared_metrics is None:
+            _shared_config = (load_config('crawler') or {}).get('metrics', {}) or {}
+            _shared_metrics = MetricsRegistry(_shared_config.get('buckets') or DEFAULT_BUCKETS)
+            port = _shared_config.get('port')
+            if port:
+                try:
+                    _shared_metrics.serve(int(port), _shared_config.get('host', '0.0.0.0'))
+                except OSError as e:
+                    print(f"[ERROR] 지표 HTTP 엔드포인트를 열 수 없습니다 (port {port}): {str(e)}")
+        return _shared_metrics
+
+
+def write_metrics_textfile() -> Optional[str]:
+    """metrics.textfile 이 설정돼 있으면 현재 지표를 그 파일에 씁니다 (수집 종료 시 호출)."""
+    registry = get_metrics()
+    path = _shared_config.get('textfile')
+    if not path:
+        return None
+    target = Path(path)
+    if not target.is_absolute():
+        target = Path(__file__).parent / target
+    registry.write_textfile(str(target))
+    return str(target)
+
+
+def print_metrics_summary() -> None:
+    """계열별 요청 수, 오류, 평균 지연, 재시도를 한 줄씩 출력합니다."""
+    for family, entry in sorted(get_metrics().snapshot().items()):
+        print(f"[{family}] 요청 {entry['requests']}건 (오류 {entry['errors']}건), "
+              f"평균 {entry.get('avg_latency', 0.0) * 1000:.0f}ms, {entry.get('bytes', 0) / 1024:.0f}KB, "
+              f"대기 {entry.get('wait_seconds', 0.0):.1f}초, 캐시 적중 {entry.get('cache_hits', 0)}건, "
+              f"재시도 {entry.get('retries', 0)}건")
@@ -0,0 +1,282 @@
+"""new.land.naver.com API 녹화/재생 모듈
+
+녹화: config/crawler.yaml 의 mock.record 가 true 면 http_client.get() 이 받은 정상 응답(200, 본문 있음)을
+      엔드포인트 + 쿼리 키로 fixture SQLite 파일에 저장합니다 (헤더·토큰은 저장하지 않음).
+재생: MockApiServer 가 저장된 응답을 그대로 돌려주는 로컬 HTTP 서버를 띄웁니다.
+      지연 시간, 오류율, 초당 허용 요청 수(넘으면 429 + Retry-After)를 설정해
+      수집 처리량과 재시도/백오프 동작을 실제 사이트 없이 반복 측정할 수 있습니다.
+
+수집기와 대시보드를 재생 서버로 돌리려면 api.base_url 을 재생 서버 주소(예: http://127.0.0.1:8765/api)로 바꿉니다.
+응답 캐시 키는 호스트를 구분하지 않으므로 측정할 때는 cache.enabled 를 끄거나 refresh 로 수집하세요.
+"""
+import json
+import random
+import sqlite3
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+from config_loader import load_config
+from endpoints import endpoint_family
+from response_cache import ResponseCache
+
+
+class FixtureStore:
+    def __init__(self, path: str):
+        """
+        Args:
+            path: fixture SQLite 파일 경로
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS fixtures (
+                key TEXT PRIMARY KEY,
+                path TEXT NOT NULL,
+                family TEXT NOT NULL,
+                body BLOB NOT NULL,
+                recorded_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_fixtures_path ON fixtures(path)")
+        self._conn.commit()
+
+    def record(self, url: str, params: Optional[Dict], body: bytes) -> None:
+        """응답 본문을 엔드포인트 + 쿼리 키로 저장합니다 (같은 키는 최신 응답으로 교체)."""
+        key = ResponseCache.make_key(url, params)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO fixtures (key, path, family, body, recorded_at) VALUES (?, ?, ?, ?, ?)",
+                (key, urlsplit(url).path, endpoint_family(url), sqlite3.Binary(body), time.time())
+            )
+            self._conn.commit()
+
+    def lookup(self, request_path: str, fallback: bool = False) -> Optional[bytes]:
+        """
+        요청 경로(쿼리 포함)에 해당하는 본문을 찾습니다.
+        Args:
+            fallback: 같은 쿼리가 없으면 경로가 같은 가장 최근 응답을 대신 반환
+        """
+        key = ResponseCache.make_key(request_path)
+        with self._lock:
+            row = self._conn.execute("SELECT body FROM fixtures WHERE key = ?", (key,)).fetchone()
+            if row is None and fallback:
+                row = self._conn.execute(
+                    "SELECT body FROM fixtures WHERE path = ? ORDER BY recorded_at DESC LIMIT 1",
+                    (urlsplit(request_path).path,)
+                ).fetchone()
+        return bytes(row[0]) if row is not None else None
+
+    def bodies(self, family: str, limit: Optional[int] = None) -> List[bytes]:
+        """계열(complexes, schools 등)의 녹화된 본문 (녹화 순서대로)"""
+        query = "SELECT body FROM fixtures WHERE family = ? ORDER BY recorded_at"
+        params: tuple = (family,)
+        if limit is not None:
+            query += " LIMIT ?"
+            params = (family, int(limit))
+        with self._lock:
+            return [bytes(row[0]) for row in self._conn.execute(query, params)]
+
+    def stats(self) -> Dict[str, int]:
+        """계열별 저장된 응답 수"""
+        with self._lock:
+            rows = self._conn.execute("SELECT family, COUNT(*) FROM fixtures GROUP BY family").fetchall()
+        return dict(rows)
+
+
+_recorder: Optional[FixtureStore] = None
+_recorder_loaded = False
+_recorder_lock = threading.Lock()
+
+
+def fixtures_path(config: Dict) -> Path:
+    """mock.fixtures_path (상대 경로면 저장소 루트 기준)"""
+    path = Path(config.get('fixtures_path', 'fixtures/api.sqlite'))
+    return path if path.is_absolute() else Path(__file__).parent / path
+
+
+def get_recorder() -> Optional[FixtureStore]:
+    """config/crawler.yaml 의 mock.record 가 true 면 공유 FixtureStore, 아니면 None"""
+    global _recorder, _recorder_loaded
+    with _recorder_lock:
+        if not _recorder_loaded:
+            config = (load_config('crawler') or {}).get('mock', {}) or {}
+            if config.get('record', False):
+                _recorder = FixtureStore(str(fixtures_path(config)))
+            _recorder_loaded = True
+        return _recorder
+
+
+class _TokenBucket:
+    """재생 서버가 초당 허용 요청 수를 넘는 요청에 429 를 돌려주기 위한 버킷"""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = max(burst, 1.0)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def try_take(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+class _ReplayHandler(BaseHTTPRequestHandler):
+    server: "_ReplayHTTPServer"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        mock = self.server.mock
+        if urlsplit(self.path).path == "/__stats":
+            self._send(200, json.dumps(mock.stats()).encode("utf-8"))
+            return
+        status, body, headers = mock.respond(self.path)
+        self._send(status, body, headers)
+
+    def _send(self, status: int, body: bytes, headers: Optional[Dict[str, str]] = None):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json;charset=UTF-8")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class _ReplayHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    mock: "MockApiServer"
+
+
+class MockApiServer:
+    def __init__(self, store: FixtureStore, host: str = "127.0.0.1", port: int = 8765,
+                 latency: float = 0.05, jitter: float = 0.0, error_rate: float = 0.0,
+                 throttle_rate: Optional[float] = None, throttle_burst: float = 10,
+                 retry_after: float = 1.0, fallback: bool = False, seed: Optional[int] = None):
+        """
+        Args:
+            store: 재생할 응답이 담긴 FixtureStore
+            port: 0 이면 빈 포트를 자동으로 사용
+            latency: 응답마다 기다리는 시간(초)
+            jitter: latency 에 더하는 0~jitter 초의 무작위 지연
+            error_rate: 500(빈 본문)을 돌려줄 확률 (0~1)
+            throttle_rate: 초당 허용 요청 수 (넘으면 429 + Retry-After, None 이면 제한 없음)
+            throttle_burst: 순간적으로 허용하는 요청 수
+            retry_after: 429 응답의 Retry-After(초)
+            fallback: 같은 쿼리의 녹화가 없으면 경로가 같은 응답으로 대신 응답
+            seed: 오류/지연 난수 시드 (같은 시드면 같은 순서로 오류가 남)
+        """
+        self.store = store
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.fallback = fallback
+        self._bucket = _TokenBucket(throttle_rate, throttle_burst) if throttle_rate else None
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._stats = {"requests": 0, "ok": 0, "not_found": 0, "errors": 0, "throttled": 0}
+        self._served: Dict[str, int] = {}  # 계열별 정상 응답 수
+        self._httpd = _ReplayHTTPServer((host, port), _ReplayHandler)
+        self._httpd.mock = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        """api.base_url 에 넣을 주소 (예: http://127.0.0.1:8765/api)"""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/api"
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def respond(self, request_path: str):
+        """요청 경로에 대한 (상태 코드, 본문, 추가 헤더)"""
+        self._count("requests")
+        if self._bucket is not None and not self._bucket.try_take():
+            self._count("throttled")
+            return 429, b"", {"Retry-After": f"{self.retry_after:g}"}
+
+        with self._lock:
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+            failed = self.error_rate > 0 and self._random.random() < self.error_rate
+        if delay > 0:
+            time.sleep(delay)
+        if failed:
+            self._count("errors")
+            return 500, b"", None
+
+        body = self.store.lookup(request_path, fallback=self.fallback)
+        if body is None:
+            self._count("not_found")
+            return 404, b'{"error": "no recorded response"}', None
+        with self._lock:
+            self._stats["ok"] += 1
+            family = endpoint_family(request_path)
+            self._served[family] = self._served.get(family, 0) + 1
+        return 200, body, None
+
+    def stats(self) -> Dict:
+        """요청 결과별 수와 계열별 정상 응답 수(served)"""
+        with self._lock:
+            return {**self._stats, "served": dict(self._served)}
+
+    def start(self) -> "MockApiServer":
+        """백그라운드 스레드에서 서버를 시작합니다."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._httpd.serve_forever, name="mock-api", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread = None
+        self._httpd.server_close()
+
+    def serve_forever(self) -> None:
+        self._httpd.serve_forever()
+
+
+def open_mock_server(**overrides) -> MockApiServer:
+    """config/crawler.yaml 의 mock 설정(키워드 인자로 덮어쓰기 가능)으로 재생 서버를 만듭니다."""
+    config = dict((load_config('crawler') or {}).get('mock', {}) or {})
+    config.update(overrides)
+    return MockApiServer(
+        FixtureStore(str(fixtures_path(config))),
+        host=config.get('host', '127.0.0.1'),
+        port=config.get('port', 8765),
+        latency=config.get('latency', 0.05),
+        jitter=config.get('jitter', 0.0),
+        error_rate=config.get('error_rate', 0.0),
+        throttle_rate=config.get('throttle_rate'),
+        throttle_burst=config.get('throttle_burst', 10),
+        retry_after=config.get('retry_after', 1.0),
+        fallback=config.get('fallback', False),
+        seed=config.get('seed'),
+    )
+
+
+if __name__ == "__main__":
+    server = open_mock_server()
+    print(f"재생 서버: {server.base_url} (녹화된 응답: {server.store.stats()})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
@@ -0,0 +1,243 @@
+"""단지 이름 색인 모듈
+
+지역 트리(region_tree)와 regions/complexes 응답으로 전국 단지 이름과 지역 경로(시/도 군/구 동)를 파일에 저장하고,
+정규화한 이름의 자모 n-gram 역색인으로 유사한 단지를 로컬에서 바로 찾습니다.
+네트워크는 색인을 만들거나 갱신할 때만 사용하며, 지역을 지정한 검색은 그 지역(시/도, 군/구)만 색인해 기존 색인에 합칩니다.
+"""
+import json
+import re
+import threading
+import time
+import unicodedata
+from collections import Counter
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set
+
+from tqdm import tqdm
+
+from config_loader import load_config
+
+ROOT_REGION_CODE = "0000000000"
+NGRAM_SIZE = 3
+
+# 이름 비교 시 무시하는 흔한 접미어
+_NAME_SUFFIXES = ("아파트", "apt")
+_STRIP_PATTERN = re.compile(r"[\s\-_.,()\[\]·]+")
+
+
+def normalize_name(name: str) -> str:
+    """소문자화, 공백/기호 제거, '아파트' 접미어 제거"""
+    text = _STRIP_PATTERN.sub("", unicodedata.normalize("NFKC", str(name or "")).lower())
+    for suffix in _NAME_SUFFIXES:
+        if text.endswith(suffix) and len(text) > len(suffix):
+            text = text[:-len(suffix)]
+    return text
+
+
+def to_jamo(text: str) -> str:
+    """한글 음절을 자모로 분해합니다 (오타·받침 차이에 강한 비교용)."""
+    return unicodedata.normalize("NFD", text)
+
+
+def _scope_chain(code: str) -> List[str]:
+    """지역 코드와 그 상위 군/구, 시/도 코드 (코드 자릿수 기준)"""
+    code = str(code)
+    return list(dict.fromkeys([code, code[:5] + "0" * 5, code[:2] + "0" * 8]))
+
+
+def ngram_keys(text: str, n: int = NGRAM_SIZE) -> Set[str]:
+    """정규화된 이름의 자모 n-gram 집합"""
+    jamo = to_jamo(text)
+    if len(jamo) <= n:
+        return {jamo} if jamo else set()
+    return {jamo[i:i + n] for i in range(len(jamo) - n + 1)}
+
+
+class NameIndex:
+    def __init__(self, path: str = "data/index/names.json"):
+        """
+        Args:
+            path: 색인 JSON 파일 경로
+        """
+        self.path = Path(path)
+        self.complexes: Dict[str, Dict] = {}   # 단지번호 → {name, cortarNo, region, households, approve_date}
+        self.built_at = 0.0                     # 전국 색인 시각
+        self.region_built_at: Dict[str, float] = {}  # 지역 코드 → 그 지역만 색인한 시각
+        self._postings: Dict[str, Set[str]] = {}
+        self._normalized: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        if self.path.exists():
+            self.load()
+
+    def __len__(self) -> int:
+        return len(self.complexes)
+
+    def is_stale(self, max_age_days: float, root_code: str = ROOT_REGION_CODE) -> bool:
+        """
+        root_code 지역의 색인이 없거나 오래됐는지 반환합니다.
+        전국 색인이 최신이면 모든 지역이 최신이고, 아니면 그 지역이나 상위 지역을 최근에 색인했는지 봅니다.
+        """
+        now, max_age = time.time(), max_age_days * 86400
+        if self.complexes and now - self.built_at <= max_age:
+            return False
+        if root_code == ROOT_REGION_CODE:
+            return True
+        return all(now - self.region_built_at.get(code, 0.0) > max_age for code in _scope_chain(root_code))
+
+    def add(self, apt_code: str, name: str, cortar_no: str, region: str,
+            households=None, approve_date=None) -> None:
+        """단지 하나를 색인에 추가(또는 갱신)합니다."""
+        apt_code = str(apt_code)
+        with self._lock:
+            self._unindex(apt_code)
+            self.complexes[apt_code] = {
+                "name": name, "cortarNo": cortar_no, "region": region,
+                "households": households, "approve_date": approve_date,
+            }
+            self._index(apt_code, name)
+
+    def _remove(self, apt_code: str) -> None:
+        with self._lock:
+            self._unindex(apt_code)
+            self.complexes.pop(apt_code, None)
+
+    def _index(self, apt_code: str, name: str) -> None:
+        normalized = normalize_name(name)
+        self._normalized[apt_code] = normalized
+        for key in ngram_keys(normalized):
+            self._postings.setdefault(key, set()).add(apt_code)
+
+    def _unindex(self, apt_code: str) -> None:
+        normalized = self._normalized.pop(apt_code, None)
+        if normalized is None:
+            return
+        for key in ngram_keys(normalized):
+            codes = self._postings.get(key)
+            if codes is not None:
+                codes.discard(apt_code)
+
+    def search(self, query: str, region: Optional[str] = None, limit: int = 10,
+               min_score: float = 0.3) -> List[Dict]:
+        """
+        이름이 비슷한 단지를 점수 순으로 반환합니다.
+        Args:
+            query: 단지 이름 (일부, 오타 허용)
+            region: 지역 경로에 포함되어야 하는 문자열들 (공백 구분, 예: "대전 중구")
+            limit: 최대 결과 수
+            min_score: 최소 유사도 (0~1)
+        """
+        normalized = normalize_name(query)
+        if not normalized:
+            return []
+        region_terms = [normalize_name(term) for term in (region or "").split() if term.strip()]
+
+        # 지역 조건은 후보를 자르기 전에 적용한다 (전국 상위 n-gram 후보에 지역 안 단지가 밀려나지 않도록)
+        region_matches: Dict[str, bool] = {}  # 지역 경로 → 일치 여부 (같은 동의 단지는 한 번만 검사)
+
+        def in_region(code: str) -> bool:
+            if not region_terms:
+                return True
+            path = self.complexes[code]["region"]
+            if path not in region_matches:
+                region_matches[path] = self._region_matches(path, region_terms)
+            return region_matches[path]
+
+        # 1차: 자모 n-gram 을 가장 많이 공유하는 후보 (부분 문자열이면 항상 포함)
+        overlap = Counter()
+        for key in ngram_keys(normalized):
+            overlap.update(self._postings.get(key, ()))
+        if region_terms:
+            overlap = Counter({code: count for code, count in overlap.items() if in_region(code)})
+        candidates = {code for code, _ in overlap.most_common(max(limit * 20, 200))}
+        candidates.update(code for code, name in self._normalized.items() if normalized in name and in_region(code))
+
+        query_jamo = to_jamo(normalized)
+        results = []
+        for code in candidates:
+            entry = self.complexes[code]
+            name = self._normalized[code]
+            score = SequenceMatcher(None, query_jamo, to_jamo(name)).ratio()
+            if normalized == name:
+                score = 1.0
+            elif normalized in name or name in normalized:
+                score = max(score, 0.9 * min(len(normalized), len(name)) / max(len(normalized), len(name)) + 0.1)
+            if score >= min_score:
+                results.append({"code": code, **entry, "similarity": round(score, 4)})
+        results.sort(key=lambda item: (-item["similarity"], item["name"] or ""))
+        return results[:limit]
+
+    @staticmethod
+    def _region_matches(region_path: str, terms: List[str]) -> bool:
+        parts = [normalize_name(part) for part in (region_path or "").split()]
+        # '대전시' 와 '대전광역시', '중구' 처럼 축약된 입력도 앞부분이 같으면 일치로 본다
+        return all(
+            any(part.startswith(term) or term.startswith(part) or term in part for part in parts)
+            for term in (term.rstrip("시도") or term for term in terms)
+        )
+
+    def build(self, fetch: Callable[[str], Dict], regions, root_code: str = ROOT_REGION_CODE) -> None:
+        """
+        root_code 아래의 모든 동을 탐색해 단지를 색인합니다.
+        root 가 전국이면 전체를 다시 만들고, 시/도·군/구면 그 지역의 단지만 기존 색인에 합칩니다
+        (목록을 받은 동에서 사라진 단지는 색인에서 뺌).
+        Args:
+            fetch: 엔드포인트 → JSON 응답 (예: NaverLandCrawler._make_request)
+            regions: 동 목록과 지역 경로를 제공하는 RegionTree
+            root_code: 시작 지역 코드 (전국, 시/도, 군/구 코드)
+        """
+        root_code = str(root_code)
+        if root_code == ROOT_REGION_CODE:
+            with self._lock:
+                self.complexes, self._postings, self._normalized = {}, {}, {}
+                self.region_built_at = {}
+
+        for dong in tqdm(regions.descendants(root_code), desc="단지 색인"):
+            region = " ".join(regions.path_names(dong.code))
+            data = fetch(f"regions/complexes?cortarNo={dong.code}&realEstateType=APT&order=") or {}
+            if "complexList" not in data:
+                continue
+            listed = set()
+            for apt in data.get("complexList") or []:
+                if "complexNo" not in apt:
+                    continue
+                listed.add(str(apt["complexNo"]))
+                self.add(apt["complexNo"], apt.get("complexName", ""), apt.get("cortarNo", dong.code), region,
+                         apt.get("totalHouseholdCount"), apt.get("useApproveYmd"))
+            if root_code != ROOT_REGION_CODE:
+                for apt_code in [code for code, entry in self.complexes.items()
+                                 if entry.get("cortarNo") == dong.code and code not in listed]:
+                    self._remove(apt_code)
+        if root_code == ROOT_REGION_CODE:
+            self.built_at = time.time()
+        else:
+            self.region_built_at[root_code] = time.time()
+        self.save()
+
+    def save(self) -> None:
+        """색인을 임시 파일에 쓴 뒤 교체합니다."""
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"built_at": self.built_at, "region_built_at": self.region_built_at,
+                           "complexes": self.complexes}, f, ensure_ascii=False)
+            tmp_path.replace(self.path)
+
+    def load(self) -> None:
+        """색인 파일을 읽고 n-gram 역색인을 메모리에 다시 만듭니다."""
+        with open(self.path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        with self._lock:
+            self.built_at = data.get("built_at", 0.0)
+            self.region_built_at = data.get("region_built_at", {})
+            self.complexes = data.get("complexes", {})
+            self._postings, self._normalized = {}, {}
+            for apt_code, entry in self.complexes.items():
+                self._index(apt_code, entry.get("name", ""))
+
+
+def open_name_index() -> NameIndex:
+    """config/crawler.yaml 의 name_index 설정으로 색인을 엽니다."""
+    config = (load_config('crawler') or {}).get('name_index', {})
+    return NameIndex(config.get('path', 'data/index/names.json'))
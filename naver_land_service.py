@@ -3,15 +3,26 @@ import requests
 import streamlit as st
 import logging
 import json
-from typing import Dict, Any, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Iterable, List, Optional
 from datetime import datetime
 from pathlib import Path
 from config_loader import load_config
+import http_client
+from field_extractor import get_extractor
+from endpoints import complex_url
+from complex_model import ComplexModel, UnitType
+from tracing import span
+import numpy as np
 import plotly.express as px
 import pandas as pd
 
 class NaverLandService:
     def __init__(self, headers: Dict, cookies: Dict, variables: Dict):
+        """
+        Args:
+            variables: config/variables.yaml 의 extractors (추출은 field_extractor.get_extractor 가 담당)
+        """
         self.organized_data = {}
         self.complex_info = None
         self.unit_types = []
@@ -21,113 +32,110 @@ class NaverLandService:
         self.cookies = cookies
         self.variables = variables
 
-    def _fetch_data(self, complex_id: str) -> Dict:
-        self.debug_logs = []
-        self.raw_response = None
-        response = None
-        
+    def fetch_complex(self, complex_id: str, cache_only: bool = False,
+                      keep_raw: bool = True) -> Optional[ComplexModel]:
+        """
+        단지 상세를 가져와 ComplexModel 로 반환합니다.
+        인스턴스 상태를 바꾸지 않으므로 한 서비스 인스턴스를 여러 세션이 함께 써도 됩니다.
+        Args:
+            cache_only: True 면 API 를 호출하지 않고 응답 캐시(prefetch 가 예열)만 읽음
+            keep_raw: False 면 원본 응답을 버리고 파싱된 필드만 보관
+        Returns:
+            ComplexModel (실패하거나 캐시에 없으면 None)
+        """
+        parsed_data = self._fetch_parsed(complex_id, cache_only=cache_only)
+        if not parsed_data:
+            return None
+        with span("model"):
+            return ComplexModel(complex_id, parsed_data['complex_info'], parsed_data['unit_types'],
+                                raw=parsed_data['raw_response'], keep_raw=keep_raw)
+
+    def _fetch_parsed(self, complex_id: str, cache_only: bool = False) -> Dict:
+        """
+        단지 상세를 가져와 추출 규칙으로 파싱합니다.
+        Returns:
+            {'complex_info', 'unit_types', 'raw_response', 'debug_logs'} (실패하거나 캐시에 없으면 빈 dict)
+        """
         try:
-            print(f"[DEBUG] API 호출: {complex_id}")
+            url = complex_url(complex_id)
             
-            url = f"https://new.land.naver.com/api/complexes/{complex_id}"
-            
-            # API 호출 시도
+            # API 호출 시도 (응답 캐시, 풀링된 세션, 공유 속도 제한 적용)
             try:
-                response = requests.get(url, headers=self.headers, cookies=self.cookies)
-                print(f"[DEBUG] 응답 상태: {response.status_code}")
-                
-                if response.status_code != 200:
-                    print(f"[ERROR] API 응답 오류: {response.status_code}")
-                    return self.organized_data
-                    
-                raw_data = response.json()
-                self.raw_response = raw_data
+                if cache_only:
+                    raw_data = http_client.get_cached_json(url)
+                    if raw_data is None:
+                        print(f"[DEBUG] 캐시에 없음: {complex_id}")
+                        return {}
+                else:
+                    print(f"[DEBUG] API 호출: {complex_id}")
+                    raw_data = http_client.get_json(url, headers=self.headers, cookies=self.cookies)
                 
                 # variables.yaml에 정의된 변수 구조에 따라 데이터 파싱
                 parsed_data = self._parse_complex_info(raw_data)
-                self.complex_info = parsed_data['complex_info']
-                self.unit_types = parsed_data['unit_types']
-                
-                return raw_data
+                parsed_data['raw_response'] = raw_data
+                return parsed_data
                 
+            except http_client.ApiResponseError as api_error:
+                print(f"[ERROR] API 응답 오류: {str(api_error)}")
+                return {}
+
             except requests.exceptions.RequestException as req_error:
                 print(f"[ERROR] 요청 오류: {str(req_error)}")
-                return self.organized_data
+                return {}
                 
         except Exception as e:
             print(f"[ERROR] 처리 오류: {str(e)}")
+            return {}
+
+    def fetch_many(self, complex_ids: Iterable[str], cache_only: bool = False, keep_raw: bool = True,
+                   max_workers: int = 8) -> Dict[str, Optional[ComplexModel]]:
+        """
+        여러 단지를 동시에 가져옵니다. 응답 캐시에 있는 단지는 네트워크 없이 바로 반환되고,
+        나머지는 공유 속도 제한 안에서 병렬로 요청됩니다.
+        Returns:
+            단지번호 → fetch_complex() 결과 (실패한 단지는 None)
+        """
+        complex_ids = [str(complex_id) for complex_id in complex_ids]
+        if not complex_ids:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(complex_ids))) as pool:
+            results = pool.map(lambda complex_id: self.fetch_complex(complex_id, cache_only=cache_only,
+                                                                     keep_raw=keep_raw), complex_ids)
+            return dict(zip(complex_ids, results))
+
+    def _fetch_data(self, complex_id: str, cache_only: bool = False) -> Dict:
+        """
+        단지 상세를 가져와 파싱하고 인스턴스에 보관합니다.
+        Args:
+            cache_only: True 면 API 를 호출하지 않고 응답 캐시(prefetch 가 예열)만 읽음.
+                        캐시에 없으면 빈 dict 를 반환
+        """
+        parsed_data = self._fetch_parsed(complex_id, cache_only=cache_only)
+        self.debug_logs = parsed_data.get('debug_logs', [])
+        self.raw_response = parsed_data.get('raw_response')
+        if not parsed_data:
             return self.organized_data
+        self.complex_info = parsed_data['complex_info']
+        self.unit_types = parsed_data['unit_types']
+        return self.raw_response
 
     def _parse_complex_info(self, data: Dict) -> Dict:
         """아파트 단지 정보를 파싱합니다."""
-        complex_detail = data.get('complexDetail', {})
-        pyeong_details = data.get('complexPyeongDetailList', [])
-        
-        # Parse complex info
-        complex_info = {
-            'name': complex_detail.get('complexName'),
-            'address': {
-                'road': complex_detail.get('roadAddress'),
-                'jibun': complex_detail.get('address')
-            },
-            'stats': {
-                'total_units': complex_detail.get('totalHouseholdCount'),
-                'total_buildings': complex_detail.get('totalDongCount')
-            },
-            'current_articles': {
-                'sales': complex_detail.get('dealCount', 0),
-                'lease': complex_detail.get('leaseCount', 0),
-                'rent': complex_detail.get('rentCount', 0)
-            }
-        }
-        
-        # Parse unit types with maintenance costs
-        unit_types = []
-        for pyeong in pyeong_details:
-            # 관리비 리스트 파싱
-            maintenance_cost_list = pyeong.get('maintenanceCostList', [])
-            
-            # 평균 관리비 정보
-            avg_maintenance = pyeong.get('averageMaintenanceCost', {})
-            
-            # 매물 통계 정보
-            article_stats = pyeong.get('articleStatistics', {})
-            
-            unit_info = {
-                'size': {
-                    'supply_area': pyeong.get('supplyArea'),
-                    'exclusive_area': pyeong.get('exclusiveArea'),
-                    'exclusive_rate': pyeong.get('exclusiveRate')
-                },
-                'layout': {
-                    'rooms': pyeong.get('roomCnt'),
-                    'bathrooms': pyeong.get('bathroomCnt'),
-                    'structure': pyeong.get('entranceType')
-                },
-                'maintenance_cost_list': maintenance_cost_list,
-                'maintenance_fee': {
-                    'average': avg_maintenance.get('averageTotalPrice', '0'),
-                    'summer': avg_maintenance.get('summerTotalPrice', '0'),
-                    'winter': avg_maintenance.get('winterTotalPrice', '0')
-                },
-                'price': {
-                    'sales': article_stats.get('dealPriceString', '정보없음'),
-                    'lease': article_stats.get('leasePriceString', '정보없음'),
-                    'rent': article_stats.get('rentPriceString', '정보없음'),
-                    'sales_count': article_stats.get('dealCount', 0),
-                    'lease_count': article_stats.get('leaseCount', 0),
-                    'rent_count': article_stats.get('rentCount', 0)
-                }
-            }
-            unit_types.append(unit_info)
-            
+        # config/variables.yaml 의 extractors 규칙으로 단지/평형 정보를 한 번에 추출
+        with span("extract"):
+            complex_info = get_extractor('complex_summary').extract(data)
+            unit_types = get_extractor('unit_type').extract_each(data)
+
+        debug_logs = []
+        for unit_info in unit_types:
             # 디버그 로그 추가
-            self.debug_logs.append(f"[DEBUG] 파싱된 평형: {unit_info['size']['supply_area']}㎡")
-            self.debug_logs.append(f"[DEBUG] 관리비 데이터 개수: {len(maintenance_cost_list)}")
+            debug_logs.append(f"[DEBUG] 파싱된 평형: {unit_info['size']['supply_area']}㎡")
+            debug_logs.append(f"[DEBUG] 관리비 데이터 개수: {len(unit_info['maintenance_cost_list'])}")
         
         return {
             'complex_info': complex_info,
-            'unit_types': unit_types
+            'unit_types': unit_types,
+            'debug_logs': debug_logs
         }
 
     def _organize_complex_data(self, raw_data: Dict) -> Dict:
@@ -188,39 +196,60 @@ class NaverLandService:
     def _extract_complex_info(self, detail: Dict) -> Dict:
         """단지 기본 정보를 추출합니다."""
         try:
-            return {
-                'name': detail.get('complexName', '정보없음'),
-                'address': {
-                    'road': detail.get('roadAddress', ''),
-                    'jibun': detail.get('address', ''),
-                    'detail': detail.get('detailAddress', '')
-                },
-                'size': {
-                    'total_dong': detail.get('totalDongCount', 0),
-                    'total_households': detail.get('totalHouseholdCount', 0),
-                    'max_floor': detail.get('highFloor', 0),
-                    'min_floor': detail.get('lowFloor', 0)
-                },
-                'construction': {
-                    'company': detail.get('constructionCompanyName', '정보없음'),
-                    'approve_date': detail.get('useApproveYmd', '')
-                },
-                'facility': {
-                    'parking_count': detail.get('parkingPossibleCount', 0),
-                    'parking_per_household': detail.get('parkingCountByHousehold', 0),
-                    'heating_method': detail.get('heatMethodTypeCode', ''),
-                    'heating_fuel': detail.get('heatFuelTypeCode', '')
-                }
-            }
+            return get_extractor('complex_detail').extract(detail)
         except Exception as e:
             logging.error(f"단지 정보 추출 실패: {str(e)}")
             return {}
         
-    def display_complex_info(self):
-        """단지 정보를 탭으로 표시합니다."""
-        if not self.complex_info:
+    @staticmethod
+    def build_maintenance_frame(unit_types: Iterable[UnitType]) -> pd.DataFrame:
+        """
+        평형별 관리비 내역을 한 long-format DataFrame(평형, 날짜, 관리비)으로 만듭니다.
+        평형마다 보관된 연월/금액 배열을 이어 붙이고 날짜는 컬럼 단위로 한 번에 변환합니다.
+        """
+        columns = ['평형', 'date', 'cost']
+        units = [unit for unit in unit_types if len(unit.maintenance)]
+        if not units:
+            return pd.DataFrame(columns=columns)
+
+        months = np.concatenate([np.frombuffer(unit.maintenance.months, dtype=np.intc) for unit in units])
+        costs = np.concatenate([np.frombuffer(unit.maintenance.costs, dtype=np.int64) for unit in units])
+        labels = np.repeat([unit.label for unit in units], [len(unit.maintenance) for unit in units])
+        dates = pd.to_datetime(pd.DataFrame({'year': months // 100, 'month': months % 100, 'day': 1}),
+                               errors='coerce')
+        frame = pd.DataFrame({'평형': labels, 'date': dates, 'cost': costs})
+        return frame.dropna(subset=['date']).sort_values(['평형', 'date'], ignore_index=True)
+
+    @staticmethod
+    def build_maintenance_figure(frame: pd.DataFrame):
+        """모든 평형의 월별 관리비를 한 그래프(평형별 선)로 그립니다 (데이터가 없으면 None)."""
+        if frame.empty:
+            return None
+        return px.line(frame, x='date', y='cost', color='평형',
+                       title='평형별 월별 관리비',
+                       labels={'date': '날짜', 'cost': '관리비(원)', '평형': '공급면적'})
+
+    @staticmethod
+    def build_maintenance_stats(unit_types: Iterable[UnitType]) -> pd.DataFrame:
+        """평형별 평균/여름철/겨울철 관리비 표"""
+        return pd.DataFrame(
+            [(unit.label, unit.fee_average, unit.fee_summer, unit.fee_winter) for unit in unit_types],
+            columns=['공급면적', '평균 관리비', '여름철 평균', '겨울철 평균']
+        )
+
+    def display_complex_info(self, complex_data: Optional[ComplexModel] = None, figure=None):
+        """
+        단지 정보를 탭으로 표시합니다.
+        Args:
+            complex_data: fetch_complex() 결과 (없으면 _fetch_data 로 보관한 값을 사용)
+            figure: build_maintenance_figure() 결과 (호출자가 캐시해 둔 그래프를 재사용할 때)
+        """
+        if complex_data is None and self.complex_info:
+            complex_data = ComplexModel('', self.complex_info, self.unit_types, raw=self.raw_response)
+        if complex_data is None:
             st.error("단지 정보를 가져오는데 실패했습니다.")
             return
+        unit_types = complex_data.unit_types
         
         # Create tabs
         tab1, tab2, tab3, tab4 = st.tabs([
@@ -239,94 +268,126 @@ class NaverLandService:
                 # 현재 매물 현황
                 st.metric(
                     "매매 매물", 
-                    f"{self.complex_info['current_articles']['sales']}건",
+                    f"{complex_data.sales_count}건",
                     delta=None
                 )
             with col2:
                 st.metric(
                     "전세 매물",
-                    f"{self.complex_info['current_articles']['lease']}건",
+                    f"{complex_data.lease_count}건",
                     delta=None
                 )
             with col3:
                 st.metric(
                     "월세 매물",
-                    f"{self.complex_info['current_articles']['rent']}건",
+                    f"{complex_data.rent_count}건",
                     delta=None
                 )
         
         with tab2:
-            for unit in self.unit_types:
-                st.subheader(f"📊 {unit['size']['supply_area']}㎡ 관리비 추이")
-                
-                # 관리비 데이터 준비
-                maintenance_data = []
-                for cost in unit.get('maintenance_cost_list', []):
-                    date = datetime.strptime(cost['basisYearMonth'], '%Y%m')
-                    maintenance_data.append({
-                        'date': date,
-                        'cost': int(cost['totalPrice'])
-                    })
+            st.subheader("📊 관리비 추이")
+            if figure is None:
+                figure = self.build_maintenance_figure(self.build_maintenance_frame(unit_types))
+            if figure is not None:
+                st.plotly_chart(figure, use_container_width=True)
                 
-                if maintenance_data:
-                    df = pd.DataFrame(maintenance_data)
-                    
-                    # 관리비 추이 그래프
-                    fig = px.line(df, x='date', y='cost',
-                                title=f'{unit["size"]["supply_area"]}㎡ 월별 관리비',
-                                labels={'date': '날짜', 'cost': '관리비(원)'})
-                    fig.update_layout(showlegend=False)
-                    st.plotly_chart(fig, use_container_width=True)
-                    
-                    # 관리비 통계
-                    col1, col2, col3 = st.columns(3)
-                    with col1:
-                        st.metric(
-                            "평균 관리비",
-                            f"{int(unit['maintenance_fee']['average']):,}원"
-                        )
-                    with col2:
-                        st.metric(
-                            "여름철 평균",
-                            f"{int(unit['maintenance_fee']['summer']):,}원"
-                        )
-                    with col3:
-                        st.metric(
-                            "겨울철 평균",
-                            f"{int(unit['maintenance_fee']['winter']):,}원"
-                        )
+                # 관리비 통계
+                st.dataframe(
+                    self.build_maintenance_stats(unit_types),
+                    hide_index=True,
+                    use_container_width=True,
+                    column_config={fee: st.column_config.NumberColumn(format="%d원")
+                                   for fee in ('평균 관리비', '여름철 평균', '겨울철 평균')}
+                )
+            else:
+                st.info("관리비 데이터가 없습니다.")
         
         with tab3:
-            for unit in self.unit_types:
-                with st.expander(f"🏠 {unit['size']['supply_area']}㎡ 상세정보"):
+            for unit in unit_types:
+                with st.expander(f"🏠 {unit.label} 상세정보"):
                     col1, col2 = st.columns(2)
                     
                     with col1:
                         st.write("📐 면적 정보")
-                        st.write(f"- 공급면적: {unit['size']['supply_area']}㎡")
-                        st.write(f"- 전용면적: {unit['size']['exclusive_area']}㎡")
-                        st.write(f"- 전용률: {unit['size']['exclusive_rate']}%")
+                        st.write(f"- 공급면적: {unit.label}")
+                        st.write(f"- 전용면적: {unit.exclusive_area}㎡")
+                        st.write(f"- 전용률: {unit.exclusive_rate}%")
                     
                     with col2:
                         st.write("🚪 구조 정보")
-                        st.write(f"- 방 개수: {unit['layout']['rooms']}개")
-                        st.write(f"- 화장실: {unit['layout']['bathrooms']}개")
-                        st.write(f"- 현관구조: {unit['layout']['structure']}")
+                        st.write(f"- 방 개수: {unit.rooms}개")
+                        st.write(f"- 화장실: {unit.bathrooms}개")
+                        st.write(f"- 현관구조: {unit.structure}")
                     
                     st.write("💰 거래 정보")
                     price_cols = st.columns(3)
                     with price_cols[0]:
-                        st.metric("매매가", unit['price']['sales'])
+                        st.metric("매매가", unit.price_sales)
                     with price_cols[1]:
-                        st.metric("전세가", unit['price']['lease'])
+                        st.metric("전세가", unit.price_lease)
                     with price_cols[2]:
-                        st.metric("월세", unit['price']['rent'])
+                        st.metric("월세", unit.price_rent)
         
         with tab4:
             st.subheader("🔍 디버그 정보")
-            if st.checkbox("원본 데이터 보기"):
-                st.json(self.raw_response)
+            if complex_data.raw is None:
+                st.caption("원본 응답을 보관하지 않는 설정입니다 (dashboard.keep_raw).")
+            elif st.checkbox("원본 데이터 보기"):
+                st.json(complex_data.raw)
         
+    @staticmethod
+    def build_comparison_frame(complexes: Dict[str, Optional[ComplexModel]]) -> pd.DataFrame:
+        """
+        여러 단지의 평형 정보를 한 DataFrame(평형당 한 행)으로 만듭니다.
+        Args:
+            complexes: 단지번호 → fetch_complex() 결과 (fetch_many 반환값)
+        """
+        columns = ['단지번호', '단지명', '공급면적', '전용면적', '방 개수', '화장실',
+                   '평균 관리비', '여름철 평균', '겨울철 평균', '매매가', '전세가',
+                   '평형 매매 매물', '평형 전세 매물', '평형 월세 매물', '매매 매물', '전세 매물', '월세 매물']
+        rows = [
+            (data.complex_id, data.name, unit.supply_area, unit.exclusive_area, unit.rooms, unit.bathrooms,
+             unit.fee_average, unit.fee_summer, unit.fee_winter, unit.price_sales, unit.price_lease,
+             unit.sales_count, unit.lease_count, unit.rent_count,
+             data.sales_count, data.lease_count, data.rent_count)
+            for data in complexes.values() if data is not None
+            for unit in data.unit_types
+        ]
+        # 숫자 필드는 모델에서 이미 변환됐으므로 None 만 NaN 으로 맞춘다
+        frame = pd.DataFrame(rows, columns=columns)
+        numeric = columns[2:9] + columns[11:]
+        frame[numeric] = frame[numeric].astype('float64')
+        return frame
+
+    @staticmethod
+    def build_comparison_figure(frame: pd.DataFrame):
+        """단지별 공급면적 대비 평균 관리비 (점 크기: 단지 매매 매물 수)"""
+        fig = px.scatter(frame, x='공급면적', y='평균 관리비', color='단지명',
+                         size=frame['매매 매물'].fillna(0) + 1,
+                         hover_data=['전용면적', '방 개수', '매매가', '전세가', '전세 매물', '월세 매물'],
+                         labels={'공급면적': '공급면적(㎡)', '평균 관리비': '평균 관리비(원)'},
+                         title='단지 비교: 면적별 평균 관리비')
+        return fig
+
+    def display_comparison(self, frame: pd.DataFrame, figure=None, failed: Optional[List[str]] = None):
+        """여러 단지 비교 표와 그래프를 표시합니다."""
+        if failed:
+            st.warning(f"데이터를 가져오지 못한 단지: {', '.join(failed)}")
+        if frame.empty:
+            st.error("비교할 단지 정보가 없습니다.")
+            return
+
+        st.subheader("📊 단지 비교")
+        st.plotly_chart(figure if figure is not None else self.build_comparison_figure(frame),
+                        use_container_width=True)
+
+        st.subheader("🏢 단지별 매물 현황")
+        articles = frame.drop_duplicates('단지번호')[['단지명', '매매 매물', '전세 매물', '월세 매물']]
+        st.dataframe(articles, hide_index=True, use_container_width=True)
+
+        st.subheader("🏠 평형별 비교")
+        st.dataframe(frame, hide_index=True, use_container_width=True)
+
     def create_complex_tabs(self, parsed_data):
         """
         # Create tabbed view for complex information
@@ -0,0 +1,139 @@
+"""대시보드용 단지 응답 예열(prefetch) 모듈
+
+config/apartments.yaml 의 단지 상세(complexes/{id}) 응답을 주기적으로 새로 받아 응답 캐시(response_cache)에
+넣어 둡니다. 대시보드는 캐시만 읽으므로, 사이드바에서 단지를 바꿔도 API 왕복을 기다리지 않습니다.
+캐시는 SQLite 파일이라 별도 프로세스(python prefetch.py)로 돌려도 같은 캐시를 공유합니다.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import requests
+
+from config_loader import load_config
+from endpoints import complex_url
+import http_client
+
+
+class CacheWarmer:
+    def __init__(self, complex_ids: List[str], headers: Optional[Dict] = None, cookies: Optional[Dict] = None,
+                 interval: float = 1800, max_workers: int = 4):
+        """
+        Args:
+            complex_ids: 예열할 단지번호 목록
+            headers, cookies: API 요청 헤더/쿠키 (config/headers.yaml, config/cookies.yaml)
+            interval: 예열 주기(초). complexes 계열 캐시 TTL 보다 짧아야 캐시가 비지 않음
+            max_workers: 한 번에 동시에 받는 단지 수
+        """
+        self.complex_ids = [str(complex_id) for complex_id in complex_ids]
+        self.headers = headers or {}
+        self.cookies = cookies or {}
+        self.interval = interval
+        self.max_workers = max_workers
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._status = {"runs": 0, "last_run": None, "last_duration": None, "warmed": 0, "errors": {},
+                        "last_error": None}
+
+    def warm(self, complex_id: str) -> bool:
+        """단지 하나의 응답을 새로 받아 캐시를 갱신합니다."""
+        try:
+            http_client.get_json(complex_url(complex_id), refresh=True,
+                                 headers=self.headers, cookies=self.cookies)
+        except Exception as e:
+            # 요청 오류뿐 아니라 캐시 쓰기 오류(database is locked 등)도 단지 하나의 실패로 처리해 배치를 계속한다
+            kind = "요청" if isinstance(e, requests.exceptions.RequestException) else type(e).__name__
+            print(f"[ERROR] 단지 예열 실패 ({complex_id}, {kind}): {str(e)}")
+            with self._lock:
+                self._status["errors"][complex_id] = str(e)
+            return False
+        with self._lock:
+            self._status["errors"].pop(complex_id, None)
+        return True
+
+    def warm_all(self) -> int:
+        """모든 단지를 한 번 예열하고 성공한 단지 수를 반환합니다."""
+        started = time.time()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            warmed = sum(pool.map(self.warm, self.complex_ids))
+        with self._lock:
+            self._status.update({"runs": self._status["runs"] + 1, "last_run": started,
+                                 "last_duration": round(time.time() - started, 3), "warmed": warmed,
+                                 "last_error": None})
+        return warmed
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.warm_all()
+            except Exception as e:
+                # 예열 스레드가 조용히 죽지 않도록 기록하고 다음 주기에 다시 시도한다
+                print(f"[ERROR] 캐시 예열 주기 실패: {str(e)}")
+                with self._lock:
+                    self._status["last_error"] = str(e)
+            self._stop.wait(self.interval)
+
+    def start(self) -> "CacheWarmer":
+        """백그라운드 스레드에서 예열을 시작합니다 (이미 실행 중이면 그대로)."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="cache-warmer", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def status(self) -> Dict:
+        with self._lock:
+            return {**self._status, "errors": dict(self._status["errors"]),
+                    "complexes": len(self.complex_ids), "running": self.is_running()}
+
+
+_shared_warmer: Optional[CacheWarmer] = None
+_shared_lock = threading.Lock()
+
+
+def start_cache_warmer(headers: Optional[Dict] = None, cookies: Optional[Dict] = None) -> Optional[CacheWarmer]:
+    """
+    config/crawler.yaml 의 prefetch 설정으로 프로세스 공유 예열 스레드를 시작합니다.
+    Streamlit 은 매 상호작용마다 스크립트를 다시 실행하지만, 스레드는 프로세스당 하나만 뜹니다.
+    Returns:
+        CacheWarmer (prefetch.enabled 가 false 면 None)
+    """
+    global _shared_warmer
+    with _shared_lock:
+        if _shared_warmer is None:
+            config = (load_config('crawler') or {}).get('prefetch', {})
+            if not config.get('enabled', False):
+                return None
+            apartments = (load_config('apartments') or {}).get('apartment_list', {}) or {}
+            _shared_warmer = CacheWarmer(
+                list(apartments.values()),
+                headers=headers if headers is not None else load_config('headers'),
+                cookies=cookies if cookies is not None else (load_config('cookies') or {}).get('cookies', {}),
+                interval=config.get('interval', 1800),
+                max_workers=config.get('max_workers', 4),
+            )
+        return _shared_warmer.start()
+
+
+if __name__ == "__main__":
+    # 대시보드와 별개 프로세스로 예열만 실행 (같은 SQLite 캐시를 공유)
+    warmer = start_cache_warmer()
+    if warmer is None:
+        print("config/crawler.yaml 의 prefetch.enabled 가 false 입니다.")
+    else:
+        try:
+            while True:
+                time.sleep(60)
+                print(warmer.status())
+        except KeyboardInterrupt:
+            warmer.stop(timeout=5)
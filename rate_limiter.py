@@ -0,0 +1,111 @@
+"""API 호출 속도 제한 모듈
+
+토큰 버킷으로 초당 요청 수와 버스트 크기를 제한하고, 429/5xx/빈 응답을 받으면
+요청 속도를 절반으로 줄였다가 정상 응답이 이어지면 조금씩 회복합니다.
+모든 호출 경로(NaverLandCrawler, NaverLandService, test.py)가 같은 인스턴스를 공유합니다.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from config_loader import load_config
+
+
+class RateLimiter:
+    def __init__(self, rate: float = 5.0, burst: int = 10, min_rate: float = 0.5,
+                 backoff_factor: float = 0.5, recovery_step: float = 0.05, cooldown: float = 2.0):
+        """
+        Args:
+            rate: 초당 최대 요청 수
+            burst: 한 번에 몰아서 보낼 수 있는 최대 요청 수
+            min_rate: 백오프 시 내려갈 수 있는 최저 초당 요청 수
+            backoff_factor: 차단 신호를 받을 때 현재 속도에 곱하는 값
+            recovery_step: 정상 응답마다 회복하는 초당 요청 수
+            cooldown: 차단 신호 직후 모든 요청을 멈추는 시간(초)
+        """
+        self.max_rate = float(rate)
+        self.rate = float(rate)
+        self.burst = max(int(burst), 1)
+        self.min_rate = float(min_rate)
+        self.backoff_factor = backoff_factor
+        self.recovery_step = recovery_step
+        self.cooldown = cooldown
+
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def is_throttled(status_code: Optional[int], empty: bool = False) -> bool:
+        """업스트림이 요청을 줄이라고 보내는 신호인지 확인합니다 (None 은 연결 오류)."""
+        return status_code is None or status_code == 429 or status_code >= 500 or empty
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self) -> float:
+        """토큰 하나를 얻을 때까지 대기하고, 대기한 시간(초)을 반환합니다."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                wait = self._blocked_until - now
+                if wait <= 0:
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return waited
+                    wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+            waited += wait
+
+    def record(self, status_code: Optional[int], empty: bool = False,
+               retry_after: Optional[float] = None) -> None:
+        """응답 결과를 반영해 속도를 줄이거나 회복합니다."""
+        with self._lock:
+            if self.is_throttled(status_code, empty):
+                self.rate = max(self.min_rate, self.rate * self.backoff_factor)
+                self._tokens = 0.0
+                pause = retry_after if retry_after is not None else self.cooldown
+                self._blocked_until = max(self._blocked_until, time.monotonic() + pause)
+            elif self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + self.recovery_step)
+
+    def record_response(self, response) -> None:
+        """requests.Response 의 상태 코드, 본문, Retry-After 헤더를 반영합니다."""
+        retry_after = response.headers.get("Retry-After")
+        try:
+            retry_after = float(retry_after) if retry_after is not None else None
+        except ValueError:
+            retry_after = None
+        self.record(response.status_code, empty=not response.content, retry_after=retry_after)
+
+
+_shared_limiter: Optional[RateLimiter] = None
+_shared_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """config/crawler.yaml 의 rate_limit 설정으로 만든 공유 RateLimiter 를 반환합니다."""
+    global _shared_limiter
+    with _shared_lock:
+        if _shared_limiter is None:
+            config = (load_config('crawler') or {}).get('rate_limit', {})
+            _shared_limiter = RateLimiter(**config)
+        return _shared_limiter
+
+
+@contextmanager
+def override_rate_limiter(limiter: RateLimiter) -> Iterator[RateLimiter]:
+    """블록 안에서만 공유 RateLimiter 를 limiter 로 바꿉니다 (벤치마크·재생 측정용)."""
+    global _shared_limiter
+    with _shared_lock:
+        previous, _shared_limiter = _shared_limiter, limiter
+    try:
+        yield limiter
+    finally:
+        with _shared_lock:
+            _shared_limiter = previous
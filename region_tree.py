@@ -0,0 +1,201 @@
+"""법정동(cortarNo) 지역 트리 모듈
+
+시/도 → 군/구 → 읍/면/동 노드를 부모 링크와 함께 메모리에 두고 파일에 저장합니다.
+regions/list 는 노드의 하위 목록을 처음 펼칠 때만 호출하므로, 이후의 코드 ↔ 이름 변환과
+하위 지역 열거는 네트워크 없이 바로 처리됩니다.
+"""
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from config_loader import load_config
+from name_index import normalize_name
+
+ROOT_REGION_CODE = "0000000000"
+DONG_TYPE = "sec"
+
+
+def parent_code(code: str) -> Optional[str]:
+    """코드 자릿수로 상위 지역 코드를 계산합니다 (시/도 2자리, 군/구 5자리)."""
+    code = str(code)
+    if code == ROOT_REGION_CODE:
+        return None
+    if code[2:] == "0" * 8:
+        return ROOT_REGION_CODE
+    if code[5:] == "0" * 5:
+        return code[:2] + "0" * 8
+    return code[:5] + "0" * 5
+
+
+class RegionNode:
+    __slots__ = ("code", "name", "type", "parent", "children")
+
+    def __init__(self, code: str, name: str, cortar_type: Optional[str] = None,
+                 parent: Optional[str] = None, children: Optional[List[str]] = None):
+        self.code = code
+        self.name = name
+        self.type = cortar_type
+        self.parent = parent
+        self.children = children  # None 이면 아직 regions/list 를 불러오지 않은 노드
+
+    def to_dict(self) -> Dict:
+        return {"name": self.name, "type": self.type, "parent": self.parent, "children": self.children}
+
+
+class RegionTree:
+    def __init__(self, path: str = "data/index/regions.json", fetch: Optional[Callable[[str], Dict]] = None,
+                 max_age_days: float = 30, autosave_every: int = 50):
+        """
+        Args:
+            path: 트리 JSON 파일 경로
+            fetch: 엔드포인트 → JSON 응답 (예: NaverLandCrawler._make_request)
+            max_age_days: 저장된 트리를 다시 쓰는 최대 기간 (지나면 새로 불러옴)
+            autosave_every: 이 횟수만큼 노드를 펼칠 때마다 파일에 저장
+        """
+        self.path = Path(path)
+        self.fetch = fetch
+        self.autosave_every = autosave_every
+        self._lock = threading.Lock()
+        self._dirty = 0
+        self.nodes: Dict[str, RegionNode] = {}
+        self._by_name: Dict[str, List[str]] = {}
+        self.built_at = time.time()
+        if self.path.exists():
+            self._load(max_age_days)
+        if ROOT_REGION_CODE not in self.nodes:
+            self.nodes[ROOT_REGION_CODE] = RegionNode(ROOT_REGION_CODE, "전국")
+
+    def _load(self, max_age_days: float) -> None:
+        with open(self.path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if time.time() - data.get("built_at", 0) > max_age_days * 86400:
+            return
+        self.built_at = data["built_at"]
+        for code, node in data.get("nodes", {}).items():
+            self._add_node(RegionNode(code, node["name"], node.get("type"), node.get("parent"), node.get("children")))
+
+    def _add_node(self, node: RegionNode) -> None:
+        self.nodes[node.code] = node
+        codes = self._by_name.setdefault(normalize_name(node.name), [])
+        if node.code not in codes:
+            codes.append(node.code)
+
+    def children(self, code: str = ROOT_REGION_CODE) -> List[RegionNode]:
+        """하위 지역 노드 (처음 한 번만 regions/list 호출)"""
+        code = str(code)
+        node = self.nodes.get(code)
+        if node is None or node.children is None:
+            self._expand(code)
+            node = self.nodes.get(code)
+        return [self.nodes[child] for child in (node.children if node else None) or []]
+
+    def is_expanded(self, code: str) -> bool:
+        """하위 목록을 받아 둔 지역인지 (regions/list 요청이 실패했으면 False)"""
+        node = self.nodes.get(str(code))
+        return node is not None and node.children is not None
+
+    def _expand(self, code: str) -> None:
+        if self.fetch is None:
+            return
+        if code not in self.nodes:
+            # 상위 노드를 먼저 펼쳐 이름과 부모 링크를 채운다
+            parent = parent_code(code)
+            if parent is not None:
+                self._expand_parent(parent)
+        data = self.fetch(f"regions/list?cortarNo={code}") or {}
+        region_list = data.get("regionList")
+        if region_list is None:
+            return
+        with self._lock:
+            node = self.nodes.setdefault(code, RegionNode(code, "Unknown", parent=parent_code(code)))
+            for child in region_list:
+                existing = self.nodes.get(child["cortarNo"])
+                self._add_node(RegionNode(child["cortarNo"], child.get("cortarName", "Unknown"), child.get("cortarType"),
+                                          code, existing.children if existing else None))
+            node.children = [child["cortarNo"] for child in region_list]
+            self._dirty += 1
+            should_save = self._dirty >= self.autosave_every
+        if should_save:
+            self.save()
+
+    def _expand_parent(self, parent: str) -> None:
+        parent_node = self.nodes.get(parent)
+        if parent_node is None or parent_node.children is None:
+            self.children(parent)
+
+    def node(self, code: str) -> Optional[RegionNode]:
+        """코드의 노드 (모르는 코드면 상위 지역을 펼쳐서 찾음)"""
+        code = str(code)
+        if code not in self.nodes:
+            parent = parent_code(code)
+            if parent is not None:
+                self._expand_parent(parent)
+        return self.nodes.get(code)
+
+    def name(self, code: str) -> str:
+        node = self.node(code)
+        return node.name if node else "Unknown"
+
+    def path_names(self, code: str) -> List[str]:
+        """시/도부터 해당 지역까지의 이름 목록 (예: ["서울시", "강남구", "개포동"])"""
+        names = []
+        node = self.node(code)
+        while node is not None and node.code != ROOT_REGION_CODE:
+            names.append(node.name)
+            node = self.nodes.get(node.parent) if node.parent else None
+        return names[::-1]
+
+    def descendants(self, code: str = ROOT_REGION_CODE, cortar_type: str = DONG_TYPE) -> List[RegionNode]:
+        """하위 트리에서 cortar_type(기본: 읍/면/동) 노드를 모두 반환합니다."""
+        found, pending = [], [str(code)]
+        while pending:
+            for child in self.children(pending.pop()):
+                if child.type == cortar_type:
+                    found.append(child)
+                else:
+                    pending.append(child.code)
+        return found
+
+    def find(self, name: str, parent: Optional[str] = None) -> List[RegionNode]:
+        """
+        이름으로 지역을 찾습니다. 정확히 같은 이름이 없으면 앞부분이 같은 이름(예: '대전시' → '대전광역시')을 찾습니다.
+        Args:
+            parent: 주어지면 이 지역의 바로 아래 노드만 검색 (처음이면 하위 목록을 불러옴)
+        """
+        key = normalize_name(name)
+        if parent is not None:
+            candidates = self.children(parent)
+        else:
+            candidates = [self.nodes[code] for code in self._by_name.get(key, [])]
+            if candidates:
+                return candidates
+            candidates = list(self.nodes.values())
+        exact = [node for node in candidates if normalize_name(node.name) == key]
+        if exact:
+            return exact
+        stem = key.rstrip("시도") or key
+        return [node for node in candidates
+                if node.code != ROOT_REGION_CODE and (normalize_name(node.name).startswith(stem) or stem in normalize_name(node.name))]
+
+    def save(self) -> None:
+        """트리를 임시 파일에 쓴 뒤 교체합니다 (바뀐 노드가 없으면 건너뜀)."""
+        with self._lock:
+            if not self._dirty and self.path.exists():
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"built_at": self.built_at,
+                           "nodes": {code: node.to_dict() for code, node in self.nodes.items()}},
+                          f, ensure_ascii=False)
+            tmp_path.replace(self.path)
+            self._dirty = 0
+
+
+def open_region_tree(fetch: Optional[Callable[[str], Dict]] = None) -> RegionTree:
+    """config/crawler.yaml 의 region_tree 설정으로 지역 트리를 엽니다."""
+    config = (load_config('crawler') or {}).get('region_tree', {})
+    return RegionTree(config.get('path', 'data/index/regions.json'), fetch=fetch,
+                      max_age_days=config.get('max_age_days', 30))
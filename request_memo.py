@@ -0,0 +1,78 @@
+"""요청 합치기(single-flight) + LRU 메모 모듈
+
+같은 키의 요청이 동시에 들어오면 첫 요청만 실제로 실행하고 나머지는 그 결과를 기다려 받습니다.
+완료된 결과는 개수 제한이 있는 LRU 메모에 보관해, 한 수집 안에서 같은 응답을 다시 요청하지 않습니다.
+"""
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class SingleFlightMemo:
+    def __init__(self, max_entries: int = 2048):
+        """
+        Args:
+            max_entries: 메모에 보관할 최대 결과 수 (넘으면 오래 안 쓴 결과부터 삭제)
+        """
+        self.max_entries = max_entries
+        self._values: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._inflight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "coalesced": 0, "loads": 0, "evictions": 0}
+
+    def get(self, key: Hashable, loader: Callable[[], Any], refresh: bool = False) -> Any:
+        """
+        key 의 결과를 반환합니다. 메모에 없으면 loader 를 한 번만 실행합니다.
+        Args:
+            refresh: True 면 메모를 건너뛰고 새로 불러옴 (이미 진행 중인 요청이 있으면 그 결과를 공유)
+        """
+        with self._lock:
+            if not refresh and key in self._values:
+                self._values.move_to_end(key)
+                self._stats["hits"] += 1
+                return self._values[key]
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[key] = future
+                self._stats["loads"] += 1
+            else:
+                self._stats["coalesced"] += 1
+
+        if not owner:
+            return future.result()
+
+        try:
+            value = loader()
+        except BaseException as e:
+            with self._lock:
+                self._inflight.pop(key, None)
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            self._inflight.pop(key, None)
+            # 빈 응답(요청 실패)은 다음에 다시 시도하도록 메모하지 않는다
+            if value:
+                self._values[key] = value
+                self._values.move_to_end(key)
+                while len(self._values) > self.max_entries:
+                    self._values.popitem(last=False)
+                    self._stats["evictions"] += 1
+        future.set_result(value)
+        return value
+
+    def peek(self, key: Hashable) -> Optional[Any]:
+        """요청 없이 메모된 결과만 확인합니다."""
+        with self._lock:
+            return self._values.get(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self._stats, "entries": len(self._values)}
@@ -0,0 +1,215 @@
+"""API 응답 디스크 캐시 모듈
+
+엔드포인트와 쿼리 파라미터를 키로 응답 본문을 SQLite 파일에 저장합니다.
+엔드포인트 계열(regions, complex_list, complexes, schools, prices, articles)별로 TTL 을 두고,
+전체 크기가 상한을 넘으면 가장 오래 사용하지 않은 응답부터 지웁니다.
+적중 시의 마지막 사용 시각은 메모리에 모았다가 저장·정리·종료 시에 한 번에 기록하므로, 읽기가 쓰기(커밋)가 되지 않습니다.
+"""
+import atexit
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from config_loader import load_config
+from endpoints import endpoint_family
+
+DEFAULT_TTL = 3600
+# 메모리에 모아 두는 last_access 갱신의 최대 수 (넘으면 한 번에 기록)
+MAX_PENDING_TOUCHES = 1000
+
+
+class ResponseCache:
+    def __init__(self, path: str, ttls: Optional[Dict[str, float]] = None,
+                 max_size_mb: float = 512, default_ttl: float = DEFAULT_TTL):
+        """
+        Args:
+            path: SQLite 캐시 파일 경로
+            ttls: 엔드포인트 계열별 TTL(초)
+            max_size_mb: 저장할 응답 본문의 최대 총 크기(MB)
+            default_ttl: ttls 에 없는 계열의 TTL(초)
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttls = ttls or {}
+        self.max_bytes = int(max_size_mb * 1024 * 1024)
+        self.default_ttl = default_ttl
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                family TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses(last_access)")
+        self._conn.commit()
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        self._stats = {"hits": 0, "misses": 0, "expired": 0, "stores": 0, "evictions": 0}
+        self._touched: Dict[str, float] = {}  # 키 → 아직 기록하지 않은 마지막 사용 시각
+
+    @staticmethod
+    def make_key(url: str, params: Optional[Dict] = None) -> str:
+        """URL 경로와 (URL 쿼리 + params) 를 정렬해 만든 캐시 키"""
+        parts = urlsplit(url)
+        query = parse_qsl(parts.query, keep_blank_values=True)
+        query.extend((str(k), str(v)) for k, v in (params or {}).items())
+        return f"{parts.path}?{urlencode(sorted(query))}"
+
+    def ttl_for(self, url: str) -> float:
+        return float(self.ttls.get(endpoint_family(url), self.default_ttl))
+
+    def get(self, url: str, params: Optional[Dict] = None) -> Optional[bytes]:
+        """만료되지 않은 응답 본문을 반환합니다 (없으면 None)."""
+        key = self.make_key(url, params)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self._stats["misses"] += 1
+                return None
+            body, expires_at = row
+            if expires_at <= now:
+                # 만료 행은 읽기에서 지우지 않음: 곧 다시 받은 응답이 set() 에서 덮어쓰고, 남은 것은 _evict 가 정리
+                self._stats["expired"] += 1
+                self._stats["misses"] += 1
+                return None
+            self._touched[key] = now
+            if len(self._touched) >= MAX_PENDING_TOUCHES:
+                self._flush_touches()
+                self._conn.commit()
+            self._stats["hits"] += 1
+            return bytes(body)
+
+    def _flush_touches(self) -> None:
+        """모아 둔 last_access 갱신을 한 번에 실행합니다 (커밋은 호출자가 함께 함, _lock 안에서 호출)."""
+        if not self._touched:
+            return
+        touched, self._touched = self._touched, {}
+        self._conn.executemany("UPDATE responses SET last_access = ? WHERE key = ?",
+                               [(last_access, key) for key, last_access in touched.items()])
+
+    def flush(self) -> None:
+        """모아 둔 last_access 갱신을 기록합니다."""
+        with self._lock:
+            self._flush_touches()
+            self._conn.commit()
+
+    def close(self) -> None:
+        """모아 둔 갱신을 기록하고 연결을 닫습니다."""
+        with self._lock:
+            self._flush_touches()
+            self._conn.commit()
+            self._conn.close()
+
+    def set(self, url: str, params: Optional[Dict], body: bytes) -> None:
+        """응답 본문을 저장하고 크기 상한을 넘으면 오래된 항목을 지웁니다."""
+        if len(body) > self.max_bytes:
+            return
+        key = self.make_key(url, params)
+        now = time.time()
+        with self._lock:
+            self._flush_touches()
+            row = self._conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, family, body, size, expires_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, endpoint_family(url), sqlite3.Binary(body), len(body), now + self.ttl_for(url), now)
+            )
+            self._total_bytes += len(body) - (row[0] if row else 0)
+            self._stats["stores"] += 1
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        """만료 항목과 LRU 항목을 지워 전체 크기를 상한의 90% 이하로 맞춥니다."""
+        self._flush_touches()
+        self._conn.execute("DELETE FROM responses WHERE expires_at <= ?", (time.time(),))
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        target = self.max_bytes * 0.9
+        rows = self._conn.execute("SELECT key, size FROM responses ORDER BY last_access").fetchall()
+        for key, size in rows:
+            if self._total_bytes <= target:
+                break
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._total_bytes -= size
+            self._stats["evictions"] += 1
+
+    def stats(self) -> Dict:
+        """적중/미스 통계와 현재 저장 현황"""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            stats = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats.update({
+            "hit_rate": stats["hits"] / lookups if lookups else 0.0,
+            "entries": entries,
+            "size_mb": round(self._total_bytes / (1024 * 1024), 2),
+        })
+        return stats
+
+    def clear(self, family: Optional[str] = None) -> None:
+        """전체 또는 특정 계열의 캐시를 비웁니다."""
+        with self._lock:
+            self._flush_touches()
+            if family:
+                self._conn.execute("DELETE FROM responses WHERE family = ?", (family,))
+            else:
+                self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+            self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+
+_shared_cache: Optional[ResponseCache] = None
+_shared_lock = threading.Lock()
+_override_active = False
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """config/crawler.yaml 의 cache 설정으로 만든 공유 캐시 (비활성화 시 None)"""
+    global _shared_cache
+    with _shared_lock:
+        if _override_active:
+            return _shared_cache
+        if _shared_cache is None:
+            config = (load_config('crawler') or {}).get('cache', {})
+            if not config.get('enabled', False):
+                return None
+            path = Path(config.get('path', 'cache/responses.sqlite'))
+            if not path.is_absolute():
+                path = Path(__file__).parent / path
+            _shared_cache = ResponseCache(
+                str(path),
+                ttls=config.get('ttl', {}),
+                max_size_mb=config.get('max_size_mb', 512),
+                default_ttl=config.get('default_ttl', DEFAULT_TTL),
+            )
+            # 적중만 있었던 실행(대시보드 등)도 종료 시 마지막 사용 시각을 남긴다
+            atexit.register(_shared_cache.flush)
+        return _shared_cache
+
+
+@contextmanager
+def override_response_cache(cache: Optional[ResponseCache]) -> Iterator[Optional[ResponseCache]]:
+    """블록 안에서만 공유 캐시를 cache 로 바꿉니다 (None 이면 캐시 없이 동작, 벤치마크·재생 측정용)."""
+    global _shared_cache, _override_active
+    with _shared_lock:
+        previous = (_shared_cache, _override_active)
+        _shared_cache, _override_active = cache, True
+    try:
+        yield cache
+    finally:
+        with _shared_lock:
+            _shared_cache, _override_active = previous
@@ -0,0 +1,144 @@
+"""수집 결과 저장 모듈
+
+CsvWriter 는 기존처럼 단지마다 CP949 CSV 파일을 하나씩 만들고,
+ParquetDatasetWriter 는 결과를 모아 시/도, 군/구 코드로 파티션된 Parquet 데이터셋에 추가합니다.
+Parquet 는 숫자 컬럼을 실제 숫자 타입으로 저장하므로, 분석 시 필요한 지역과 컬럼만 빠르게 읽을 수 있습니다.
+(예: pd.read_parquet("data/parquet/apartments", columns=[...], filters=[("sido", "=", "1100000000")]))
+"""
+import threading
+import uuid
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow 는 parquet 저장 시에만 필요
+    pa = None
+    pq = None
+
+from config_loader import load_config
+
+PARTITION_COLUMNS = ["sido", "gungu"]
+
+# 컬럼별 저장 타입 (목록에 없는 컬럼은 문자열로 저장)
+INT_COLUMNS = [
+    "거래 수", "전세 거래 수", "월세 거래 수", "단기 전세 거래 수", "주차대수", "세대수", "임대세대수",
+    "최고층", "최저층", "방수", "욕실", "해당면적_세대수", "초등학교_남학생수", "초등학교_여학생수",
+]
+FLOAT_COLUMNS = [
+    "용적률", "건폐율", "latitude", "longitude", "공급면적", "전용면적", "전용율",
+    "재산세", "재산세합계", "지방교육세", "재산세_도시지역분", "종합부동산세", "결정세액", "농어촌특별세",
+    "일반평균가", "일반평균가변화량", "하위평균가", "상위평균가", "전세 일반평균가", "전세 일반평균가변화량",
+    "전세 상위평균가", "전세 하위평균가", "매매가대비전세가", "보증금", "겨울관리비", "여름관리비",
+]
+STRING_COLUMNS = [
+    "complexNo", "cortarNo", "dong", "아파트명", "난방", "건설사", "면적", "법정동주소", "도로명주소", "현관구조",
+    "매매호가", "전세호가", "월세호가", "초등학교_학군정보", "초등학교_설립정보",
+]
+
+
+def region_partition(cortar_no: Optional[str]) -> Dict[str, str]:
+    """법정동 코드(10자리)에서 시/도, 군/구, 동 코드를 계산합니다."""
+    code = str(cortar_no or "")
+    if len(code) != 10 or not code.isdigit():
+        return {"sido": "unknown", "gungu": "unknown", "dong": code or "unknown"}
+    return {"sido": code[:2] + "0" * 8, "gungu": code[:5] + "0" * 5, "dong": code}
+
+
+def to_typed_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """알려진 컬럼을 숫자/문자열 타입으로 변환하고, 없는 컬럼은 빈 값으로 채워 스키마를 고정합니다."""
+    df = df.copy()
+    for column in INT_COLUMNS:
+        values = pd.to_numeric(df[column], errors="coerce") if column in df else pd.Series(pd.NA, index=df.index)
+        df[column] = values.round().astype("Int64")
+    for column in FLOAT_COLUMNS:
+        values = pd.to_numeric(df[column], errors="coerce") if column in df else pd.Series(pd.NA, index=df.index)
+        df[column] = values.astype("float64")
+    known = set(INT_COLUMNS) | set(FLOAT_COLUMNS)
+    for column in STRING_COLUMNS + [c for c in df.columns if c not in known and c not in STRING_COLUMNS]:
+        values = df[column] if column in df else pd.Series(pd.NA, index=df.index)
+        df[column] = values.astype("string").replace("", pd.NA)
+    return df
+
+
+class CsvWriter:
+    """단지마다 CP949 CSV 파일 하나 (기존 방식)"""
+
+    def __init__(self, root: str = "data/apartments"):
+        self.root = Path(root)
+
+    def write(self, df: pd.DataFrame, name_parts: List[str], region_code: Optional[str] = None) -> str:
+        self.root.mkdir(parents=True, exist_ok=True)
+        filename = "_".join(name_parts)
+        filename = "".join(c for c in filename if c.isalnum() or c in ['_', '-']).rstrip()
+        df.to_csv(self.root / f"{filename}.csv", encoding="CP949")
+        return filename
+
+    def flush(self) -> None:
+        pass
+
+
+class ParquetDatasetWriter:
+    """시/도, 군/구로 파티션된 Parquet 데이터셋에 결과를 모아서 추가"""
+
+    def __init__(self, root: str = "data/parquet/apartments", flush_rows: int = 50000):
+        """
+        Args:
+            root: 데이터셋 루트 디렉토리
+            flush_rows: 메모리에 모아 둘 최대 행 수 (넘으면 파일로 기록)
+        """
+        if pa is None:
+            raise ImportError("parquet 저장에는 pyarrow 가 필요합니다: pip install pyarrow")
+        self.root = Path(root)
+        self.flush_rows = flush_rows
+        self._frames: List[pd.DataFrame] = []
+        self._rows = 0
+        self._lock = threading.Lock()
+
+    def write(self, df: pd.DataFrame, name_parts: List[str], region_code: Optional[str] = None) -> str:
+        """
+        결과를 버퍼에 추가합니다. 파티션은 region_code 또는 각 행의 cortarNo 로 정합니다.
+        """
+        df = df.copy()
+        codes = [region_code] * len(df) if region_code else list(df.get("cortarNo", [None] * len(df)))
+        partitions = pd.DataFrame([region_partition(code) for code in codes], index=df.index)
+        for column in partitions.columns:
+            df[column] = partitions[column]
+
+        with self._lock:
+            self._frames.append(df)
+            self._rows += len(df)
+            should_flush = self._rows >= self.flush_rows
+        if should_flush:
+            self.flush()
+        return str(self.root)
+
+    def flush(self) -> None:
+        """버퍼를 파티션별 Parquet 파일로 기록합니다."""
+        with self._lock:
+            if not self._frames:
+                return
+            frames, self._frames, self._rows = self._frames, [], 0
+            df = to_typed_frame(pd.concat(frames, ignore_index=True))
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            pq.write_to_dataset(
+                table,
+                root_path=str(self.root),
+                partition_cols=PARTITION_COLUMNS,
+                basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet",
+            )
+
+
+def create_writer(storage_format: Optional[str] = None):
+    """config/crawler.yaml 의 storage 설정에 따라 저장기를 생성합니다."""
+    config = (load_config('crawler') or {}).get('storage', {})
+    storage_format = storage_format or config.get('format', 'csv')
+    if storage_format == "parquet":
+        return ParquetDatasetWriter(config.get('parquet_path', 'data/parquet/apartments'),
+                                    flush_rows=config.get('flush_rows', 50000))
+    if storage_format == "csv":
+        return CsvWriter(config.get('csv_path', 'data/apartments'))
+    raise ValueError(f"지원하지 않는 저장 형식: {storage_format}")
@@ -1,16 +1,68 @@
-import json
-import time
-import requests
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
-from typing import List, Dict, Optional
+from typing import Iterator, List, Dict, Optional, Tuple
 from tqdm import tqdm
 from difflib import SequenceMatcher
 import os
+import requests
+from article_collector import TRADE_TYPES, iter_articles, stream_articles
+from async_crawler import AsyncCrawlEngine
+from crawl_checkpoint import COMPLEX, DONE, FAILED, REGION, UNCHANGED, CrawlCheckpoint
+from crawl_snapshot import SnapshotStore
+from endpoints import api_base_url
+from name_index import NameIndex, open_name_index
+from region_tree import ROOT_REGION_CODE, RegionTree, open_region_tree
+from request_memo import SingleFlightMemo
+from field_extractor import get_extractor
+from config_loader import load_config
+import http_client
+from metrics import get_metrics, print_metrics_summary, write_metrics_textfile
+from rate_limiter import RateLimiter
+from response_cache import get_response_cache
+from storage import create_writer
+from tracing import finish_trace, span
+from warehouse import Warehouse, open_warehouse
+
+DEFAULT_CHECKPOINT_PATH = "data/checkpoints/collect_all.jsonl"
+DEFAULT_SNAPSHOT_PATH = "data/snapshots/complexes.json"
+
+
 class NaverLandCrawler:
-    def __init__(self, auth_token: str):
-        """Initialize crawler with auth token"""
-        self.base_url = "https://new.land.naver.com/api"
+    def __init__(self, auth_token: str, storage_format: Optional[str] = None,
+                 warehouse: Optional[Warehouse] = None):
+        """
+        Initialize crawler with auth token
+        Args:
+            storage_format: "csv"(단지별 CSV) 또는 "parquet"(시/도·군/구 파티션 데이터셋),
+                기본값은 config/crawler.yaml 의 storage.format
+            warehouse: 단지/평형/시세/학교를 함께 저장할 SQLite 저장소
+                (기본값: config/crawler.yaml 의 warehouse 설정)
+        """
+        self.base_url = api_base_url()
         self.auth_token = auth_token
+        self.writer = create_writer(storage_format)
+        self.warehouse = warehouse if warehouse is not None else open_warehouse()
+        self.name_index: Optional[NameIndex] = None
+        self.region_tree: RegionTree = open_region_tree(self._make_request)
+        # 단지 상세는 이름 조회/수집/검색에서 반복해서 쓰이므로 한 번만 요청하고 공유한다
+        memo_config = (load_config('crawler') or {}).get('detail_memo', {})
+        self.detail_memo = SingleFlightMemo(memo_config.get('max_entries', 2048))
+        self.price_config = (load_config('crawler') or {}).get('prices', {})
+        self.article_config = (load_config('crawler') or {}).get('articles', {})
+        self._price_pool: Optional[ThreadPoolExecutor] = None
+
+    def close(self) -> None:
+        """Shut down the price-table thread pool (with NaverLandCrawler(...) as crawler: 로도 사용 가능)"""
+        if self._price_pool is not None:
+            self._price_pool.shutdown(wait=True)
+            self._price_pool = None
+
+    def __enter__(self) -> "NaverLandCrawler":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
         
     def _get_headers(self, apt_code: str = '6372') -> Dict:
         """Get request headers"""
@@ -23,38 +75,37 @@ class NaverLandCrawler:
         }
         return headers
 
-    def _make_request(self, endpoint: str, params: Optional[Dict] = None, apt_code: Optional[str] = None) -> Dict:
-        """Make API request with retry logic"""
+    def _make_request(self, endpoint: str, params: Optional[Dict] = None, apt_code: Optional[str] = None,
+                      refresh: bool = False) -> Dict:
+        """Make API request with retry logic (response cache, pooled session, shared rate limiter)"""
         url = f"{self.base_url}/{endpoint}"
         max_retries = 3
-        delay = 1
 
         for attempt in range(max_retries):
             try:
                 headers = self._get_headers(apt_code) if apt_code else self._get_headers()
-                response = requests.get(
-                    url, 
-                    data=params or {"sameAddressGroup": "false"}, 
-                    headers=headers,
-                    timeout=10
-                )
-                response.encoding = "utf-8-sig"
-                
-                if not response.text:
-                    raise ValueError("Empty response received")
-                
-                return json.loads(response.text)
-            
+                return http_client.get_json(url, params=params, refresh=refresh, headers=headers, timeout=10)
+
+            except http_client.ApiResponseError as e:
+                print(f"Attempt {attempt + 1} failed: {str(e)}")
+                print(f"URL: {url}")
+                # 429/5xx/빈 응답이 아닌 오류(4xx)는 재시도해도 같은 결과이므로 바로 포기한다
+                retryable = RateLimiter.is_throttled(e.response.status_code, empty=not e.response.content)
+                if attempt == max_retries - 1 or not retryable:
+                    print(f"Error making request to {endpoint}: {str(e)}")
+                    return {}
+                get_metrics().inc_retry(url, str(e.response.status_code) if e.response.content else "empty")
+
             except Exception as e:
                 print(f"Attempt {attempt + 1} failed: {str(e)}")
                 print(f"URL: {url}")
                 if attempt == max_retries - 1:
                     print(f"Error making request to {endpoint}: {str(e)}")
                     return {}
-                time.sleep(delay)
-                delay *= 2
+                get_metrics().inc_retry(url, "connection" if isinstance(e, requests.exceptions.RequestException)
+                                        else "error")
 
-    def get_region_codes(self, parent_code: str = "0000000000") -> List[str]:
+    def get_region_codes(self, parent_code: str = ROOT_REGION_CODE) -> List[str]:
         """
         Get region codes (sido/gungu/dong)
         Args:
@@ -67,23 +118,17 @@ class NaverLandCrawler:
             List of region codes
         """
         try:
-            endpoint = f"regions/list?cortarNo={parent_code}"
-            data = self._make_request(endpoint)
-            
-            if not data or 'regionList' not in data:
+            children = self.region_tree.children(parent_code)
+            if not children:
                 print(f"Warning: No data found for parent_code: {parent_code}")
                 return []
             
-            regions_df = pd.DataFrame(data.get("regionList", []))
-            if regions_df.empty:
-                return []
-            
             # 디버깅을 위한 지역 정보 출력
-            if parent_code == "0000000000":  # 시/도 목록 조회시
-                for _, row in regions_df.iterrows():
-                    print(f"Found region: {row['cortarName']} ({row['cortarNo']})")
+            if parent_code == ROOT_REGION_CODE:  # 시/도 목록 조회시
+                for region in children:
+                    print(f"Found region: {region.name} ({region.code})")
                 
-            return list(regions_df["cortarNo"])
+            return [region.code for region in children]
             
         except Exception as e:
             print(f"Error getting region codes for parent_code {parent_code}: {str(e)}")
@@ -91,171 +136,225 @@ class NaverLandCrawler:
 
     def get_apt_list(self, dong_code: str) -> List[str]:
         """Get apartment codes for a dong"""
+        return [apt["complexNo"] for apt in self.get_apt_entries(dong_code) if "complexNo" in apt]
+
+    def get_apt_entries(self, dong_code: str, refresh: bool = False) -> List[Dict]:
+        """Get complex list entries (complexNo, complexName, dealCount, ...) for a dong"""
+        return self.fetch_apt_entries(dong_code, refresh) or []
+
+    def fetch_apt_entries(self, dong_code: str, refresh: bool = False) -> Optional[List[Dict]]:
+        """Same as get_apt_entries, but returns None when the list request failed (vs. [] for a dong with no complexes)"""
         try:
             endpoint = f"regions/complexes?cortarNo={dong_code}&realEstateType=APT&order="
-            response = self._make_request(endpoint)
+            response = self._make_request(endpoint, refresh=refresh)
             
             if not response:
                 print(f"Warning: No data received for dong_code: {dong_code}")
-                return []
+                return None
             
             if 'complexList' not in response:
                 print(f"Warning: No complexList in response for dong_code: {dong_code}")
-                return []
+                return None
             
-            apt_list = pd.DataFrame(response.get('complexList', []))
-            if apt_list.empty:
-                # print(f"Info: No apartments found in dong_code: {dong_code}")
-                return []
-            
-            return list(apt_list["complexNo"])
+            return response.get('complexList') or []
         
         except Exception as e:
             print(f"Error getting apartment list for dong_code: {dong_code}")
             print(f"Error details: {str(e)}")
             print(f"Response: {response if 'response' in locals() else 'No response'}")
-            return []
+            return None
 
-    def get_apt_info(self, apt_code: str) -> Dict:
-        """Get apartment details"""
+    def get_apt_info(self, apt_code: str, refresh: bool = False) -> Dict:
+        """Get apartment details (동시 요청은 하나로 합치고, 받은 응답은 detail_memo 에 보관)"""
         endpoint = f"complexes/{apt_code}?sameAddressGroup=false"
-        return self._make_request(endpoint, apt_code=apt_code)
+        return self.detail_memo.get(
+            str(apt_code), lambda: self._make_request(endpoint, apt_code=apt_code, refresh=refresh), refresh=refresh
+        )
 
-    def get_school_info(self, apt_code: str) -> Dict:
+    def get_school_info(self, apt_code: str, refresh: bool = False) -> Dict:
         """Get school information"""
         endpoint = f"complexes/{apt_code}/schools"
-        return self._make_request(endpoint, apt_code=apt_code)
-
-    def get_price_info(self, apt_code: str, area_no: str) -> Dict:
-        """Get price information"""
-        return self._make_request(
-            f"complexes/{apt_code}/prices",
-            {
-                "complexNo": apt_code,
-                "tradeType": "A1",
-                "year": "5",
-                "priceChartChange": "true",
-                "areaNo": area_no,
-                "areaChange": "true",
-                "type": "table"
-            }
-        )
+        return self._make_request(endpoint, apt_code=apt_code, refresh=refresh)
+
+    def get_price_info(self, apt_code: str, area_no: str, refresh: bool = False) -> Dict:
+        """
+        Get price table for one area (pyeongNo)
+        addedRowCount=page_rows*max_pages 로 한 번에 요청해 평형당 한 번의 왕복으로 전체 표를 받습니다.
+        """
+        added_rows = self.price_config.get('page_rows', 12) * self.price_config.get('max_pages', 4)
+        params = self._price_params(apt_code, area_no, added_rows=added_rows)
+        return self._make_request(f"complexes/{apt_code}/prices", params, refresh=refresh)
+
+    def get_price_tables(self, apt_code: str, apt_info: Dict, refresh: bool = False) -> Dict[str, Dict]:
+        """Fetch the price tables of every pyeong concurrently, keyed by pyeongNo"""
+        area_nos = self._pyeong_numbers(apt_info)
+        if len(area_nos) <= 1:
+            return {area_no: self.get_price_info(apt_code, area_no, refresh) for area_no in area_nos}
+        if self._price_pool is None:
+            self._price_pool = ThreadPoolExecutor(max_workers=self.price_config.get('max_workers', 4))
+        tables = self._price_pool.map(lambda area_no: self.get_price_info(apt_code, area_no, refresh), area_nos)
+        return dict(zip(area_nos, tables))
+
+    @staticmethod
+    def _pyeong_numbers(apt_info: Dict) -> List[str]:
+        """평형 번호(pyeongNo) 목록 (complexPyeongDetailList 순서)"""
+        return [str(pyeong.get("pyeongNo")) for pyeong in (apt_info or {}).get("complexPyeongDetailList", []) or []
+                if pyeong.get("pyeongNo") is not None]
+
+    @staticmethod
+    def _price_params(apt_code: str, area_no: str, added_rows: int = 12) -> Dict:
+        """Query parameters for the price table endpoint"""
+        return {
+            "complexNo": apt_code,
+            "tradeType": "A1",
+            "year": "5",
+            "priceChartChange": "true",
+            "areaNo": area_no,
+            "areaChange": "true",
+            "addedRowCount": str(added_rows),
+            "showMorePriceTable": "true",
+            "type": "table"
+        }
+
+    def process_apt_data(self, apt_code: str, snapshots: Optional[SnapshotStore] = None,
+                         list_entry: Optional[Dict] = None) -> Optional[pd.DataFrame]:
+        """
+        Process apartment data into DataFrame
+        Args:
+            snapshots: 증분 수집용 스냅샷. 주어지면 상세 응답을 새로 받아 변경 신호를 비교하고,
+                바뀌지 않은 단지는 학교/가격 조회 없이 None 을 반환
+            list_entry: 단지 목록 항목 (스냅샷 갱신용)
+        """
+        outcome, df = self._process_apt(apt_code, snapshots, list_entry)
+        return df if outcome == DONE else None
 
-    def process_apt_data(self, apt_code: str) -> Optional[pd.DataFrame]:
-        """Process apartment data into DataFrame"""
+    def _process_apt(self, apt_code: str, snapshots: Optional[SnapshotStore] = None,
+                     list_entry: Optional[Dict] = None) -> Tuple[str, Optional[pd.DataFrame]]:
+        """
+        Fetch one complex and build its DataFrame
+        Returns:
+            (outcome, DataFrame): outcome 은 DONE, UNCHANGED(증분 모드에서 변경 없음), FAILED(요청/추출 실패).
+            DataFrame 은 DONE 일 때만 주어짐
+        """
         try:
-            apt_info = self.get_apt_info(apt_code)
-            school_info = self.get_school_info(apt_code)
-            
-            # Get area list
-            try:
-                area_list = apt_info["complexDetail"]["pyoengNames"].split(", ")
-                ex_flag=1
-            except KeyError:
-                ex_flag=0
-                print('Error')
-                temp_data=pd.DataFrame(columns=temp_data.columns)
-            if ex_flag==1:
-                temp_data=pd.DataFrame(index=range(len(area_list)))
-                # Process data for each area
-                rows = []
-                for i, area in enumerate(area_list):
-                    row = self._extract_apt_info(apt_info, school_info, i, area, apt_code)
-                    rows.append(row)
-                    
-            return pd.DataFrame(rows)
+            refresh = snapshots is not None
+            apt_info = self.get_apt_info(apt_code, refresh=refresh)
+            if not apt_info:
+                print(f"Warning: No detail received for apt {apt_code}")
+                return FAILED, None
+            if snapshots is not None:
+                if not snapshots.detail_changed(apt_code, apt_info):
+                    snapshots.update(apt_code, list_entry, apt_info)
+                    return UNCHANGED, None
+            school_info = self.get_school_info(apt_code, refresh=refresh)
+            price_infos = self.get_price_tables(apt_code, apt_info, refresh=refresh)
+            return self._finish_apt(apt_code, apt_info, school_info, price_infos, snapshots, list_entry)
         except Exception as e:
             print(f"Error processing apt {apt_code}: {str(e)}")
+            return FAILED, None
+
+    def _finish_apt(self, apt_code: str, apt_info: Dict, school_info: Dict, price_infos: Dict[str, Dict],
+                    snapshots: Optional[SnapshotStore] = None,
+                    list_entry: Optional[Dict] = None) -> Tuple[str, Optional[pd.DataFrame]]:
+        """
+        Build and store one complex from fetched responses (shared by the sync and async crawls)
+        _make_request 는 실패한 요청을 빈 dict 로 돌려주므로, 빈 학교/시세 응답이 있으면 FAILED 로 보고
+        체크포인트·스냅샷을 갱신하지 않아 다음 수집(재개)에서 다시 받게 한다.
+        """
+        missing = [name for name, data in [("schools", school_info)] + list(price_infos.items()) if not data]
+        if missing:
+            print(f"Warning: Empty responses for apt {apt_code}: {', '.join(missing)}")
+            return FAILED, None
+        df = self._build_apt_frame(apt_info, school_info, apt_code, price_infos)
+        if df is None:
+            return FAILED, None
+        self._store_responses(apt_code, apt_info, school_info, price_infos)
+        if snapshots is not None:
+            snapshots.update(apt_code, list_entry, apt_info)
+        return DONE, df
+
+    def _build_apt_frame(self, apt_info: Dict, school_info: Dict, apt_code: str,
+                         price_infos: Optional[Dict[str, Dict]] = None) -> Optional[pd.DataFrame]:
+        """
+        Build one row per area from already fetched responses
+        Args:
+            price_infos: pyeongNo → 시세표 응답 (없으면 get_price_tables 로 조회)
+        """
+        if price_infos is None:
+            price_infos = self.get_price_tables(apt_code, apt_info)
+        rows = self.build_apt_records(apt_info, school_info, apt_code, price_infos)
+        if rows is None:
             return None
+        with span("frame"):
+            return pd.DataFrame(rows)
 
-    def _extract_apt_info(self, apt_info: Dict, school_info: Dict, 
-                         area_idx: int, area: str, apt_code: str) -> Dict:
- 
-        """Extract apartment information for a specific area"""
-        data = {
-            "아파트명": self._safe_get(apt_info, ["complexDetail", "complexName"]),
-            "거래 수": self._safe_get(apt_info, ["complexDetail", "dealCount"]),
-            "전세 거래 수": self._safe_get(apt_info, ["complexDetail", "leaseCount"]),
-            "월세 거래 수": self._safe_get(apt_info, ["complexDetail", "rentCount"]),
-            "단기 전세 거래 수": self._safe_get(apt_info, ["complexDetail", "shortTermLeaseCount"]),
-            "용적률": self._safe_get(apt_info, ["complexDetail", "batlRatio"]),
-            "건폐율": self._safe_get(apt_info, ["complexDetail", "btlRatio"]),
-            "주차대수": self._safe_get(apt_info, ["complexDetail", "parkingPossibleCount"]),
-            "난방": self._safe_get(apt_info, ["complexDetail", "heatMethodTypeCode"]),
-            "건설사": self._safe_get(apt_info, ["complexDetail", "constructionCompanyName"]),
-            "면적": area,
-            "법정동주소": f"{self._safe_get(apt_info, ['complexDetail', 'address'])} {self._safe_get(apt_info, ['complexDetail', 'detailAddress'])}",
-            "도로명주소": f"{self._safe_get(apt_info, ['complexDetail', 'roadAddressPrefix'])} {self._safe_get(apt_info, ['complexDetail', 'roadAddress'])}",
-            "세대수": self._safe_get(apt_info, ["complexDetail", "totalHouseholdCount"]),
-            "임대세대수": self._safe_get(apt_info, ["complexDetail", "totalLeaseHouseholdCount"]),
-            "최고층": self._safe_get(apt_info, ["complexDetail", "highFloor"]),
-            "최저층": self._safe_get(apt_info, ["complexDetail", "lowFloor"]),
-            "latitude": self._safe_get(apt_info, ["complexDetail", "latitude"]),
-            "longitude": self._safe_get(apt_info, ["complexDetail", "longitude"]),
-        }
-        try:
-            
-            
-            data.update({
-                "공급면적": self._safe_get(apt_info, ["complexPyeongDetailList", area_idx, "supplyArea"]),
-                "전용면적": self._safe_get(apt_info, ["complexPyeongDetailList", area_idx, "exclusiveArea"]),
-                "전용율": self._safe_get(apt_info, ["complexPyeongDetailList", area_idx, "exclusiveRate"]),
-                "방수": self._safe_get(apt_info, ["complexPyeongDetailList", area_idx, "roomCnt"]),
-                "욕실": self._safe_get(apt_info, ["complexPyeongDetailList", area_idx, "bathroomCnt"]),
-                "해당면적_세대수": self._safe_get(apt_info, ["complexPyeongDetailList", area_idx, "householdCountByPyeong"]),
-                "현관구조": self._safe_get(apt_info, ["complexPyeongDetailList", area_idx, "entranceType"]),
-                "재산세": self._safe_get(apt_info, ["complexPyeongDetailList", area_idx, "landPriceMaxByPtp", "landPriceTax", "propertyTax"]),
-                "재산세합계": self._safe_get(apt_info, ["complexPyeongDetailList", area_idx, "landPriceMaxByPtp", "landPriceTax", "propertyTotalTax"]),
-                "지방교육세": self._safe_get(apt_info, ["complexPyeongDetailList", area_idx, "landPriceMaxByPtp", "landPriceTax", "localEduTax"]),
-                "재산세_도시지역분": self._safe_get(apt_info, ["complexPyeongDetailList", area_idx, "landPriceMaxByPtp", "landPriceTax", "cityAreaTax"]),
-                "종합부동산세": self._safe_get(apt_info, ["complexPyeongDetailList", area_idx, "landPriceMaxByPtp", "landPriceTax", "realEstateTotalTax"]),
-                "결정세액": self._safe_get(apt_info, ["complexPyeongDetailList", area_idx, "landPriceMaxByPtp", "landPriceTax", "decisionTax"]),
-                "농어촌특별세": self._safe_get(apt_info, ["complexPyeongDetailList", area_idx, "landPriceMaxByPtp", "landPriceTax", "ruralSpecialTax"]),
-            })
-        except KeyError:
-            pass
+    @staticmethod
+    def apt_columns() -> List[str]:
+        """Column order of the rows built by build_apt_records (config/variables.yaml 의 apt_row_* 추출 규칙)"""
+        return (["complexNo"] + get_extractor("apt_row_complex").columns + get_extractor("apt_row_school").columns
+                + ["면적"] + get_extractor("apt_row_pyeong").columns + get_extractor("apt_row_price").columns)
 
+    @staticmethod
+    def build_apt_records(apt_info: Dict, school_info: Dict, apt_code: str,
+                          price_infos: Dict[str, Dict]) -> Optional[List[Dict]]:
+        """
+        Build one record per area from already fetched responses (shared with the nationwide export in test.py)
+        Args:
+            price_infos: pyeongNo → 시세표 응답
+        Returns:
+            평형마다 레코드(dict) 하나, 평형 목록(pyoengNames)이 없으면 None
+        """
+        # Get area list
         try:
-            print('Price info')
-            price_info = self.get_price_info(apt_code, 0) apt_info["complexDetail"])["cortarNo"])
-            data.update({
-                "일반평균가": self._safe_get(price_info, ["marketPrices", 0, "dealAveragePrice"]),
-                "일반평균가변화량": self._safe_get(price_info, ["marketPrices", 0, "dealAveragePriceChangeAmount"]),
-                "하위평균가": self._safe_get(price_info, ["marketPrices", 0, "dealLowPriceLimit"]),
-                "상위평균가": self._safe_get(price_info, ["marketPrices", 0, "dealUpperPriceLimit"]),
-                "전세 일반평균가": self._safe_get(price_info, ["marketPrices", 0, "leaseAveragePrice"]),
-                "전세 일반평균가변화량": self._safe_get(price_info, ["marketPrices", 0, "leaseAveragePriceChangeAmount"]),
-                "전세 상위평균가": self._safe_get(price_info, ["marketPrices", 0, "leaseUpperPriceLimit"]),
-                "전세 하위평균가": self._safe_get(price_info, ["marketPrices", 0, "lowPriceLimit"]),
-                "매매가대비전세가": self._safe_get(price_info, ["marketPrices", 0, "leasePerDealRate"]),
-                "보증금": self._safe_get(price_info, ["marketPrices", 0, "deposit"]),
-            })
-        except KeyError:
-            pass
+            area_list = apt_info["complexDetail"]["pyoengNames"].split(", ")
+        except (KeyError, TypeError, AttributeError):
+            print('Error')
+            return None
 
-        try:
-            data.update({
-                "겨울관리비": self._safe_get(price_info, ["complexPyeongDetailList", area_idx, "averageMaintenanceCost", "winterTotalPrice"]),
-                "여름관리비": self._safe_get(price_info, ["complexPyeongDetailList", area_idx, "averageMaintenanceCost", "summerTotalPrice"]),
-                "매매호가": self._safe_get(price_info, ["complexPyeongDetailList", area_idx, "articleStatistics", "dealPriceString"]),
-                "전세호가": self._safe_get(price_info, ["complexPyeongDetailList", area_idx, "articleStatistics", "leasePriceString"]),
-                "월세호가": self._safe_get(price_info, ["complexPyeongDetailList", area_idx, "articleStatistics", "rentPriceString"]),
-                "실거래가": self._safe_get(price_info, ["complexPyeongDetailList", area_idx, "articleStatistics", "rentPriceString"]),
-            })
-        except KeyError:
-            pass
-
-        # Add school information
-        try:
-            data.update({
-                "등학교_학군정보": school_info['schools'][0]["schoolName"],
-                "초등학교_설립정보": school_info['schools'][0]["organizationType"],
-                "초등학교_남학생수": school_info['schools'][0]["maleStudentCount"],
-                "초등학교_여학생수": school_info['schools'][0]["femaleStudentCount"]
-            })
-        except (KeyError, IndexError):
-            pass
-            
+        with span("extract"):
+            # 단지/학교 컬럼은 단지마다 한 번만 추출하고 평형/시세 컬럼만 행마다 추출
+            shared = {"complexNo": apt_code}
+            shared.update(get_extractor("apt_row_complex").extract(apt_info))
+            shared.update(get_extractor("apt_row_school").extract(school_info))
+            pyeong_rows = get_extractor("apt_row_pyeong").extract_each(apt_info)
+            # 평형 행마다 그 평형의 pyeongNo 로 시세표를 찾는다 (위치로 맞추면 pyeongNo 가 빠진 평형 뒤로 모두 밀림)
+            price_extractor = get_extractor("apt_row_price")
+            price_rows = [price_extractor.extract(NaverLandCrawler._price_table(pyeong, price_infos))
+                          for pyeong in apt_info.get("complexPyeongDetailList") or []]
+
+            # Process data for each area
+            return [NaverLandCrawler._extract_apt_info(shared, pyeong_rows, price_rows, i, area)
+                    for i, area in enumerate(area_list)]
+
+    @staticmethod
+    def _price_table(pyeong: Dict, price_infos: Dict[str, Dict]) -> Optional[Dict]:
+        """The price table of one complexPyeongDetailList entry (None when it has no pyeongNo or no table)"""
+        area_no = pyeong.get("pyeongNo") if isinstance(pyeong, dict) else None
+        return price_infos.get(str(area_no)) if area_no is not None else None
+
+    def _store_responses(self, apt_code: str, apt_info: Dict, school_info: Dict,
+                         price_infos: Dict[str, Dict]) -> None:
+        """Queue raw responses for the SQLite warehouse (if enabled)"""
+        if self.warehouse is not None and apt_info:
+            self.warehouse.add_complex(apt_code, apt_info, school_info, price_infos)
+
+    @staticmethod
+    def _extract_apt_info(shared: Dict, pyeong_rows: List[Dict], price_rows: List[Dict],
+                          area_idx: int, area: str) -> Dict:
+        """
+        Extract apartment information for a specific area
+        Args:
+            shared: 단지 공통/학교 컬럼 (config/variables.yaml 의 apt_row_* 추출 규칙)
+            pyeong_rows: 평형별 컬럼 목록 (apt_row_pyeong)
+            price_rows: 평형별 시세 컬럼 목록 (apt_row_price)
+        """
+        data = dict(shared)
+        data["면적"] = area
+        for name, rows in (("apt_row_pyeong", pyeong_rows), ("apt_row_price", price_rows)):
+            if area_idx < len(rows):
+                data.update(rows[area_idx])
+            else:
+                data.update(dict.fromkeys(get_extractor(name).columns, ""))
         return data
 
     @staticmethod
@@ -269,67 +368,207 @@ class NaverLandCrawler:
         return data
 
     def get_region_name(self, region_code: str) -> str:
-        """Get region name from code"""
-        endpoint = f"regions/list?cortarNo={region_code}"
-        data = self._make_request(endpoint)
-        
-        try:
-            regions = pd.DataFrame(data.get("regionList", []))
-            matching_region = regions[regions["cortarNo"] == region_code]
-            if not matching_region.empty:
-                return matching_region.iloc[0]["cortarName"]
-        except (KeyError, AttributeError, IndexError):
-            pass
-        return "Unknown"
+        """Get region name from code (지역 트리에서 조회)"""
+        return self.region_tree.name(region_code)
 
     def get_apt_name(self, apt_code: str) -> str:
         """Get apartment name from code"""
-        endpoint = f"complexes/{apt_code}?sameAddressGroup=false"
-        data = self._make_request(endpoint, apt_code=apt_code)
+        data = self.get_apt_info(apt_code)
         
         try:
             return data["complexDetail"]["complexName"]
         except (KeyError, TypeError):
             return "Unknown"
 
-    def collect_all_data(self) -> None:
-        """Collect all apartment data with names"""
+    @staticmethod
+    def print_cache_stats() -> None:
+        """Print response cache hit/miss statistics"""
+        cache = get_response_cache()
+        if cache is not None:
+            stats = cache.stats()
+            print(f"캐시: 적중 {stats['hits']}건, 미스 {stats['misses']}건 "
+                  f"(적중률 {stats['hit_rate']:.1%}), {stats['entries']}건 / {stats['size_mb']}MB")
+
+    @staticmethod
+    def print_metrics() -> None:
+        """Print per-endpoint request metrics and write the Prometheus textfile (metrics.textfile)"""
+        print_metrics_summary()
+        try:
+            path = write_metrics_textfile()
+        except OSError as e:
+            print(f"[ERROR] 지표 파일 저장 실패: {str(e)}")
+            return
+        if path:
+            print(f"지표 저장: {path}")
+
+    @staticmethod
+    def print_trace() -> None:
+        """Print the per-stage timing report when tracing is enabled (config/crawler.yaml tracing)"""
+        path = finish_trace()
+        if path:
+            print(f"단계별 보고 저장: {path}")
+
+    def _save_apt_frame(self, df: pd.DataFrame, name_parts: List[str]) -> str:
+        """Save a complex DataFrame with the configured writer (CSV file or Parquet dataset)"""
+        with span("write"):
+            return self.writer.write(df, name_parts)
+
+    def _finish_run(self) -> None:
+        """Flush buffered output and print cache, request and stage statistics at the end of a collect run"""
+        with span("flush"):
+            self.writer.flush()
+            if self.warehouse is not None:
+                self.warehouse.flush()
+            self.region_tree.save()
+        self.print_cache_stats()
+        self.print_metrics()
+        self.print_trace()
+        # 다음 수집은 최신 상세를 다시 받도록 메모를 비운다
+        self.detail_memo.clear()
+
+    @staticmethod
+    def _open_snapshots(incremental: bool, snapshot_path: str) -> Optional[SnapshotStore]:
+        """Load the change-signal snapshot for incremental mode"""
+        if not incremental:
+            return None
+        snapshots = SnapshotStore(snapshot_path)
+        print(f"증분 수집: 스냅샷 {snapshot_path}")
+        return snapshots
+
+    @staticmethod
+    def _close_snapshots(snapshots: Optional[SnapshotStore]) -> None:
+        """Persist the snapshot and print how many complexes were skipped"""
+        if snapshots is None:
+            return
+        snapshots.save()
+        stats = snapshots.stats
+        print(f"증분 수집: 목록 신호 동일 {stats['unchanged_list']}건, "
+              f"상세 신호 동일 {stats['unchanged_detail']}건, 재수집 {stats['changed']}건")
+
+    def _collect_apt_entry(self, apt: Dict, name_parts: List[str], indent: str,
+                           snapshots: Optional[SnapshotStore] = None) -> str:
+        """
+        Collect and save one complex from its list entry (skipping unchanged ones in incremental mode)
+        Returns:
+            DONE, UNCHANGED 또는 FAILED (FAILED 인 단지는 체크포인트에 기록하지 않음)
+        """
+        apt_code = apt["complexNo"]
+        if snapshots is not None and not snapshots.list_changed(apt_code, apt):
+            return UNCHANGED
+        apt_name = apt.get("complexName") or self.get_apt_name(apt_code)
+        print(f"{indent}아파트: {apt_name} ({apt_code})")
+
+        outcome, df = self._process_apt(apt_code, snapshots=snapshots, list_entry=apt)
+        if outcome == DONE:
+            # Save individual apartment data
+            try:
+                self._save_apt_frame(df, name_parts + [apt_name])
+            except Exception as e:
+                print(f"Error saving apt {apt_code}: {str(e)}")
+                return FAILED
+        return outcome
+
+    def collect_all_data(self, resume: bool = False, checkpoint_path: str = DEFAULT_CHECKPOINT_PATH,
+                         incremental: bool = False, snapshot_path: str = DEFAULT_SNAPSHOT_PATH) -> None:
+        """
+        Collect all apartment data with names
+        Args:
+            resume: True 면 체크포인트 저널에 기록된 지역/단지를 건너뛰고 이어서 수집
+            checkpoint_path: 완료한 지역/단지를 기록할 저널 파일
+            incremental: True 면 지난 스냅샷과 매물 수 신호가 달라진 단지만 다시 수집
+            snapshot_path: 단지별 변경 신호 스냅샷 파일
+        """
+        checkpoint = CrawlCheckpoint(checkpoint_path, resume=resume)
+        if resume:
+            print(f"체크포인트에서 재개: {checkpoint.summary()}")
+        snapshots = self._open_snapshots(incremental, snapshot_path)
         try:
             sido_codes = self.get_region_codes()
             if not sido_codes:
                 raise ValueError("No sido codes retrieved")
             
+            # 지역은 하위 지역/단지가 모두 성공(또는 변경 없음)했을 때만 완료로 기록한다
             for sido in tqdm(sido_codes, desc="시/도"):
+                if checkpoint.is_done(REGION, sido):
+                    continue
                 sido_name = self.get_region_name(sido)
                 print(f"\n시/도: {sido_name} ({sido})")
                 
                 gungu_codes = self.get_region_codes(sido)
+                sido_ok = self.region_tree.is_expanded(sido)
                 for gungu in tqdm(gungu_codes, desc="군/구"):
+                    if checkpoint.is_done(REGION, gungu):
+                        continue
                     gungu_name = self.get_region_name(gungu)
                     print(f"  군/구: {gungu_name} ({gungu})")
                     
                     dong_codes = self.get_region_codes(gungu)
+                    gungu_ok = self.region_tree.is_expanded(gungu)
                     for dong in tqdm(dong_codes, desc="동"):
+                        if checkpoint.is_done(REGION, dong):
+                            continue
                         dong_name = self.get_region_name(dong)
                         print(f"    동: {dong_name} ({dong})")
                         
-                        apt_codes = self.get_apt_list(dong)
-                        for apt_code in tqdm(apt_codes, desc="아파트"):
-                            apt_name = self.get_apt_name(apt_code)
-                            print(f"      아파트: {apt_name} ({apt_code})")
-                            
-                            df = self.process_apt_data(apt_code)
-                            if df is not None:
-                                # Save individual apartment data
-                                filename = f"{sido_name}_{gungu_name}_{dong_name}_{apt_name}.csv"
-                                filename = "".join(c for c in filename if c.isalnum() or c in ['_', '-']).rstrip()
-                                
-                                df.to_csv(f"data/apartments/{filename}.csv", encoding="CP949")
-                            
-                            time.sleep(0.5)  # Rate limiting
+                        # 증분 모드에서는 매물 수 신호를 비교해야 하므로 목록은 새로 받는다
+                        apt_entries = self.fetch_apt_entries(dong, refresh=incremental)
+                        dong_ok = apt_entries is not None
+                        for apt in tqdm(apt_entries or [], desc="아파트"):
+                            apt_code = apt.get("complexNo")
+                            if apt_code is None or checkpoint.is_done(COMPLEX, apt_code):
+                                continue
+                            outcome = self._collect_apt_entry(apt, [sido_name, gungu_name, dong_name], "      ",
+                                                              snapshots)
+                            if outcome == FAILED:
+                                dong_ok = False
+                            else:
+                                checkpoint.mark_done(COMPLEX, apt_code)
+                        if dong_ok:
+                            checkpoint.mark_done(REGION, dong)
+                        else:
+                            gungu_ok = False
+                    if gungu_ok:
+                        checkpoint.mark_done(REGION, gungu)
+                    else:
+                        sido_ok = False
+                if sido_ok:
+                    checkpoint.mark_done(REGION, sido)
                     
         except Exception as e:
             print(f"Error in data collection: {str(e)}")
+        finally:
+            checkpoint.close()
+            self._close_snapshots(snapshots)
+            self._finish_run()
+
+    def collect_all_data_async(self, max_concurrency: Optional[int] = None,
+                               endpoint_limits: Optional[Dict[str, int]] = None,
+                               resume: bool = False, checkpoint_path: str = DEFAULT_CHECKPOINT_PATH,
+                               incremental: bool = False, snapshot_path: str = DEFAULT_SNAPSHOT_PATH) -> None:
+        """
+        Collect all apartment data concurrently (async crawl mode)
+        Args:
+            max_concurrency: 전체 동시 요청 수 (기본값: config/crawler.yaml)
+            endpoint_limits: 엔드포인트 계열별 동시 요청 수 (예: {"prices": 4})
+            resume: True 면 체크포인트 저널에 기록된 지역/단지를 건너뛰고 이어서 수집
+            checkpoint_path: 완료한 지역/단지를 기록할 저널 파일
+            incremental: True 면 지난 스냅샷과 매물 수 신호가 달라진 단지만 다시 수집
+            snapshot_path: 단지별 변경 신호 스냅샷 파일
+        """
+        checkpoint = CrawlCheckpoint(checkpoint_path, resume=resume)
+        if resume:
+            print(f"체크포인트에서 재개: {checkpoint.summary()}")
+        snapshots = self._open_snapshots(incremental, snapshot_path)
+        try:
+            engine = AsyncCrawlEngine(self, max_concurrency, endpoint_limits,
+                                      checkpoint=checkpoint, snapshots=snapshots)
+            asyncio.run(engine.collect_all())
+        except Exception as e:
+            print(f"Error in data collection: {str(e)}")
+        finally:
+            checkpoint.close()
+            self._close_snapshots(snapshots)
+            self._finish_run()
 
     def search_region_code(self, region_name: str, city_name: Optional[str] = None) -> List[Dict[str, str]]:
         """
@@ -338,79 +577,37 @@ class NaverLandCrawler:
             region_name: 구/군 이름 (예: "중구")
             city_name: 시/도 이름 (예: "서울시", "대전시")
         """
-        # 시/도 코드와 이름 매핑
-        sido_mapping = {
-            "1100000000": "서울시",
-            "2600000000": "부산시",
-            "2700000000": "대구시",
-            "2800000000": "인천시",
-            "2900000000": "광주시",
-            "3000000000": "대전시",
-            "3100000000": "울산시",
-            "3600000000": "세종시",
-            "4100000000": "경기도",
-            "4200000000": "강원도",
-            "4300000000": "충청북도",
-            "4400000000": "충청남도",
-            "4500000000": "전라북도",
-            "4600000000": "전라남도",
-            "4700000000": "경상북도",
-            "4800000000": "경상남도",
-            "5000000000": "제주도"
-        }
-        
         matching_regions = []
         
-        # city_name으로 시도 코드 찾기
+        # city_name으로 시도 찾기
         if city_name:
-            target_sido_codes = []
-            normalized_city = city_name.replace("시", "").replace("도", "")
-            for code, name in sido_mapping.items():
-                if normalized_city in name.replace("시", "").replace("도", ""):
-                    target_sido_codes.append(code)
-                    print(f"Found matching city: {name} ({code})")
+            target_sidos = self.region_tree.find(city_name, parent=ROOT_REGION_CODE)
+            for sido in target_sidos:
+                print(f"Found matching city: {sido.name} ({sido.code})")
             
-            if not target_sido_codes:
+            if not target_sidos:
                 print(f"Warning: Cannot find sido code for {city_name}")
                 return []
         else:
             # city_name이 없으면 모든 시도 검색
-            target_sido_codes = list(sido_mapping.keys())
+            target_sidos = self.region_tree.children(ROOT_REGION_CODE)
         
-        # 찾은 시도 코드에 대해서만 구/군 검색
-        for sido in target_sido_codes:
-            sido_name = sido_mapping[sido]
-            sido_info = self._make_request(f"regions/list?cortarNo={sido}")
-            
+        # 찾은 시도에 대해서만 구/군 검색
+        for sido in target_sidos:
             try:
-                regions_df = pd.DataFrame(sido_info.get("regionList", []))
-                if regions_df.empty:
-                    continue
-                
-                # 구/군 검색
-                if region_name:
-                    matches = regions_df[regions_df["cortarName"].str.contains(region_name, na=False)]
-                    if not matches.empty:
-                        for _, row in matches.iterrows():
-                            matching_regions.append({
-                                "code": row["cortarNo"],
-                                "name": row["cortarName"],
-                                "type": row["cortarType"],
-                                "sido": sido_name
-                            })
-                else:
-                    # region_name이 없으면 해당 시/도의 모든 구/군 포함
-                    for _, row in regions_df.iterrows():
-                        matching_regions.append({
-                            "code": row["cortarNo"],
-                            "name": row["cortarName"],
-                            "type": row["cortarType"],
-                            "sido": sido_name
-                        })
-                    
+                regions = self.region_tree.find(region_name, parent=sido.code) if region_name \
+                    else self.region_tree.children(sido.code)
+                for region in regions:
+                    matching_regions.append({
+                        "code": region.code,
+                        "name": region.name,
+                        "type": region.type,
+                        "sido": sido.name
+                    })
             except Exception as e:
-                print(f"Warning: Error processing sido {sido}: {str(e)}")
+                print(f"Warning: Error processing sido {sido.code}: {str(e)}")
                 continue
+        self.region_tree.save()
         
         if not matching_regions:
             location_str = f"{city_name + ' ' if city_name else ''}{region_name if region_name else ''}"
@@ -426,114 +623,157 @@ class NaverLandCrawler:
         """Calculate similarity ratio between two strings"""
         return SequenceMatcher(None, str1.lower(), str2.lower()).ratio()
 
-    def search_apt_by_name(self, apt_name: str, region_name: Optional[str] = None, city_name: Optional[str] = None) -> List[Dict[str, str]]:
-        """Search apartment by name with improved error handling"""
-        matching_apts = []
-        best_match = {"similarity": 0, "apt": None}
-        search_term = apt_name.lower().replace(" ", "")
-        
-        # 지역 코드 가져오기
+    def search_apt_by_name(self, apt_name: str, region_name: Optional[str] = None, city_name: Optional[str] = None,
+                           limit: int = 5, refresh_index: bool = False) -> List[Dict[str, str]]:
+        """
+        Search apartment by name using the local name index
+        Args:
+            limit: 최대 후보 수 (유사도 순)
+            refresh_index: True 면 검색 전에 색인을 다시 만듦 (색인이 없거나 오래됐으면 자동으로 다시 만듦)
+        """
         try:
-            if city_name or region_name:
-                matching_regions = self.search_region_code(region_name, city_name)
-                if not matching_regions:
-                    location_str = f"{city_name or ''} {region_name or ''}"
-                    print(f"'{location_str.strip()}' 지역을 찾을 수 없습니다.")
-                    return []
-                region_codes = [region['code'] for region in matching_regions]
-            else:
-                sido_codes = self.get_region_codes()
-                region_codes = []
-                for sido in sido_codes:
-                    gungu_codes = self.get_region_codes(sido)
-                    region_codes.extend(gungu_codes)
-
-            # 각 지역에서 아파트 검색
-            for code in tqdm(region_codes, desc="지역 검색중"):
-                try:
-                    dong_codes = self.get_region_codes(code)
-                    for dong in dong_codes:
-                        apt_list = self.get_apt_list(dong)
-                        if not apt_list:  # 빈 리스트면 다음 동으로 진행
-                            continue
-                        
-                        for apt_code in apt_list:
-                            try:
-                                apt_info = self.get_apt_info(apt_code)
-                                if not apt_info or 'complexDetail' not in apt_info:
-                                    continue
-                                
-                                current_apt_name = apt_info["complexDetail"]["complexName"]
-                                normalized_name = current_apt_name.lower().replace(" ", "")
-                                
-                                # 기본 문자열 매칭으로 1차 필터링
-                                if search_term in normalized_name or normalized_name in search_term:
-                                    similarity = self.get_string_similarity(search_term, normalized_name)
-                                    if similarity > best_match["similarity"]:
-                                        best_match = {
-                                            "similarity": similarity,
-                                            "apt": {
-                                                "code": apt_code,
-                                                "name": current_apt_name,
-                                                "address": apt_info["complexDetail"]["address"],
-                                                "total_households": apt_info["complexDetail"].get("totalHouseholdCount", "N/A"),
-                                                "construction_year": apt_info["complexDetail"].get("constructionYear", "N/A"),
-                                                "similarity": similarity
-                                            }
-                                        }
-                                        print(f"\n새로운 매칭 발견! (유사도: {similarity:.2%})")
-                                        print(f"아파트명: {current_apt_name}")
-                                        print(f"주소: {apt_info['complexDetail']['address']}")
-                                        
-                                        if similarity > 0.9:  # 매우 높은 유사도
-                                            matching_apts.append(best_match["apt"])
-                                            return matching_apts
-                                            
-                            except Exception as e:
-                                print(f"Warning: Error processing apartment {apt_code}: {str(e)}")
-                                continue
-                            
-                except Exception as e:
-                    print(f"Warning: Error processing region {code}: {str(e)}")
-                    continue
-                
+            index = self.get_name_index(refresh=refresh_index, scope=self._search_scope(city_name, region_name))
+            location = " ".join(filter(None, [city_name, region_name]))
+            candidates = index.search(apt_name, region=location or None, limit=limit)
         except Exception as e:
             print(f"Error in apartment search: {str(e)}")
             return []
-        
-        if best_match["apt"] and best_match["similarity"] > 0.3:
-            matching_apts.append(best_match["apt"])
-        
+
+        matching_apts = [{
+            "code": apt["code"],
+            "name": apt["name"],
+            "address": apt["region"],
+            "total_households": apt.get("households") or "N/A",
+            "construction_year": (apt.get("approve_date") or "N/A")[:4],
+            "similarity": apt["similarity"],
+        } for apt in candidates]
+        # 거의 정확히 일치하는 단지가 있으면 그 단지만 반환
+        if matching_apts and matching_apts[0]["similarity"] > 0.9:
+            return matching_apts[:1]
         return matching_apts
 
-    def collect_region_data(self, region_code: str) -> None:
-        """Collect data for specific region"""
+    def _search_scope(self, city_name: Optional[str] = None, region_name: Optional[str] = None) -> List[str]:
+        """
+        Region codes a name search is limited to (군/구, else 시/도, else 전국)
+        시/도 없이 군/구만 주어지면 각 시/도의 하위 목록(지역 트리에 저장됨)에서 찾습니다.
+        """
+        sidos = self.region_tree.find(city_name, parent=ROOT_REGION_CODE) if city_name else []
+        if region_name:
+            parents = sidos or ([] if city_name else self.region_tree.children(ROOT_REGION_CODE))
+            gungus = [gungu for sido in parents for gungu in self.region_tree.find(region_name, parent=sido.code)]
+            if gungus:
+                return [gungu.code for gungu in gungus]
+        if sidos:
+            return [sido.code for sido in sidos]
+        return [ROOT_REGION_CODE]
+
+    def get_name_index(self, refresh: bool = False, scope: Optional[List[str]] = None) -> NameIndex:
+        """
+        단지 이름 색인 (없거나 max_age_days 보다 오래됐으면 regions API 로 다시 만듦)
+        Args:
+            scope: 색인이 필요한 지역 코드 (기본값: 전국). 시/도·군/구면 그 지역만 색인해 기존 색인에 합침
+        """
+        if self.name_index is None:
+            self.name_index = open_name_index()
+        max_age_days = (load_config('crawler') or {}).get('name_index', {}).get('max_age_days', 7)
+        for root_code in scope or [ROOT_REGION_CODE]:
+            if refresh or self.name_index.is_stale(max_age_days, root_code):
+                label = "전국" if root_code == ROOT_REGION_CODE else self.get_region_name(root_code)
+                print(f"단지 이름 색인 생성 중... ({label})")
+                self.name_index.build(self._make_request, self.region_tree, root_code=root_code)
+                self.region_tree.save()
+                print(f"색인 완료: 단지 {len(self.name_index)}개")
+        return self.name_index
+
+    def collect_region_data(self, region_code: str, incremental: bool = False,
+                            snapshot_path: str = DEFAULT_SNAPSHOT_PATH) -> None:
+        """
+        Collect data for specific region
+        Args:
+            incremental: True 면 지난 스냅샷과 매물 수 신호가 달라진 단지만 다시 수집
+            snapshot_path: 단지별 변경 신호 스냅샷 파일
+        """
+        snapshots = self._open_snapshots(incremental, snapshot_path)
         try:
             region_name = self.get_region_name(region_code)
             print(f"수집 지역: {region_name} ({region_code})")
             
             # Get apartment list for the region
-            apt_codes = []
+            apt_entries = []
             dong_codes = self.get_region_codes(region_code)
             
             for dong in tqdm(dong_codes, desc="동 검색중"):
-                apt_codes.extend(self.get_apt_list(dong))
+                apt_entries.extend(self.get_apt_entries(dong, refresh=incremental))
             
             # Collect data for each apartment
-            for apt_code in tqdm(apt_codes, desc="아파트 데이터 수집중"):
-                apt_name = self.get_apt_name(apt_code)
-                print(f"  아파트: {apt_name} ({apt_code})")
-                
-                df = self.process_apt_data(apt_code)
-                if df is not None:
-                    filename = f"{region_name}_{apt_name}.csv"
-                    filename = "".join(c for c in filename if c.isalnum() or c in ['_', '-']).rstrip()
-                    df.to_csv(f"data/apartments/{filename}.csv", encoding="CP949")
-                
-                time.sleep(0.5)
+            for apt in tqdm(apt_entries, desc="아파트 데이터 수집중"):
+                if "complexNo" in apt:
+                    self._collect_apt_entry(apt, [region_name], "  ", snapshots)
                 
         except Exception as e:
             print(f"Error collecting region data: {str(e)}")
+        finally:
+            self._close_snapshots(snapshots)
+            self._finish_run()
+
+    def collect_region_data_async(self, region_code: str, max_concurrency: Optional[int] = None,
+                                  endpoint_limits: Optional[Dict[str, int]] = None,
+                                  incremental: bool = False, snapshot_path: str = DEFAULT_SNAPSHOT_PATH) -> None:
+        """Collect data for specific region concurrently (async crawl mode, optionally incremental)"""
+        snapshots = self._open_snapshots(incremental, snapshot_path)
+        try:
+            region_name = self.get_region_name(region_code)
+            print(f"수집 지역: {region_name} ({region_code})")
+            engine = AsyncCrawlEngine(self, max_concurrency, endpoint_limits, snapshots=snapshots)
+            asyncio.run(engine.collect_region(region_code, region_name))
+        except Exception as e:
+            print(f"Error collecting region data: {str(e)}")
+        finally:
+            self._close_snapshots(snapshots)
+            self._finish_run()
+
+    def iter_articles(self, apt_code: str, trade_types: Optional[List[str]] = None) -> Iterator[Dict]:
+        """Yield listings (매물) of a complex page by page per trade type (A1 매매, B1 전세, B2 월세)"""
+        return iter_articles(self._make_request, apt_code,
+                             trade_types or self.article_config.get('trade_types', TRADE_TYPES),
+                             self.article_config.get('max_pages'))
+
+    def _region_apt_codes(self, region_code: str) -> Iterator[str]:
+        """지역 아래 모든 단지번호를 동 단위로 차례로 yield"""
+        for dong in self.region_tree.descendants(region_code):
+            for apt in self.get_apt_entries(dong.code):
+                yield apt["complexNo"]
+
+    def collect_articles(self, apt_codes: Optional[List[str]] = None, region_code: Optional[str] = None,
+                         trade_types: Optional[List[str]] = None) -> None:
+        """
+        Stream listings (매물) into the SQLite warehouse as pages arrive
+        Args:
+            apt_codes: 수집할 단지번호 목록
+            region_code: apt_codes 대신 이 지역의 모든 단지를 수집 (둘 다 없으면 전국)
+            trade_types: 거래 유형 (기본값: config/crawler.yaml 의 articles.trade_types)
+        """
+        warehouse = self.warehouse if self.warehouse is not None else open_warehouse(required=True)
+        codes = apt_codes if apt_codes is not None else self._region_apt_codes(region_code or ROOT_REGION_CODE)
+        try:
+            complexes, total = stream_articles(
+                self._make_request, tqdm(codes, desc="매물"), warehouse,
+                trade_types or self.article_config.get('trade_types', TRADE_TYPES),
+                batch_size=self.article_config.get('batch_size', 500),
+                max_pages=self.article_config.get('max_pages'),
+            )
+            print(f"매물 수집 완료: 단지 {complexes}개, 매물 {total}건")
+        except Exception as e:
+            print(f"Error collecting articles: {str(e)}")
+        finally:
+            if warehouse is self.warehouse:
+                warehouse.flush()
+            else:
+                warehouse.close()
+            self.region_tree.save()
+            self.print_cache_stats()
+            self.print_metrics()
+            self.print_trace()
 
     def collect_apt_data(self, apt_code: str) -> None:
         """Collect data for specific apartment"""
@@ -543,9 +783,8 @@ class NaverLandCrawler:
             
             df = self.process_apt_data(apt_code)
             if df is not None:
-                filename = f"{apt_name}.csv"
-                filename = "".join(c for c in filename if c.isalnum() or c in ['_', '-']).rstrip()
-                df.to_csv(f"data/apartments/{filename}.csv", encoding="CP949")
+                filename = self._save_apt_frame(df, [apt_name])
+                self.writer.flush()
                 print(f"데이터 저장 완료: {filename}")
                 
         except Exception as e:
@@ -559,35 +798,13 @@ class NaverLandCrawler:
             region_name: 구/군 이름 (예: "중구"), Optional
             city_name: 시/도 이름 (예: "서울시", "대전시"), Optional
         """
-        # 시/도 코드 매핑 (필요한 경우 추가)
-        city_codes = {
-            "서울시": "1100000000",
-            "대전시": "3000000000",
-            "부산시": "2600000000",
-            "대구시": "2700000000",
-            "인천시": "2800000000",
-            "광주시": "2900000000",
-            "울산시": "3100000000",
-            "세종시": "3600000000",
-            "경기도": "4100000000",
-            "강원도": "4200000000",
-            "충청북도": "4300000000",
-            "충청남도": "4400000000",
-            "전라북도": "4500000000",
-            "전라남도": "4600000000",
-            "경상북도": "4700000000",
-            "경상남도": "4800000000",
-            "제주도": "5000000000"
-        }
-
         # 검색 시작 메시지 구성
         search_location = []
         if city_name:
             search_location.append(city_name)
             # 특정 시/도 코드가 있으면 해당 코드로 검색
-            if city_name in city_codes:
-                parent_code = city_codes[city_name]
-                print(f"Searching in {city_name} (code: {parent_code})")
+            for sido in self.region_tree.find(city_name, parent=ROOT_REGION_CODE):
+                print(f"Searching in {sido.name} (code: {sido.code})")
         if region_name:
             search_location.append(region_name)
         
@@ -646,6 +863,8 @@ if __name__ == "__main__":
     path = "data/apartments"
     os.makedirs(path, exist_ok=True)
     #crawler.collect_all_data()
+    # 비동기 수집 모드: 동시 요청 수는 config/crawler.yaml 또는 인자로 조정
+    #crawler.collect_all_data_async(max_concurrency=16, endpoint_limits={"prices": 8})
     # 예시: "래미안프레스티지" -> "래미안 프레스티지" 같은 유사 이름도 찾을 수 있음
     # crawler.search_and_collect_apt_data("래미안프레스티지", "강남구", "서울시")
     
@@ -663,4 +882,6 @@ if __name__ == "__main__":
     # crawler.search_and_collect_apt_data("현대아파트", "중구", "대전시")
     
     # # 전국 검색
-    # crawler.search_and_collect_apt_data("현대아파트")
\ No newline at end of file
+    # crawler.search_and_collect_apt_data("현대아파트")
+
+    crawler.close()
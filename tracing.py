@@ -0,0 +1,323 @@
+"""수집 파이프라인 단계별 시간 측정(tracing)과 샘플링 프로파일러 모듈
+
+config/crawler.yaml 의 tracing.enabled 가 true 면 span("network"), span("decode") 같은 구간이
+단계별 호출 수, 누적 시간, 자기 시간(안쪽 구간을 뺀 시간)으로 집계됩니다. 꺼져 있으면 span() 은
+아무 일도 하지 않는 컨텍스트 매니저를 돌려주므로 수집 속도에 영향이 없습니다.
+
+단계:
+    network  요청 송신~응답 본문 수신 (http_client.get)
+    cache    응답 캐시 조회 (http_client.get_json)
+    decode   JSON 디코딩 (http_client.decode_json)
+    extract  추출 규칙 적용 (field_extractor)
+    frame    DataFrame 생성
+    write    결과 저장 (CSV / Parquet 버퍼)
+    flush    버퍼 기록 (Parquet, 창고)
+    model    대시보드용 ComplexModel 생성
+
+샘플링 프로파일러는 작업 스레드의 현재 스택을 주기적으로 읽어 단계별로 어떤 함수에서 시간을 쓰는지 셉니다.
+tracing.profile 이 true 면 처음부터, tracing.profile_signal 이 true 면 실행 중에 SIGUSR1 로 켜고 끌 수 있습니다.
+"""
+import json
+import os
+import signal
+import sys
+import threading
+import time
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from config_loader import load_config
+
+REPO_DIR = str(Path(__file__).parent)
+_NOOP_SPAN = nullcontext()
+
+
+class _StageStats:
+    __slots__ = ("count", "total", "self_time", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.self_time = 0.0
+        self.max = 0.0
+
+
+class _Span:
+    """Tracer.span() 이 돌려주는 구간. 끝날 때 바깥 구간의 자기 시간에서 이 구간 시간을 뺍니다."""
+    __slots__ = ("tracer", "stage", "started", "child_time")
+
+    def __init__(self, tracer: "Tracer", stage: str):
+        self.tracer = tracer
+        self.stage = stage
+        self.started = 0.0
+        self.child_time = 0.0
+
+    def __enter__(self) -> "_Span":
+        self.tracer._stack().append(self)
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        elapsed = time.perf_counter() - self.started
+        stack = self.tracer._stack()
+        stack.pop()
+        if stack:
+            stack[-1].child_time += elapsed
+        self.tracer._record(self.stage, elapsed, elapsed - self.child_time)
+
+
+class SamplingProfiler:
+    def __init__(self, tracer: "Tracer", interval: float = 0.005):
+        """
+        Args:
+            tracer: 표본을 단계별로 나눌 때 쓸 Tracer (스레드별 현재 구간)
+            interval: 표본 간격(초)
+        """
+        self.tracer = tracer
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.samples = 0
+        self._leaf: Dict[tuple, int] = {}   # (단계, 함수) → 표본 수, 함수는 가장 안쪽 프레임
+        self._repo: Dict[tuple, int] = {}   # (단계, 함수) → 표본 수, 함수는 이 저장소의 가장 안쪽 프레임
+
+    @staticmethod
+    def _label(frame) -> str:
+        code = frame.f_code
+        return f"{os.path.basename(code.co_filename)}:{code.co_firstlineno}({code.co_name})"
+
+    def _sample(self) -> None:
+        own = threading.get_ident()
+        stages = self.tracer.current_stages()
+        for thread_id, frame in sys._current_frames().items():
+            # 구간 밖에서 쉬고 있는 스레드(스레드 풀 대기 등)는 세지 않는다
+            if thread_id == own or thread_id not in stages:
+                continue
+            stage = stages[thread_id]
+            leaf = (stage, self._label(frame))
+            repo = None
+            while frame is not None:
+                if frame.f_code.co_filename.startswith(REPO_DIR):
+                    repo = (stage, self._label(frame))
+                    break
+                frame = frame.f_back
+            with self._lock:
+                self.samples += 1
+                self._leaf[leaf] = self._leaf.get(leaf, 0) + 1
+                if repo is not None:
+                    self._repo[repo] = self._repo.get(repo, 0) + 1
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def start(self) -> "SamplingProfiler":
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.samples = 0
+            self._leaf.clear()
+            self._repo.clear()
+
+    def top(self, limit: int = 20) -> Dict[str, List[Dict]]:
+        """표본이 많은 함수 순으로 {"leaf": [...], "repo": [...]} ({stage, function, samples, share})"""
+        with self._lock:
+            total = self.samples or 1
+            return {
+                name: [{"stage": stage, "function": function, "samples": count,
+                        "share": round(count / total, 4)}
+                       for (stage, function), count in sorted(counts.items(), key=lambda item: -item[1])[:limit]]
+                for name, counts in (("leaf", self._leaf), ("repo", self._repo))
+            }
+
+
+class Tracer:
+    def __init__(self, enabled: bool = False, profile_interval: float = 0.005):
+        """
+        Args:
+            enabled: False 면 span() 이 측정하지 않음 (enable()/disable() 로 실행 중 변경 가능)
+            profile_interval: 샘플링 프로파일러 표본 간격(초)
+        """
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._stages: Dict[str, _StageStats] = {}
+        self._stacks: Dict[int, List[_Span]] = {}  # 스레드 id → 열린 구간 (프로파일러가 다른 스레드에서 읽음)
+        self.started_at = time.perf_counter()
+        self.profiler = SamplingProfiler(self, profile_interval)
+
+    def enable(self) -> None:
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def span(self, stage: str):
+        """with tracer.span("decode"): ... (꺼져 있으면 아무 일도 하지 않음)"""
+        if not self.enabled:
+            return _NOOP_SPAN
+        return _Span(self, stage)
+
+    def _stack(self) -> List[_Span]:
+        thread_id = threading.get_ident()
+        stack = self._stacks.get(thread_id)
+        if stack is None:
+            with self._lock:
+                stack = self._stacks.setdefault(thread_id, [])
+        return stack
+
+    def _record(self, stage: str, elapsed: float, self_time: float) -> None:
+        with self._lock:
+            stats = self._stages.get(stage)
+            if stats is None:
+                stats = self._stages[stage] = _StageStats()
+            stats.count += 1
+            stats.total += elapsed
+            stats.self_time += self_time
+            if elapsed > stats.max:
+                stats.max = elapsed
+
+    def current_stages(self) -> Dict[int, str]:
+        """스레드 id → 가장 안쪽 열린 구간의 단계"""
+        with self._lock:
+            stacks = list(self._stacks.items())
+        stages = {}
+        for thread_id, stack in stacks:
+            try:
+                stages[thread_id] = stack[-1].stage
+            except IndexError:
+                continue
+        return stages
+
+    def start_profiler(self) -> None:
+        self.profiler.start()
+
+    def stop_profiler(self) -> None:
+        self.profiler.stop()
+
+    def toggle_profiler(self, *_) -> None:
+        """SIGUSR1 핸들러: 프로파일러를 켜거나 끕니다 (표본을 단계별로 나누려면 구간 측정도 켭니다)."""
+        if self.profiler.is_running():
+            self.profiler.stop()
+        else:
+            self.enable()
+            self.profiler.start()
+
+    def reset(self) -> None:
+        """집계와 프로파일 표본을 비우고 실행 시간 측정을 다시 시작합니다."""
+        with self._lock:
+            self._stages.clear()
+            self.started_at = time.perf_counter()
+        self.profiler.reset()
+
+    def report(self, top: int = 20) -> Dict:
+        """
+        단계별 요약.
+        Returns:
+            {"wall_seconds", "stages": [{stage, count, total, self, avg_ms, max_ms, share}], "profile"}
+            share 는 전체 자기 시간 중 비율 (동시 수집에서는 자기 시간 합이 wall_seconds 보다 클 수 있음)
+        """
+        with self._lock:
+            wall = time.perf_counter() - self.started_at
+            self_total = sum(stats.self_time for stats in self._stages.values()) or 1.0
+            stages = [
+                {"stage": stage, "count": stats.count, "total": round(stats.total, 4),
+                 "self": round(stats.self_time, 4),
+                 "avg_ms": round(stats.total / stats.count * 1000, 3) if stats.count else 0.0,
+                 "max_ms": round(stats.max * 1000, 3), "share": round(stats.self_time / self_total, 4)}
+                for stage, stats in sorted(self._stages.items(), key=lambda item: -item[1].self_time)
+            ]
+        result = {"wall_seconds": round(wall, 3), "stages": stages}
+        if self.profiler.samples:
+            result["profile"] = {"samples": self.profiler.samples, "interval": self.profiler.interval,
+                                 **self.profiler.top(top)}
+        return result
+
+    def format_report(self, top: int = 10) -> str:
+        """report() 를 표 형태의 문자열로"""
+        report = self.report(top)
+        lines = [f"단계별 시간 (실행 {report['wall_seconds']:.1f}초)",
+                 f"{'단계':<10}{'호출':>8}{'누적(s)':>10}{'자기(s)':>10}{'평균(ms)':>10}{'최대(ms)':>10}{'비율':>8}"]
+        for entry in report["stages"]:
+            lines.append(f"{entry['stage']:<10}{entry['count']:>8}{entry['total']:>10.2f}{entry['self']:>10.2f}"
+                         f"{entry['avg_ms']:>10.2f}{entry['max_ms']:>10.1f}{entry['share']:>8.1%}")
+        profile = report.get("profile")
+        if profile:
+            lines.append(f"프로파일 표본 {profile['samples']}개 (간격 {profile['interval'] * 1000:g}ms), 저장소 함수 기준 상위:")
+            for entry in profile["repo"]:
+                lines.append(f"  [{entry['stage']}] {entry['function']} {entry['share']:.1%}")
+        return "\n".join(lines)
+
+
+_shared_tracer: Optional[Tracer] = None
+_shared_config: Dict = {}
+_shared_lock = threading.Lock()
+
+
+def get_tracer() -> Tracer:
+    """config/crawler.yaml 의 tracing 설정으로 만든 공유 Tracer"""
+    global _shared_tracer, _shared_config
+    tracer = _shared_tracer
+    if tracer is not None:
+        return tracer
+    with _shared_lock:
+        if _shared_tracer is None:
+            _shared_config = (load_config('crawler') or {}).get('tracing', {}) or {}
+            tracer = Tracer(enabled=_shared_config.get('enabled', False),
+                            profile_interval=_shared_config.get('profile_interval', 0.005))
+            if _shared_config.get('profile', False):
+                tracer.enable()
+                tracer.start_profiler()
+            if (_shared_config.get('profile_signal', False) and hasattr(signal, 'SIGUSR1')
+                    and threading.current_thread() is threading.main_thread()):
+                signal.signal(signal.SIGUSR1, tracer.toggle_profiler)
+            _shared_tracer = tracer
+        return _shared_tracer
+
+
+def span(stage: str):
+    """공유 Tracer 의 구간 (with span("extract"): ...)"""
+    return get_tracer().span(stage)
+
+
+def finish_trace() -> Optional[str]:
+    """
+    수집 종료 시 호출: 지난 보고 이후 측정한 내용이 있으면 단계별 보고를 출력하고 tracing.report_path 에 JSON 으로 저장한 뒤 집계를 비웁니다.
+    Returns:
+        저장한 파일 경로 (측정한 내용이 없거나 report_path 가 비어 있으면 None)
+    """
+    tracer = get_tracer()
+    report = tracer.report(_shared_config.get('top', 20))
+    if not report["stages"] and "profile" not in report:
+        return None
+    print(tracer.format_report(_shared_config.get('top', 20)))
+    path = _shared_config.get('report_path')
+    saved = None
+    if path:
+        target = Path(path)
+        if not target.is_absolute():
+            target = Path(__file__).parent / target
+        try:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            with open(target, "w", encoding="utf-8") as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+            saved = str(target)
+        except OSError as e:
+            print(f"[ERROR] 단계별 보고 저장 실패: {str(e)}")
+    tracer.reset()
+    return saved
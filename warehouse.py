@@ -0,0 +1,227 @@
+"""수집 데이터 SQLite 저장소 모듈
+
+단지, 평형, 시세, 학교, 매물을 정규화된 테이블에 저장합니다. 단지번호(complex_no),
+법정동코드(cortar_no), 면적, 기준일에 인덱스를 두어 여러 단지를 가로지르는 조회를 빠르게 하고,
+행은 테이블별로 모아 두었다가 executemany 업서트로 한 번에 기록합니다.
+"""
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from config_loader import load_config
+
+# 테이블: (컬럼 정의 목록, 기본키)
+TABLES: Dict[str, Tuple[List[Tuple[str, str]], Tuple[str, ...]]] = {
+    "complexes": ([
+        ("complex_no", "TEXT"), ("cortar_no", "TEXT"), ("name", "TEXT"), ("address", "TEXT"),
+        ("road_address", "TEXT"), ("latitude", "REAL"), ("longitude", "REAL"),
+        ("total_households", "INTEGER"), ("total_dong", "INTEGER"), ("high_floor", "INTEGER"),
+        ("low_floor", "INTEGER"), ("approve_date", "TEXT"), ("construction_company", "TEXT"),
+        ("parking_count", "INTEGER"), ("heat_method", "TEXT"),
+        ("deal_count", "INTEGER"), ("lease_count", "INTEGER"), ("rent_count", "INTEGER"),
+        ("updated_at", "REAL"),
+    ], ("complex_no",)),
+    "pyeong_types": ([
+        ("complex_no", "TEXT"), ("pyeong_no", "TEXT"), ("pyeong_name", "TEXT"),
+        ("supply_area", "REAL"), ("exclusive_area", "REAL"), ("exclusive_rate", "REAL"),
+        ("room_count", "INTEGER"), ("bathroom_count", "INTEGER"), ("household_count", "INTEGER"),
+        ("entrance_type", "TEXT"), ("avg_maintenance", "INTEGER"), ("summer_maintenance", "INTEGER"),
+        ("winter_maintenance", "INTEGER"), ("deal_price", "TEXT"), ("lease_price", "TEXT"), ("rent_price", "TEXT"),
+        ("updated_at", "REAL"),
+    ], ("complex_no", "pyeong_no")),
+    "market_prices": ([
+        ("complex_no", "TEXT"), ("pyeong_no", "TEXT"), ("trade_type", "TEXT"), ("base_date", "TEXT"),
+        ("deal_average_price", "INTEGER"), ("deal_low_price", "INTEGER"), ("deal_upper_price", "INTEGER"),
+        ("lease_average_price", "INTEGER"), ("lease_low_price", "INTEGER"), ("lease_upper_price", "INTEGER"),
+        ("lease_per_deal_rate", "REAL"), ("deposit", "INTEGER"), ("updated_at", "REAL"),
+    ], ("complex_no", "pyeong_no", "trade_type", "base_date")),
+    "schools": ([
+        ("complex_no", "TEXT"), ("school_name", "TEXT"), ("organization_type", "TEXT"),
+        ("male_student_count", "INTEGER"), ("female_student_count", "INTEGER"),
+        ("address", "TEXT"), ("cortar_no", "TEXT"), ("updated_at", "REAL"),
+    ], ("complex_no", "school_name")),
+    "articles": ([
+        ("article_no", "TEXT"), ("complex_no", "TEXT"), ("trade_type", "TEXT"), ("price", "TEXT"),
+        ("rent_price", "TEXT"), ("area1", "REAL"), ("area2", "REAL"), ("floor_info", "TEXT"),
+        ("building_name", "TEXT"), ("direction", "TEXT"), ("confirm_date", "TEXT"),
+        ("feature_desc", "TEXT"), ("updated_at", "REAL"),
+    ], ("article_no",)),
+}
+
+INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_complexes_cortar ON complexes(cortar_no)",
+    "CREATE INDEX IF NOT EXISTS idx_pyeong_supply_area ON pyeong_types(supply_area)",
+    "CREATE INDEX IF NOT EXISTS idx_pyeong_exclusive_area ON pyeong_types(exclusive_area)",
+    "CREATE INDEX IF NOT EXISTS idx_prices_date ON market_prices(base_date)",
+    "CREATE INDEX IF NOT EXISTS idx_prices_complex_date ON market_prices(complex_no, base_date)",
+    "CREATE INDEX IF NOT EXISTS idx_schools_cortar ON schools(cortar_no)",
+    "CREATE INDEX IF NOT EXISTS idx_articles_complex ON articles(complex_no)",
+    "CREATE INDEX IF NOT EXISTS idx_articles_date ON articles(confirm_date)",
+]
+
+
+def _number(value, cast=float):
+    """'84.5', 30000, '' 등을 숫자로 변환합니다 (실패 시 None)."""
+    if value is None or value == "":
+        return None
+    try:
+        return cast(float(str(value).replace(",", "")))
+    except ValueError:
+        return None
+
+
+def _int(value):
+    return _number(value, int)
+
+
+class Warehouse:
+    def __init__(self, path: str = "data/warehouse.sqlite", batch_size: int = 500):
+        """
+        Args:
+            path: SQLite 파일 경로
+            batch_size: 이 개수만큼 행이 쌓이면 테이블별로 업서트
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.batch_size = batch_size
+        self._pending: Dict[str, List[Tuple]] = {table: [] for table in TABLES}
+        self._pending_rows = 0
+        self._lock = threading.Lock()
+
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        for table, (columns, primary_key) in TABLES.items():
+            column_sql = ", ".join(f"{name} {sql_type}" for name, sql_type in columns)
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} ({column_sql}, PRIMARY KEY ({', '.join(primary_key)}))"
+            )
+        for index_sql in INDEXES:
+            self._conn.execute(index_sql)
+        self._conn.commit()
+        self._upsert_sql = {table: self._build_upsert(table) for table in TABLES}
+
+    @staticmethod
+    def _build_upsert(table: str) -> str:
+        columns, primary_key = TABLES[table]
+        names = [name for name, _ in columns]
+        updates = ", ".join(f"{name}=excluded.{name}" for name in names if name not in primary_key)
+        return (
+            f"INSERT INTO {table} ({', '.join(names)}) VALUES ({', '.join('?' for _ in names)}) "
+            f"ON CONFLICT ({', '.join(primary_key)}) DO UPDATE SET {updates}"
+        )
+
+    def _add_rows(self, table: str, rows: List[Tuple]) -> None:
+        with self._lock:
+            self._pending[table].extend(rows)
+            self._pending_rows += len(rows)
+            should_flush = self._pending_rows >= self.batch_size
+        if should_flush:
+            self.flush()
+
+    def add_complex(self, apt_code: str, apt_info: Dict, school_info: Optional[Dict] = None,
+                    price_infos: Optional[Dict[str, Dict]] = None, trade_type: str = "A1") -> None:
+        """
+        단지 상세/학교/시세 응답을 정규화해 업서트 대기열에 추가합니다.
+        Args:
+            price_infos: 평형번호(areaNo) → complexes/{id}/prices 응답
+        """
+        now = time.time()
+        detail = apt_info.get("complexDetail", {}) or {}
+        apt_code = str(apt_code)
+        self._add_rows("complexes", [(
+            apt_code, detail.get("cortarNo"), detail.get("complexName"), detail.get("address"),
+            " ".join(filter(None, [detail.get("roadAddressPrefix"), detail.get("roadAddress")])) or None,
+            _number(detail.get("latitude")), _number(detail.get("longitude")),
+            _int(detail.get("totalHouseholdCount")), _int(detail.get("totalDongCount")),
+            _int(detail.get("highFloor")), _int(detail.get("lowFloor")), detail.get("useApproveYmd"),
+            detail.get("constructionCompanyName"), _int(detail.get("parkingPossibleCount")),
+            detail.get("heatMethodTypeCode"), _int(detail.get("dealCount")),
+            _int(detail.get("leaseCount")), _int(detail.get("rentCount")), now,
+        )])
+
+        pyeong_rows = []
+        for pyeong in apt_info.get("complexPyeongDetailList", []) or []:
+            maintenance = pyeong.get("averageMaintenanceCost", {}) or {}
+            stats = pyeong.get("articleStatistics", {}) or {}
+            pyeong_rows.append((
+                apt_code, str(pyeong.get("pyeongNo")), pyeong.get("pyeongName"),
+                _number(pyeong.get("supplyArea")), _number(pyeong.get("exclusiveArea")),
+                _number(pyeong.get("exclusiveRate")), _int(pyeong.get("roomCnt")),
+                _int(pyeong.get("bathroomCnt")), _int(pyeong.get("householdCountByPyeong")),
+                pyeong.get("entranceType"), _int(maintenance.get("averageTotalPrice")),
+                _int(maintenance.get("summerTotalPrice")), _int(maintenance.get("winterTotalPrice")),
+                stats.get("dealPriceString"), stats.get("leasePriceString"), stats.get("rentPriceString"), now,
+            ))
+        self._add_rows("pyeong_types", pyeong_rows)
+
+        school_rows = [
+            (apt_code, school.get("schoolName"), school.get("organizationType"),
+             _int(school.get("maleStudentCount")), _int(school.get("femaleStudentCount")),
+             school.get("address"), school.get("cortarNo"), now)
+            for school in (school_info or {}).get("schools", []) or [] if school.get("schoolName")
+        ]
+        self._add_rows("schools", school_rows)
+
+        price_rows = []
+        for area_no, price_info in (price_infos or {}).items():
+            for price in (price_info or {}).get("marketPrices", []) or []:
+                price_rows.append((
+                    apt_code, str(area_no), trade_type, price.get("baseYearMonthDay") or "",
+                    _int(price.get("dealAveragePrice")), _int(price.get("dealLowPriceLimit")),
+                    _int(price.get("dealUpperPriceLimit")), _int(price.get("leaseAveragePrice")),
+                    _int(price.get("leaseLowPriceLimit")),
+                    _int(price.get("leaseUpperPriceLimit")), _number(price.get("leasePerDealRate")),
+                    _int(price.get("deposit")), now,
+                ))
+        self._add_rows("market_prices", price_rows)
+
+    def add_articles(self, apt_code: str, articles: List[Dict]) -> None:
+        """articles/complex/{id} 목록의 매물을 업서트 대기열에 추가합니다."""
+        now = time.time()
+        self._add_rows("articles", [
+            (str(article.get("articleNo")), str(apt_code), article.get("tradeTypeCode"),
+             article.get("dealOrWarrantPrc"), article.get("rentPrc"), _number(article.get("area1")),
+             _number(article.get("area2")), article.get("floorInfo"), article.get("buildingName"),
+             article.get("direction"), article.get("articleConfirmYmd"), article.get("articleFeatureDesc"), now)
+            for article in articles if article.get("articleNo")
+        ])
+
+    def flush(self) -> None:
+        """대기 중인 행을 테이블별 executemany 업서트로 한 트랜잭션에 기록합니다."""
+        with self._lock:
+            if not self._pending_rows:
+                return
+            with self._conn:
+                for table, rows in self._pending.items():
+                    if rows:
+                        self._conn.executemany(self._upsert_sql[table], rows)
+            self._pending = {table: [] for table in TABLES}
+            self._pending_rows = 0
+
+    def query(self, sql: str, params: Tuple = ()) -> pd.DataFrame:
+        """SQL 조회 결과를 DataFrame 으로 반환합니다."""
+        self.flush()
+        with self._lock:
+            return pd.read_sql_query(sql, self._conn, params=params)
+
+    def close(self) -> None:
+        self.flush()
+        with self._lock:
+            self._conn.close()
+
+
+def open_warehouse(required: bool = False) -> Optional[Warehouse]:
+    """
+    config/crawler.yaml 의 warehouse 설정으로 저장소를 엽니다.
+    Args:
+        required: True 면 설정에서 비활성화돼 있어도 연다 (매물처럼 저장소에만 기록하는 수집용)
+    """
+    config = (load_config('crawler') or {}).get('warehouse', {})
+    if not required and not config.get('enabled', False):
+        return None
+    return Warehouse(config.get('path', 'data/warehouse.sqlite'), batch_size=config.get('batch_size', 500))